@@ -68,6 +68,16 @@ def create_app(config_name="default"):
     app.register_blueprint(community_bp, url_prefix="/api/community")
     app.register_blueprint(chat_bp, url_prefix="/api/chat")
 
+    from app.services import search_index
+    search_index.init_app(app)
+
+    if app.config.get("INSTRUMENTATION_ENABLED"):
+        from app.services import instrumentation
+        instrumentation.init_app(app)
+
+    from app.cli import register_commands
+    register_commands(app)
+
     @app.route("/api/health")
     def health():
         return {"status": "ok", "app": "Coach Partner"}
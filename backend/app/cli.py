@@ -0,0 +1,264 @@
+"""Flask CLI commands (``flask <group> <command>``)."""
+import click
+from flask.cli import AppGroup
+
+from app import db
+
+loads_cli = AppGroup("loads", help="Daily training load rollup maintenance.")
+feed_cli = AppGroup("feed", help="Community feed timeline and trending score maintenance.")
+social_cli = AppGroup("social", help="Community user and post counter maintenance.")
+search_cli = AppGroup("search", help="Full-text search index maintenance.")
+backup_cli = AppGroup("backup", help="Coach backup restore.")
+ai_cli = AppGroup("ai", help="Background AI job maintenance.")
+seed_cli = AppGroup("seed", help="Synthetic data and endpoint benchmarks.")
+
+
+@loads_cli.command("rebuild")
+@click.option("--team-id", type=int, default=None, help="Only rebuild this team's athletes.")
+def rebuild_loads(team_id):
+    """Recompute the daily load rollup from attendance and sessions."""
+    from app.services import load_rollup
+
+    count = load_rollup.rebuild(team_id)
+    db.session.commit()
+    click.echo(f"Rebuilt {count} daily load rows.")
+
+
+@loads_cli.command("check")
+@click.option("--team-id", type=int, default=None, help="Only check this team's athletes.")
+@click.option("--fix", is_flag=True, help="Rebuild the rollup if drift is found.")
+def check_loads(team_id, fix):
+    """Report rollup rows that disagree with the raw attendance data."""
+    from app.services import load_rollup
+
+    drift = load_rollup.find_drift(team_id)
+    for item in drift[:20]:
+        click.echo(f"athlete {item['athlete_id']} {item['date']}: "
+                   f"expected {item['expected']}, found {item['actual']}")
+    if len(drift) > 20:
+        click.echo(f"... and {len(drift) - 20} more")
+    click.echo(f"{len(drift)} inconsistent daily load rows.")
+
+    if drift and fix:
+        count = load_rollup.rebuild(team_id)
+        db.session.commit()
+        click.echo(f"Rebuilt {count} daily load rows.")
+    elif drift:
+        raise SystemExit(1)
+
+
+@feed_cli.command("rebuild")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user's timeline.")
+def rebuild_timelines(user_id):
+    """Recompute fan-out-on-write timelines from follows and posts."""
+    from app.services import timeline
+
+    count = timeline.rebuild(user_id)
+    db.session.commit()
+    click.echo(f"Wrote {count} timeline entries.")
+
+
+@feed_cli.command("rescore")
+def rescore_posts():
+    """Recompute the discover trending scores (after changing their weights or decay)."""
+    from app.services import trending
+
+    count = trending.rescore()
+    db.session.commit()
+    click.echo(f"Rescored {count} posts.")
+
+
+@social_cli.command("check")
+@click.option("--user-id", type=int, default=None, help="Only check this user.")
+@click.option("--fix", is_flag=True, help="Reconcile the counters if drift is found.")
+def check_social_counters(user_id, fix):
+    """Report users and posts whose denormalized counters have drifted."""
+    from app.services import post_counters, social_counters
+
+    drift = social_counters.find_drift(user_id)
+    for item in drift[:20]:
+        click.echo(f"user {item['user_id']}: expected {item['expected']}, found {item['actual']}")
+    if len(drift) > 20:
+        click.echo(f"... and {len(drift) - 20} more")
+    click.echo(f"{len(drift)} users with inconsistent counters.")
+
+    post_drift = post_counters.find_drift() if user_id is None else []
+    for item in post_drift[:20]:
+        click.echo(f"post {item['post_id']}: expected {item['expected']}, found {item['actual']}")
+    if len(post_drift) > 20:
+        click.echo(f"... and {len(post_drift) - 20} more")
+    if user_id is None:
+        click.echo(f"{len(post_drift)} posts with inconsistent counters.")
+
+    if (drift or post_drift) and fix:
+        users = social_counters.reconcile(user_id)
+        posts = post_counters.reconcile() if post_drift else 0
+        db.session.commit()
+        click.echo(f"Reconciled {users} users and {posts} posts.")
+    elif drift or post_drift:
+        raise SystemExit(1)
+
+
+@social_cli.command("reconcile")
+@click.option("--user-id", type=int, default=None, help="Only reconcile this user (posts are skipped).")
+def reconcile_social_counters(user_id):
+    """Recompute drifted user and post counters from the source tables."""
+    from app.services import post_counters, social_counters
+
+    users = social_counters.reconcile(user_id)
+    posts = post_counters.reconcile() if user_id is None else 0
+    db.session.commit()
+    click.echo(f"Reconciled {users} users and {posts} posts.")
+
+
+@search_cli.command("reindex")
+@click.option("--coach-id", type=int, default=None, help="Only reindex this coach's documents.")
+def reindex_search(coach_id):
+    """Create the full-text index if needed and rebuild every search document."""
+    from app.services import search_index
+
+    count = search_index.reindex(coach_id)
+    db.session.commit()
+    click.echo(f"Indexed {count} documents.")
+
+
+@search_cli.command("reindex-names")
+def reindex_coach_names():
+    """Refresh the folded coach names and rebuild their trigram index."""
+    from app.services import coach_search
+
+    count = coach_search.reindex()
+    db.session.commit()
+    click.echo(f"Updated {count} coach names.")
+
+
+@backup_cli.command("restore")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--coach-id", type=int, required=True, help="Coach account receiving the data.")
+def restore_backup(path, coach_id):
+    """Restore a JSON or NDJSON backup (optionally .gz) into a coach account."""
+    import gzip
+    import json
+    from app.models.user import User
+    from app.services import backup_restore
+
+    if not db.session.get(User, coach_id):
+        raise click.BadParameter(f"No user with id {coach_id}", param_hint="--coach-id")
+
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            if path.removesuffix(".gz").endswith(".ndjson"):
+                records = backup_restore.records_from_ndjson(f)
+            else:
+                records = backup_restore.records_from_document(json.load(f))
+            stats = backup_restore.restore(records, coach_id)
+    except (ValueError, OSError) as e:
+        db.session.rollback()
+        raise click.ClickException(f"Invalid backup: {e}")
+    db.session.commit()
+
+    for record_type, count in stats["by_type"].items():
+        click.echo(f"{record_type}: {count}")
+    for record_type, count in stats["skipped"].items():
+        click.echo(f"{record_type}: {count} skipped (missing parent)")
+    click.echo(f"Restored {stats['records']} records in {stats['seconds']}s "
+               f"({stats['records_per_second']} records/s).")
+
+
+@ai_cli.command("run-pending")
+@click.option("--stale-minutes", type=int, default=10, show_default=True,
+              help="Requeue running jobs started longer ago than this.")
+def run_pending_jobs(stale_minutes):
+    """Run queued AI jobs inline, recovering jobs lost by a crashed worker."""
+    from datetime import timedelta
+    from app.services import ai_jobs
+
+    count = ai_jobs.run_pending(timedelta(minutes=stale_minutes))
+    click.echo(f"Ran {count} AI jobs.")
+
+
+@ai_cli.command("clear-cache")
+def clear_ai_cache():
+    """Drop every cached AI completion."""
+    from app.services import ai_cache
+
+    count = ai_cache.clear()
+    db.session.commit()
+    click.echo(f"Removed {count} cached AI responses.")
+
+
+@seed_cli.command("generate")
+@click.option("--coaches", type=int, default=3, show_default=True)
+@click.option("--seasons", type=int, default=2, show_default=True, help="Seasons of history per coach.")
+@click.option("--teams", "teams_per_season", type=int, default=2, show_default=True, help="Teams per season.")
+@click.option("--athletes", "athletes_per_team", type=int, default=18, show_default=True, help="Athletes per team.")
+@click.option("--weeks", type=int, default=30, show_default=True, help="Weeks of sessions and matches per team.")
+@click.option("--sessions-per-week", type=int, default=3, show_default=True)
+@click.option("--users", "community_users", type=int, default=300, show_default=True,
+              help="Community users besides the coaches.")
+@click.option("--posts-per-user", type=int, default=4, show_default=True, help="Average posts per user.")
+@click.option("--follows-per-user", type=int, default=25, show_default=True, help="Average follows per user.")
+@click.option("--chats-per-user", type=int, default=2, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True, help="Random seed.")
+def generate_seed(**options):
+    """Insert a synthetic multi-season dataset (use an empty database)."""
+    from app.seed import generator
+
+    stats = generator.generate(**options)
+    db.session.commit()
+
+    for record_type, count in sorted(stats["counts"].items()):
+        click.echo(f"{record_type}: {count}")
+    click.echo(f"Seeded coaches {stats['coach_ids']} in {stats['seconds']}s "
+               f"(password: {generator.DEFAULT_PASSWORD}).")
+
+
+@seed_cli.command("bench")
+@click.option("--coach-id", type=int, default=None, help="Coach to benchmark as (default: first seeded coach).")
+@click.option("--iterations", type=int, default=20, show_default=True)
+@click.option("--warmup", type=int, default=2, show_default=True)
+@click.option("--blueprint", "only", multiple=True, help="Only these blueprints (repeatable).")
+@click.option("--output", type=click.Path(dir_okay=False, writable=True), help="Write the results as JSON.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Fail on regressions against this JSON.")
+@click.option("--tolerance", type=float, default=0.25, show_default=True,
+              help="Allowed relative p50 slowdown against the baseline.")
+def run_bench(coach_id, iterations, warmup, only, output, baseline, tolerance):
+    """Measure latency and query counts of the hot read endpoints."""
+    import json
+    from flask import current_app
+    from app.models.user import User
+    from app.seed import benchmark, generator
+
+    if coach_id is None:
+        coach = User.query.filter_by(email=f"coach1@{generator.EMAIL_DOMAIN}").first()
+        if not coach:
+            raise click.UsageError("No seeded coach found: run `flask seed generate` or pass --coach-id.")
+        coach_id = coach.id
+
+    results = benchmark.run(current_app._get_current_object(), coach_id, iterations, warmup, only)
+    click.echo(f"{'endpoint':<55} {'status':>6} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for template, r in results.items():
+        click.echo(f"{template:<55} {r['status']:>6} {r['queries']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            regressions = benchmark.compare(results, json.load(f), tolerance)
+        for line in regressions:
+            click.echo(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        click.echo("No regressions against the baseline.")
+
+
+def register_commands(app):
+    app.cli.add_command(loads_cli)
+    app.cli.add_command(feed_cli)
+    app.cli.add_command(social_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(backup_cli)
+    app.cli.add_command(ai_cli)
+    app.cli.add_command(seed_cli)
@@ -9,19 +9,25 @@ from app.models.wellness import WellnessEntry
 from app.models.injury import Injury
 from app.models.note import Note
 from app.models.ai_report import AIReport
+from app.models.ai_job import AIJob
+from app.models.ai_cache import AICacheEntry
 from app.models.attendance import Attendance
+from app.models.daily_load import DailyLoad
 from app.models.staff import StaffMember
 from app.models.goal import Goal
 from app.models.periodization import PeriodizationCycle
-from app.models.community import Post, Comment, PostLike, Follow, SavedPost, ChatRequest, ChatMessage
+from app.models.search import SearchDocument
+from app.models.community import (
+    Post, Comment, PostLike, Follow, SavedPost, TimelineEntry, ChatRequest, ChatMessage,
+)
 
 __all__ = [
     "User", "Season", "Team", "Athlete",
     "TrainingSession", "TrainingBlock",
     "Match", "Evaluation",
     "WellnessEntry", "Injury",
-    "Note", "AIReport", "Attendance",
-    "StaffMember", "Goal", "PeriodizationCycle",
+    "Note", "AIReport", "AIJob", "AICacheEntry", "Attendance", "DailyLoad",
+    "StaffMember", "Goal", "PeriodizationCycle", "SearchDocument",
     "Post", "Comment", "PostLike", "Follow",
-    "SavedPost", "ChatRequest", "ChatMessage",
+    "SavedPost", "TimelineEntry", "ChatRequest", "ChatMessage",
 ]
@@ -0,0 +1,19 @@
+from datetime import datetime
+from app import db
+
+
+class AICacheEntry(db.Model):
+    """A cached AI completion, keyed by the hash of model, parameters and prompt."""
+    __tablename__ = "ai_cache_entries"
+
+    key = db.Column(db.String(64), primary_key=True)  # sha256 hex
+    model = db.Column(db.String(50), nullable=False)
+
+    content = db.Column(db.Text, nullable=False)
+    prompt_tokens = db.Column(db.Integer, nullable=True)
+    completion_tokens = db.Column(db.Integer, nullable=True)
+
+    hits = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # LRU eviction
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # TTL eviction
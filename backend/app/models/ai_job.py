@@ -0,0 +1,58 @@
+import json
+from datetime import datetime
+from app import db
+
+
+class AIJob(db.Model):
+    """A queued AI generation, run by the background executor in ``app.services.ai_jobs``."""
+    __tablename__ = "ai_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    coach_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    job_type = db.Column(db.String(50), nullable=False)  # post_training, post_match, athlete_weekly, team_weekly
+    params = db.Column(db.Text, nullable=True)  # JSON: {session_id} / {match_id} / {athlete_id} / {team_id}
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    # Outcome
+    report_id = db.Column(db.Integer, db.ForeignKey("ai_reports.id", ondelete="SET NULL"), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    # Batch jobs: JSON {total, completed, failed, items: [{athlete_id, status, report_id, error}]}
+    progress = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    report = db.relationship("AIReport")
+
+    __table_args__ = (
+        db.Index("ix_ai_jobs_coach_created", "coach_id", "created_at"),
+        db.Index("ix_ai_jobs_status", "status"),
+    )
+
+    @property
+    def is_finished(self):
+        return self.status in ("succeeded", "failed")
+
+    def get_params(self):
+        return json.loads(self.params) if self.params else {}
+
+    def get_progress(self):
+        return json.loads(self.progress) if self.progress else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "params": self.get_params(),
+            "status": self.status,
+            "attempts": self.attempts,
+            "report_id": self.report_id,
+            "error": self.error,
+            "progress": self.get_progress(),
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -26,6 +26,9 @@ class AIReport(db.Model):
     # Audit
     prompt_used = db.Column(db.Text, nullable=True)
     model_used = db.Column(db.String(50), nullable=True)
+    prompt_tokens = db.Column(db.Integer, nullable=True)
+    completion_tokens = db.Column(db.Integer, nullable=True)
+    raw_prompt_tokens = db.Column(db.Integer, nullable=True)  # before prompt compaction
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -40,5 +43,8 @@ class AIReport(db.Model):
             "confidence": self.confidence,
             "feedback": self.feedback,
             "saved": self.saved,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "raw_prompt_tokens": self.raw_prompt_tokens,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
@@ -39,6 +39,7 @@ class Athlete(db.Model):
     wellness_entries = db.relationship("WellnessEntry", backref="athlete", lazy="dynamic", cascade="all, delete-orphan")
     injuries = db.relationship("Injury", backref="athlete", lazy="dynamic", cascade="all, delete-orphan")
     attendances = db.relationship("Attendance", backref="athlete", lazy="dynamic", cascade="all, delete-orphan")
+    daily_loads = db.relationship("DailyLoad", backref="athlete", lazy="dynamic", cascade="all, delete-orphan")
 
     def to_dict(self):
         return {
@@ -22,15 +22,24 @@ class Post(db.Model):
     likes_count = db.Column(db.Integer, default=0)
     comments_count = db.Column(db.Integer, default=0)
     saves_count = db.Column(db.Integer, default=0)
+    # Engagement plus recency, maintained by app.services.trending
+    trending_score = db.Column(db.Float, nullable=False, default=0, server_default="0")
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    # Keyset pagination indexes: feed (author, newest first), discover (sport, trending)
+    __table_args__ = (
+        db.Index("ix_posts_author_created_id", "author_id", "created_at", "id"),
+        db.Index("ix_posts_sport_trending_id", "sport", "trending_score", "id"),
+    )
+
     # Relationships
     author = db.relationship("User", backref="posts", lazy="joined")
     comments = db.relationship("Comment", backref="post", lazy="dynamic", cascade="all, delete-orphan")
     likes = db.relationship("PostLike", backref="post", lazy="dynamic", cascade="all, delete-orphan")
+    timeline_entries = db.relationship("TimelineEntry", lazy="dynamic", cascade="all, delete-orphan")
 
-    def to_dict(self, current_user_id=None):
+    def to_dict(self, current_user_id=None, liked=None, saved=None):
         import json
         data = {
             "id": self.id,
@@ -50,10 +59,36 @@ class Post(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
         if current_user_id:
-            data["liked"] = PostLike.query.filter_by(post_id=self.id, user_id=current_user_id).first() is not None
-            data["saved"] = SavedPost.query.filter_by(post_id=self.id, user_id=current_user_id).first() is not None
+            if liked is None:
+                liked = PostLike.query.filter_by(post_id=self.id, user_id=current_user_id).first() is not None
+            if saved is None:
+                saved = SavedPost.query.filter_by(post_id=self.id, user_id=current_user_id).first() is not None
+            data["liked"] = liked
+            data["saved"] = saved
         return data
 
+    @staticmethod
+    def serialize_many(posts, current_user_id=None):
+        """Serialize a page of posts, resolving liked/saved flags with two IN queries."""
+        if not current_user_id or not posts:
+            return [p.to_dict() for p in posts]
+
+        post_ids = [p.id for p in posts]
+        liked_ids = {
+            post_id for (post_id,) in db.session.query(PostLike.post_id).filter(
+                PostLike.user_id == current_user_id, PostLike.post_id.in_(post_ids)
+            )
+        }
+        saved_ids = {
+            post_id for (post_id,) in db.session.query(SavedPost.post_id).filter(
+                SavedPost.user_id == current_user_id, SavedPost.post_id.in_(post_ids)
+            )
+        }
+        return [
+            p.to_dict(current_user_id, liked=p.id in liked_ids, saved=p.id in saved_ids)
+            for p in posts
+        ]
+
 
 class Comment(db.Model):
     __tablename__ = "comments"
@@ -100,6 +135,28 @@ class Follow(db.Model):
     __table_args__ = (db.UniqueConstraint("follower_id", "following_id", name="uq_follow"),)
 
 
+class TimelineEntry(db.Model):
+    """Materialized feed row: ``post_id`` appears in ``user_id``'s home feed.
+
+    Written at post time (fan-out-on-write) when FEED_FANOUT is enabled,
+    see ``app.services.timeline``.
+    """
+    __tablename__ = "timeline_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=False, index=True)
+    author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    sport = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)  # Post creation time
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "post_id", name="uq_timeline_entry"),
+        db.Index("ix_timeline_entries_user_sport_created", "user_id", "sport", "created_at", "post_id"),
+        db.Index("ix_timeline_entries_user_author", "user_id", "author_id"),
+    )
+
+
 class SavedPost(db.Model):
     __tablename__ = "saved_posts"
 
@@ -151,6 +208,10 @@ class ChatMessage(db.Model):
     read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        db.Index("ix_chat_messages_pair_created_id", "sender_id", "receiver_id", "created_at", "id"),
+    )
+
     sender = db.relationship("User", foreign_keys=[sender_id], lazy="joined")
 
     def to_dict(self):
@@ -163,3 +224,84 @@ class ChatMessage(db.Model):
             "read": self.read,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class Conversation(db.Model):
+    """Denormalized inbox row for an accepted chat between two users.
+
+    ``user_a_id`` is always the lower user id. Maintained by the chat routes
+    on accept, send and read, so the inbox is a single ordered query.
+    """
+    __tablename__ = "conversations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_a_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_b_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    last_message_id = db.Column(db.Integer, db.ForeignKey("chat_messages.id"), nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    last_activity_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    unread_a = db.Column(db.Integer, nullable=False, default=0)  # Unread by user_a
+    unread_b = db.Column(db.Integer, nullable=False, default=0)  # Unread by user_b
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user_a = db.relationship("User", foreign_keys=[user_a_id], lazy="joined")
+    user_b = db.relationship("User", foreign_keys=[user_b_id], lazy="joined")
+    last_message = db.relationship("ChatMessage", lazy="joined")
+
+    __table_args__ = (
+        db.UniqueConstraint("user_a_id", "user_b_id", name="uq_conversation_pair"),
+        db.Index("ix_conversations_user_a_activity", "user_a_id", "last_activity_at", "id"),
+        db.Index("ix_conversations_user_b_activity", "user_b_id", "last_activity_at", "id"),
+    )
+
+    @staticmethod
+    def pair(user_id, other_id):
+        return (user_id, other_id) if user_id < other_id else (other_id, user_id)
+
+    @classmethod
+    def get_or_create(cls, user_id, other_id):
+        user_a_id, user_b_id = cls.pair(user_id, other_id)
+        conversation = cls.query.filter_by(user_a_id=user_a_id, user_b_id=user_b_id).first()
+        if not conversation:
+            conversation = cls(user_a_id=user_a_id, user_b_id=user_b_id)
+            db.session.add(conversation)
+        return conversation
+
+    def other(self, user_id):
+        return self.user_b if user_id == self.user_a_id else self.user_a
+
+    def unread_for(self, user_id):
+        return self.unread_a if user_id == self.user_a_id else self.unread_b
+
+    def record_message(self, message):
+        """Update the summary for a newly flushed message."""
+        self.last_message_id = message.id
+        self.last_message_at = message.created_at
+        self.last_activity_at = message.created_at
+        column = "unread_a" if message.receiver_id == self.user_a_id else "unread_b"
+        if db.inspect(self).pending:
+            # Not inserted yet: an INSERT cannot reference the row's own columns
+            setattr(self, column, (getattr(self, column) or 0) + 1)
+        else:
+            # SQL-side increment, so concurrent senders cannot lose updates
+            setattr(self, column, getattr(Conversation, column) + 1)
+
+    def mark_read(self, user_id):
+        if user_id == self.user_a_id:
+            self.unread_a = 0
+        else:
+            self.unread_b = 0
+
+    def to_dict(self, user_id):
+        other = self.other(user_id)
+        return {
+            "user_id": other.id if other else None,
+            "name": f"{other.first_name} {other.last_name}" if other else None,
+            "avatar_url": other.avatar_url if other else None,
+            "sport": other.sport if other else None,
+            "last_message": self.last_message.to_dict() if self.last_message else None,
+            "unread_count": self.unread_for(user_id),
+        }
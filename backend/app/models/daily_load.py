@@ -0,0 +1,39 @@
+from datetime import datetime
+from app import db
+
+
+class DailyLoad(db.Model):
+    """Per-athlete, per-day training load rollup.
+
+    ``load`` is RPE x minutes trained (the ACWR input); ``session_load`` is RPE
+    x scheduled session duration (the athlete dashboard's weekly load). Rows
+    are keyed by athlete only, so they stay valid when an athlete changes team.
+    Maintained incrementally by the attendance and training routes through
+    ``app.services.load_rollup`` and rebuildable with ``flask loads rebuild``.
+    """
+    __tablename__ = "daily_loads"
+
+    id = db.Column(db.Integer, primary_key=True)
+    athlete_id = db.Column(db.Integer, db.ForeignKey("athletes.id"), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+
+    load = db.Column(db.Float, nullable=False, default=0)
+    session_load = db.Column(db.Float, nullable=False, default=0)
+    minutes = db.Column(db.Integer, nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("athlete_id", "date", name="uq_daily_load_athlete_date"),
+    )
+
+    def to_dict(self):
+        return {
+            "athlete_id": self.athlete_id,
+            "date": self.date.isoformat() if self.date else None,
+            "load": self.load,
+            "session_load": self.session_load,
+            "minutes": self.minutes,
+            "sessions": self.sessions,
+        }
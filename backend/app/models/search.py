@@ -0,0 +1,30 @@
+from datetime import datetime
+from app import db
+
+
+class SearchDocument(db.Model):
+    """Denormalized text of a searchable entity, indexed for full-text search.
+
+    Rows are written by ``app.services.search_index`` on every flush. The
+    full-text index itself is backend specific: an FTS5 external-content
+    table on SQLite, a generated ``tsvector`` column with a GIN index on
+    PostgreSQL.
+    """
+    __tablename__ = "search_documents"
+
+    id = db.Column(db.Integer, primary_key=True)
+    coach_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    entity_type = db.Column(db.String(30), nullable=False)  # athlete, training, training_block, match, note, ai_report
+    entity_id = db.Column(db.Integer, nullable=False)
+    parent_id = db.Column(db.Integer, nullable=True)  # Session id for training blocks
+
+    title = db.Column(db.Text, nullable=True)
+    body = db.Column(db.Text, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("entity_type", "entity_id", name="uq_search_document_entity"),
+        db.Index("ix_search_documents_coach_type", "coach_id", "entity_type"),
+    )
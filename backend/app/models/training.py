@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import func
 from app import db
 
 
@@ -34,7 +35,18 @@ class TrainingSession(db.Model):
                              cascade="all, delete-orphan", order_by="TrainingBlock.order")
     attendances = db.relationship("Attendance", backref="session", lazy="dynamic", cascade="all, delete-orphan")
 
-    def to_dict(self, include_blocks=False):
+    def to_dict(self, include_blocks=False, blocks=None, blocks_count=None):
+        """Serialize the session.
+
+        ``blocks`` may carry the session's blocks pre-loaded by a batched query,
+        and ``blocks_count`` their number from a grouped one (see
+        ``serialize_many``), so serializing many sessions does not query the
+        blocks one by one.
+        """
+        if blocks is None and include_blocks:
+            blocks = self.blocks.all()
+        if blocks_count is None:
+            blocks_count = len(blocks) if blocks is not None else self.blocks.count()
         data = {
             "id": self.id,
             "team_id": self.team_id,
@@ -50,13 +62,25 @@ class TrainingSession(db.Model):
             "what_worked": self.what_worked,
             "what_to_improve": self.what_to_improve,
             "template_name": self.template_name,
-            "blocks_count": self.blocks.count(),
+            "blocks_count": blocks_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
         if include_blocks:
-            data["blocks"] = [b.to_dict() for b in self.blocks.all()]
+            data["blocks"] = [b.to_dict() for b in blocks]
         return data
 
+    @staticmethod
+    def serialize_many(sessions):
+        """Serialize a list of sessions, counting their blocks with one grouped query."""
+        if not sessions:
+            return []
+        counts = dict(
+            db.session.query(TrainingBlock.session_id, func.count(TrainingBlock.id))
+            .filter(TrainingBlock.session_id.in_([s.id for s in sessions]))
+            .group_by(TrainingBlock.session_id)
+        )
+        return [s.to_dict(blocks_count=counts.get(s.id, 0)) for s in sessions]
+
 
 class TrainingBlock(db.Model):
     __tablename__ = "training_blocks"
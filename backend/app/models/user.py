@@ -31,9 +31,22 @@ class User(db.Model):
     # Philosophy & focus (set during onboarding)
     philosophy_focus = db.Column(db.Text, nullable=True)  # JSON: tactical, technical, physical, mental, prevention
 
+    # Community counters, maintained by the community routes (see app.services.social_counters)
+    followers_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    following_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    posts_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    # Lower-cased, accent-folded "first last" for coach search (see app.services.coach_search)
+    search_name = db.Column(db.String(201), nullable=True)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_users_search_name", "search_name"),
+        db.Index("ix_users_sport_followers", "sport", "followers_count"),
+    )
+
     # Relationships
     teams = db.relationship("Team", backref="coach", lazy="dynamic")
 
@@ -1,21 +1,15 @@
 import json
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from app import db
 from app.models.ai_report import AIReport
 from app.models.training import TrainingSession
 from app.models.match import Match
-from app.models.note import Note
-from app.models.evaluation import Evaluation
-from app.models.wellness import WellnessEntry
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.services.ai_service import (
-    generate_post_training_report,
-    generate_post_match_report,
-    generate_athlete_weekly_summary,
-    synthesize_coach_notes,
-)
-from app.utils.auth import coach_required
+from app.models.ai_job import AIJob
+from app.services import ai_cache, ai_jobs
+from app.services.ai_client import get_ai_client
+from app.services.ai_service import NOT_CONFIGURED
+from app.utils.auth import coach_required, get_owned_team, owns_team
 
 ai_reports_bp = Blueprint("ai_reports", __name__)
 
@@ -37,6 +31,65 @@ def get_report(user, report_id):
     return jsonify({"report": report.to_dict()})
 
 
+# Generate endpoints accept {"force": true} to bypass the AI response cache.
+# By default they queue a background job (202); with ?stream=1 or
+# Accept: text/event-stream they stream the model output instead.
+
+def _wants_stream():
+    return request.args.get("stream") in ("1", "true") or \
+        request.accept_mimetypes.best == "text/event-stream"
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_report(user, job_type, params):
+    """Server-Sent Events: ``token`` events as the model writes, then ``done``
+    with the saved report (or ``error``)."""
+    spec = ai_jobs.build(job_type, user.id, params)
+    events = spec["generate"](stream=True)
+    if isinstance(events, dict):
+        return jsonify({"error": events["error"]}), 503
+
+    coach_id = user.id
+    # Release the connection while the model is streaming
+    db.session.commit()
+
+    def sse():
+        # First byte right away, before the model answers
+        yield ": generating\n\n"
+        try:
+            for event, payload in events:
+                if event == "token":
+                    yield _sse("token", {"text": payload})
+                else:
+                    report = ai_jobs.save_report(coach_id, spec, payload)
+                    yield _sse("done", {"report": report.to_dict(), "cached": payload["cached"]})
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.exception("Streaming %s report failed", job_type)
+            yield _sse("error", {"error": f"{type(e).__name__}: {e}"})
+
+    return Response(stream_with_context(sse()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+def _not_configured():
+    """503 up front when no AI provider is configured, instead of a job that can only fail."""
+    return jsonify({"error": NOT_CONFIGURED["error"]}), 503
+
+
+def _accepted(job):
+    """202 response pointing the client at the job status endpoint."""
+    response = jsonify({"job": job.to_dict()})
+    response.status_code = 202
+    response.headers["Location"] = f"/api/ai/jobs/{job.id}"
+    return response
+
+
 @ai_reports_bp.route("/generate/post-training", methods=["POST"])
 @coach_required
 def gen_post_training(user):
@@ -46,34 +99,17 @@ def gen_post_training(user):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
-    notes = [n.to_dict() for n in Note.query.filter_by(
-        coach_id=user.id, entity_type="training", entity_id=session.id
-    ).all()]
-    attendances = [a.to_dict() for a in session.attendances.all()]
-
-    result = generate_post_training_report(session.to_dict(include_blocks=True), notes, attendances)
-
-    if result.get("error"):
-        return jsonify({"error": result["error"]}), 503
-
-    report = AIReport(
-        coach_id=user.id,
-        report_type="post_training",
-        title=f"Report: {session.title or session.date}",
-        input_refs=json.dumps({"training_ids": [session.id]}),
-        content=result["content"],
-        confidence=result.get("confidence"),
-        prompt_used=result.get("prompt_used"),
-        model_used=result.get("model_used"),
-    )
-    db.session.add(report)
-    db.session.commit()
+    params = {"session_id": session.id, "force": bool(data.get("force"))}
+    if not get_ai_client():
+        return _not_configured()
+    if _wants_stream():
+        return _stream_report(user, "post_training", params)
 
-    return jsonify({"report": report.to_dict()}), 201
+    job = ai_jobs.submit(user.id, "post_training", params)
+    return _accepted(job)
 
 
 @ai_reports_bp.route("/generate/post-match", methods=["POST"])
@@ -85,34 +121,17 @@ def gen_post_match(user):
     if not match:
         return jsonify({"error": "Match not found"}), 404
 
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, match.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
-    evaluations = [e.to_dict() for e in Evaluation.query.filter_by(match_id=match.id).all()]
-    notes = [n.to_dict() for n in Note.query.filter_by(
-        coach_id=user.id, entity_type="match", entity_id=match.id
-    ).all()]
-
-    result = generate_post_match_report(match.to_dict(), evaluations, notes)
-
-    if result.get("error"):
-        return jsonify({"error": result["error"]}), 503
-
-    report = AIReport(
-        coach_id=user.id,
-        report_type="post_match",
-        title=f"Report: vs {match.opponent}",
-        input_refs=json.dumps({"match_ids": [match.id]}),
-        content=result["content"],
-        confidence=result.get("confidence"),
-        prompt_used=result.get("prompt_used"),
-        model_used=result.get("model_used"),
-    )
-    db.session.add(report)
-    db.session.commit()
+    params = {"match_id": match.id, "force": bool(data.get("force"))}
+    if not get_ai_client():
+        return _not_configured()
+    if _wants_stream():
+        return _stream_report(user, "post_match", params)
 
-    return jsonify({"report": report.to_dict()}), 201
+    job = ai_jobs.submit(user.id, "post_match", params)
+    return _accepted(job)
 
 
 @ai_reports_bp.route("/generate/athlete-weekly", methods=["POST"])
@@ -124,37 +143,90 @@ def gen_athlete_weekly(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
-    evaluations = [e.to_dict() for e in athlete.evaluations.order_by(
-        Evaluation.date.desc()).limit(7).all()]
-    wellness = [w.to_dict() for w in athlete.wellness_entries.order_by(
-        WellnessEntry.date.desc()).limit(7).all()]
-    notes = [n.to_dict() for n in Note.query.filter_by(
-        coach_id=user.id, entity_type="athlete", entity_id=athlete.id
-    ).order_by(Note.created_at.desc()).limit(10).all()]
-
-    result = generate_athlete_weekly_summary(athlete.to_dict(), evaluations, wellness, notes)
-
-    if result.get("error"):
-        return jsonify({"error": result["error"]}), 503
-
-    report = AIReport(
-        coach_id=user.id,
-        report_type="athlete_weekly",
-        title=f"Settimana: {athlete.first_name} {athlete.last_name}",
-        input_refs=json.dumps({"athlete_ids": [athlete.id]}),
-        content=result["content"],
-        confidence=result.get("confidence"),
-        prompt_used=result.get("prompt_used"),
-        model_used=result.get("model_used"),
-    )
-    db.session.add(report)
-    db.session.commit()
+    params = {"athlete_id": athlete.id, "force": bool(data.get("force"))}
+    if not get_ai_client():
+        return _not_configured()
+    if _wants_stream():
+        return _stream_report(user, "athlete_weekly", params)
+
+    job = ai_jobs.submit(user.id, "athlete_weekly", params)
+    return _accepted(job)
+
+
+@ai_reports_bp.route("/generate/team-weekly", methods=["POST"])
+@coach_required
+def gen_team_weekly(user):
+    """Weekly summaries for every athlete of a team, as one background job.
+
+    Poll ``/jobs/<id>`` for per-athlete progress.
+    """
+    data = request.get_json()
+    team = get_owned_team(user, data.get("team_id"))
+    if not team:
+        return jsonify({"error": "Team not found"}), 404
+
+    if not get_ai_client():
+        return _not_configured()
+    params = {"team_id": team.id, "force": bool(data.get("force"))}
+    job = ai_jobs.submit(user.id, "team_weekly", params)
+    return _accepted(job)
 
-    return jsonify({"report": report.to_dict()}), 201
+
+@ai_reports_bp.route("/jobs", methods=["GET"])
+@coach_required
+def list_jobs(user):
+    jobs = AIJob.query.filter_by(coach_id=user.id)\
+        .order_by(AIJob.created_at.desc()).limit(20).all()
+    return jsonify({"jobs": [j.to_dict() for j in jobs]})
+
+
+@ai_reports_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@coach_required
+def get_job(user, job_id):
+    job = AIJob.query.filter_by(id=job_id, coach_id=user.id).first()
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"job": job.to_dict()})
+
+
+@ai_reports_bp.route("/jobs/<int:job_id>/result", methods=["GET"])
+@coach_required
+def get_job_result(user, job_id):
+    """The generated report (200), the job while still pending (202), or its error (503).
+
+    Batch jobs answer with ``reports`` instead of ``report``.
+    """
+    job = AIJob.query.filter_by(id=job_id, coach_id=user.id).first()
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    if job.status == "failed":
+        return jsonify({"error": job.error, "job": job.to_dict()}), 503
+    if job.status != "succeeded":
+        return _accepted(job)
+
+    progress = job.get_progress()
+    if progress is not None:
+        report_ids = [item["report_id"] for item in progress["items"] if item["report_id"]]
+        reports = AIReport.query.filter(AIReport.id.in_(report_ids), AIReport.coach_id == user.id).all()
+        return jsonify({"reports": [r.to_dict() for r in reports], "job": job.to_dict()})
+    if not job.report:
+        return jsonify({"error": "Report was deleted"}), 410
+    return jsonify({"report": job.report.to_dict(), "job": job.to_dict()})
+
+
+@ai_reports_bp.route("/stats", methods=["GET"])
+@coach_required
+def ai_stats(user):
+    """AI call and cache counters of the worker process serving the request."""
+    client = get_ai_client()
+    return jsonify({
+        "client": client.stats() if client else None,
+        "cache": ai_cache.stats(),
+    })
 
 
 @ai_reports_bp.route("/reports/<int:report_id>/feedback", methods=["POST"])
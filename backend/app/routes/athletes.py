@@ -5,8 +5,7 @@ from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 from app import db
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, get_owned_team, owned_team_ids, owns_team
 
 ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
 MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5 MB
@@ -25,7 +24,7 @@ def list_athletes(user):
     if not team_id:
         return jsonify({"error": "team_id is required"}), 400
 
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -50,8 +49,7 @@ def get_athlete(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     return jsonify({"athlete": athlete.to_dict()})
@@ -62,7 +60,7 @@ def get_athlete(user, athlete_id):
 def create_athlete(user):
     data = request.get_json()
     team_id = data.get("team_id")
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -95,8 +93,7 @@ def update_athlete(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
@@ -120,8 +117,7 @@ def delete_athlete(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     db.session.delete(athlete)
@@ -136,8 +132,7 @@ def upload_photo(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     if "photo" not in request.files:
@@ -190,7 +185,7 @@ from app.models.note import Note
 
 def _get_coach_athlete_ids(user, requested_ids):
     """Return the subset of requested_ids that belong to teams owned by the coach."""
-    coach_team_ids = [t.id for t in Team.query.filter_by(coach_id=user.id).all()]
+    coach_team_ids = owned_team_ids(user)
     if not coach_team_ids:
         return []
     athletes = Athlete.query.filter(
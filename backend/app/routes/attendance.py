@@ -2,8 +2,8 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models.attendance import Attendance
 from app.models.training import TrainingSession
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.services import load_rollup
+from app.utils.auth import coach_required, owns_team
 
 attendance_bp = Blueprint("attendance", __name__)
 
@@ -17,8 +17,7 @@ def get_attendance(user, session_id):
         return jsonify({"error": "Session not found"}), 404
 
     # Verify session belongs to a team owned by this coach
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     records = Attendance.query.filter_by(training_session_id=session_id).all()
@@ -44,8 +43,7 @@ def save_attendance(user, session_id):
         return jsonify({"error": "Session not found"}), 404
 
     # Verify session belongs to a team owned by this coach
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
@@ -87,6 +85,8 @@ def save_attendance(user, session_id):
 
         saved.append(record)
 
+    db.session.flush()
+    load_rollup.refresh((r.athlete_id, session.date) for r in saved)
     db.session.commit()
 
     return jsonify({
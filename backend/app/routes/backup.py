@@ -1,75 +1,82 @@
-from datetime import datetime
+import gzip
+import io
+import json
+from datetime import date
 
-from flask import Blueprint, jsonify
-from app.models.user import User
-from app.models.season import Season
-from app.models.team import Team
-from app.models.athlete import Athlete
-from app.models.training import TrainingSession
-from app.models.match import Match
-from app.models.evaluation import Evaluation
-from app.models.wellness import WellnessEntry
-from app.models.injury import Injury
-from app.models.note import Note
-from app.models.ai_report import AIReport
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.services import backup_export, backup_restore
 from app.utils.auth import coach_required
 
 backup_bp = Blueprint("backup", __name__)
 
+FORMATS = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
 
 @backup_bp.route("/", methods=["GET"])
 @coach_required
 def export_all(user):
-    """Export all coach data as JSON."""
-
-    # Coach info (exclude sensitive fields)
-    coach_data = user.to_dict()
-    coach_data.pop("email", None)
-    coach_data.pop("phone", None)
+    """Export all coach data, streamed.
 
-    # Seasons
-    seasons = Season.query.filter_by(coach_id=user.id).all()
+    Query params:
+    - format: json (nested document, default) or ndjson (one record per line)
+    - after: ndjson only, ``<type>:<id>`` of the last record received, to resume
+    The body is gzip-encoded when the client accepts it.
+    """
+    fmt = request.args.get("format", "json")
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format: {fmt}"}), 400
 
-    # Teams with nested data
-    teams = Team.query.filter_by(coach_id=user.id).all()
-    teams_data = []
-    for team in teams:
-        team_dict = team.to_dict()
+    if fmt == "ndjson":
+        after = request.args.get("after")
+        try:
+            after = backup_export.parse_resume_token(after) if after else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        fragments = backup_export.stream_ndjson(user, after)
+    else:
+        fragments = backup_export.stream_json(user)
 
-        # Athletes with evaluations, wellness, injuries
-        athletes_data = []
-        for athlete in team.athletes.all():
-            athlete_dict = athlete.to_dict()
-            athlete_dict["evaluations"] = [e.to_dict() for e in athlete.evaluations.all()]
-            athlete_dict["wellness_entries"] = [w.to_dict() for w in athlete.wellness_entries.all()]
-            athlete_dict["injuries"] = [i.to_dict() for i in athlete.injuries.all()]
-            athletes_data.append(athlete_dict)
+    body = backup_export.buffered(fragments)
+    mimetype, extension = FORMATS[fmt]
+    headers = {
+        "Content-Disposition": f'attachment; filename="coach-partner-backup-{date.today().isoformat()}.{extension}"',
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-store",
+    }
+    if "gzip" in request.accept_encodings:
+        body = backup_export.gzipped(body)
+        headers["Content-Encoding"] = "gzip"
 
-        # Training sessions with blocks
-        sessions_data = []
-        for session in team.training_sessions.all():
-            session_dict = session.to_dict(include_blocks=True)
-            sessions_data.append(session_dict)
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
 
-        # Matches
-        matches_data = [m.to_dict() for m in team.matches.all()]
 
-        team_dict["athletes"] = athletes_data
-        team_dict["training_sessions"] = sessions_data
-        team_dict["matches"] = matches_data
-        teams_data.append(team_dict)
+@backup_bp.route("/restore", methods=["POST"])
+@coach_required
+def restore(user):
+    """Restore a backup into the current coach's account, as new records.
 
-    # Notes
-    notes = Note.query.filter_by(coach_id=user.id).all()
+    Body: the JSON export, or the NDJSON export with Content-Type
+    application/x-ndjson (read as a stream). Either may be gzip-encoded
+    (Content-Encoding: gzip).
+    """
+    stream = request.stream
+    if request.content_encoding == "gzip":
+        stream = gzip.GzipFile(fileobj=stream)
 
-    # AI Reports
-    ai_reports = AIReport.query.filter_by(coach_id=user.id).all()
+    try:
+        if request.mimetype == "application/x-ndjson":
+            records = backup_restore.records_from_ndjson(io.TextIOWrapper(stream, encoding="utf-8"))
+        else:
+            records = backup_restore.records_from_document(json.load(stream))
+        stats = backup_restore.restore(records, user.id)
+    except (ValueError, OSError, SQLAlchemyError) as e:
+        db.session.rollback()
+        return jsonify({"error": f"Invalid backup: {e}"}), 400
 
-    return jsonify({
-        "export_date": datetime.utcnow().isoformat(),
-        "coach": coach_data,
-        "seasons": [s.to_dict() for s in seasons],
-        "teams": teams_data,
-        "notes": [n.to_dict() for n in notes],
-        "ai_reports": [r.to_dict() for r in ai_reports],
-    })
+    db.session.commit()
+    return jsonify({"message": "Backup restored", **stats}), 201
@@ -1,10 +1,16 @@
-"""Private chat routes: requests and messages."""
-from flask import Blueprint, request, jsonify
+"""Private chat routes: requests, messages and the real-time event stream."""
+import json
+import time
+
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 from sqlalchemy import or_, and_
 from app import db
-from app.models.community import ChatRequest, ChatMessage
+from app.models.community import ChatRequest, ChatMessage, Conversation
 from app.models.user import User
+from app.services import chat_broker
 from app.utils.auth import coach_required
+from app.utils.pagination import paginate, InvalidCursor
 
 chat_bp = Blueprint("chat", __name__)
 
@@ -56,11 +62,13 @@ def send_request(user):
             existing.from_user_id = user.id
             existing.to_user_id = to_user_id
             db.session.commit()
+            chat_broker.publish(to_user_id, "chat_request", existing.to_dict())
             return jsonify({"chat_request": existing.to_dict()}), 201
 
     cr = ChatRequest(from_user_id=user.id, to_user_id=to_user_id, status="pending")
     db.session.add(cr)
     db.session.commit()
+    chat_broker.publish(to_user_id, "chat_request", cr.to_dict())
     return jsonify({"chat_request": cr.to_dict()}), 201
 
 
@@ -75,7 +83,9 @@ def accept_request(user, request_id):
         return jsonify({"error": "Request already handled"}), 400
 
     cr.status = "accepted"
+    Conversation.get_or_create(cr.from_user_id, cr.to_user_id)
     db.session.commit()
+    chat_broker.publish(cr.from_user_id, "chat_request_accepted", cr.to_dict())
     return jsonify({"chat_request": cr.to_dict()})
 
 
@@ -86,9 +96,12 @@ def reject_request(user, request_id):
     cr = ChatRequest.query.get(request_id)
     if not cr or cr.to_user_id != user.id:
         return jsonify({"error": "Not found"}), 404
+    if cr.status != "pending":
+        return jsonify({"error": "Request already handled"}), 400
 
     cr.status = "rejected"
     db.session.commit()
+    chat_broker.publish(cr.from_user_id, "chat_request_rejected", cr.to_dict())
     return jsonify({"chat_request": cr.to_dict()})
 
 
@@ -97,48 +110,24 @@ def reject_request(user, request_id):
 @chat_bp.route("/conversations", methods=["GET"])
 @coach_required
 def list_conversations(user):
-    """List all active chat conversations (accepted requests)."""
-    accepted = ChatRequest.query.filter(
-        ChatRequest.status == "accepted",
-        or_(ChatRequest.from_user_id == user.id, ChatRequest.to_user_id == user.id),
-    ).all()
-
-    conversations = []
-    for cr in accepted:
-        other_id = cr.to_user_id if cr.from_user_id == user.id else cr.from_user_id
-        other = User.query.get(other_id)
-        if not other:
-            continue
-
-        # Last message
-        last_msg = ChatMessage.query.filter(
-            or_(
-                and_(ChatMessage.sender_id == user.id, ChatMessage.receiver_id == other_id),
-                and_(ChatMessage.sender_id == other_id, ChatMessage.receiver_id == user.id),
-            )
-        ).order_by(ChatMessage.created_at.desc()).first()
-
-        # Unread count
-        unread = ChatMessage.query.filter_by(
-            sender_id=other_id, receiver_id=user.id, read=False
-        ).count()
-
-        conversations.append({
-            "user_id": other.id,
-            "name": f"{other.first_name} {other.last_name}",
-            "avatar_url": other.avatar_url,
-            "sport": other.sport,
-            "last_message": last_msg.to_dict() if last_msg else None,
-            "unread_count": unread,
-        })
-
-    # Sort by last message date
-    conversations.sort(
-        key=lambda c: c["last_message"]["created_at"] if c["last_message"] else "",
-        reverse=True,
+    """List active chat conversations, most recent activity first."""
+    cursor = request.args.get("cursor")
+    per_page = request.args.get("per_page", 50, type=int)
+
+    query = Conversation.query.filter(
+        or_(Conversation.user_a_id == user.id, Conversation.user_b_id == user.id)
     )
+    try:
+        conversations, next_cursor = paginate(
+            query, [Conversation.last_activity_at, Conversation.id], cursor, per_page
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify({"conversations": conversations})
+    return jsonify({
+        "conversations": [c.to_dict(user.id) for c in conversations],
+        "next_cursor": next_cursor,
+    })
 
 
 # ── Messages ──────────────────────────────────────────────────────────
@@ -159,23 +148,35 @@ def get_messages(user, other_id):
     if not accepted:
         return jsonify({"error": "Chat not authorized"}), 403
 
-    page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
     per_page = 50
 
-    messages = ChatMessage.query.filter(
+    query = ChatMessage.query.filter(
         or_(
             and_(ChatMessage.sender_id == user.id, ChatMessage.receiver_id == other_id),
             and_(ChatMessage.sender_id == other_id, ChatMessage.receiver_id == user.id),
         )
-    ).order_by(ChatMessage.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    )
+    try:
+        messages, next_cursor = paginate(
+            query, [ChatMessage.created_at, ChatMessage.id], cursor, per_page
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
 
     # Mark received messages as read
-    ChatMessage.query.filter_by(
+    marked = ChatMessage.query.filter_by(
         sender_id=other_id, receiver_id=user.id, read=False
     ).update({"read": True})
+    Conversation.get_or_create(user.id, other_id).mark_read(user.id)
     db.session.commit()
+    if marked:
+        chat_broker.publish(other_id, "read", {"reader_id": user.id, "count": marked})
 
-    return jsonify({"messages": [m.to_dict() for m in reversed(messages)]})
+    return jsonify({
+        "messages": [m.to_dict() for m in reversed(messages)],
+        "next_cursor": next_cursor,
+    })
 
 
 @chat_bp.route("/messages/<int:other_id>", methods=["POST"])
@@ -201,8 +202,13 @@ def send_message(user, other_id):
         text=data["text"],
     )
     db.session.add(msg)
+    db.session.flush()
+    Conversation.get_or_create(user.id, other_id).record_message(msg)
     db.session.commit()
-    return jsonify({"message": msg.to_dict()}), 201
+    message = msg.to_dict()
+    chat_broker.publish(other_id, "message", message)
+    chat_broker.publish(user.id, "message", message)  # Sender's other tabs/devices
+    return jsonify({"message": message}), 201
 
 
 @chat_bp.route("/unread-count", methods=["GET"])
@@ -212,3 +218,42 @@ def unread_count(user):
     count = ChatMessage.query.filter_by(receiver_id=user.id, read=False).count()
     pending_requests = ChatRequest.query.filter_by(to_user_id=user.id, status="pending").count()
     return jsonify({"unread_messages": count, "pending_requests": pending_requests})
+
+
+# ── Real-time stream ──────────────────────────────────────────────────
+
+@chat_bp.route("/stream", methods=["GET"])
+def stream():
+    """Server-Sent Events stream of chat events for the current user.
+
+    EventSource cannot send headers, so the access token may also be passed
+    as ``?jwt=<token>``. The stream ends after CHAT_STREAM_MAX_SECONDS; the
+    browser reconnects automatically.
+    """
+    verify_jwt_in_request(locations=["headers", "query_string"])
+    user = User.query.get(get_jwt_identity())
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    heartbeat = current_app.config.get("CHAT_STREAM_HEARTBEAT", 15)
+    max_seconds = current_app.config.get("CHAT_STREAM_MAX_SECONDS", 300)
+    subscription = chat_broker.get_broker().subscribe(user.id)
+
+    def events():
+        try:
+            yield "retry: 3000\n\n"
+            deadline = time.monotonic() + max_seconds
+            while time.monotonic() < deadline:
+                item = subscription.get(timeout=heartbeat)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                event, data = item
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(events(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
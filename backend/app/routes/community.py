@@ -1,10 +1,13 @@
 """Community social routes: posts, comments, likes, follows, saved."""
 import json
 from flask import Blueprint, request, jsonify
+from sqlalchemy import select
 from app import db
 from app.models.community import Post, Comment, PostLike, Follow, SavedPost
 from app.models.user import User
-from app.utils.auth import coach_required
+from app.services import coach_search, post_counters, social_counters, timeline
+from app.utils.auth import coach_required, owns_team
+from app.utils.pagination import paginate, InvalidCursor
 
 community_bp = Blueprint("community", __name__)
 
@@ -15,39 +18,50 @@ community_bp = Blueprint("community", __name__)
 @coach_required
 def feed(user):
     """Feed: posts from followed coaches + own posts, filtered by sport."""
-    page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
     per_page = request.args.get("per_page", 20, type=int)
 
-    # Get followed user IDs
-    following_ids = [f.following_id for f in Follow.query.filter_by(follower_id=user.id).all()]
-    following_ids.append(user.id)
-
-    posts = Post.query.filter(
-        Post.author_id.in_(following_ids),
-        Post.sport == user.sport,
-    ).order_by(Post.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    try:
+        if timeline.is_enabled():
+            posts, next_cursor = timeline.read(user, cursor, per_page)
+        else:
+            # Get followed user IDs
+            following_ids = [f.following_id for f in Follow.query.filter_by(follower_id=user.id).all()]
+            following_ids.append(user.id)
+
+            query = Post.query.filter(
+                Post.author_id.in_(following_ids),
+                Post.sport == user.sport,
+            )
+            posts, next_cursor = paginate(query, [Post.created_at, Post.id], cursor, per_page)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({
-        "posts": [p.to_dict(current_user_id=user.id) for p in posts],
-        "page": page,
+        "posts": Post.serialize_many(posts, current_user_id=user.id),
+        "next_cursor": next_cursor,
     })
 
 
 @community_bp.route("/discover", methods=["GET"])
 @coach_required
 def discover(user):
-    """Discover: popular posts from same sport, excluding already followed."""
-    page = request.args.get("page", 1, type=int)
+    """Discover: trending posts from the same sport (see app.services.trending)."""
+    cursor = request.args.get("cursor")
     per_page = request.args.get("per_page", 20, type=int)
 
-    posts = Post.query.filter(
+    query = Post.query.filter(
         Post.sport == user.sport,
         Post.author_id != user.id,
-    ).order_by(Post.likes_count.desc(), Post.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    )
+    try:
+        posts, next_cursor = paginate(query, [Post.trending_score, Post.id], cursor, per_page)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({
-        "posts": [p.to_dict(current_user_id=user.id) for p in posts],
-        "page": page,
+        "posts": Post.serialize_many(posts, current_user_id=user.id),
+        "next_cursor": next_cursor,
     })
 
 
@@ -68,6 +82,9 @@ def create_post(user):
         shared_training_data=json.dumps(data["shared_training_data"]) if data.get("shared_training_data") else None,
     )
     db.session.add(post)
+    social_counters.on_post(user, 1)
+    db.session.flush()
+    timeline.fan_out(post)
     db.session.commit()
     return jsonify({"post": post.to_dict(current_user_id=user.id)}), 201
 
@@ -80,6 +97,7 @@ def delete_post(user, post_id):
     if not post or post.author_id != user.id:
         return jsonify({"error": "Not found or not authorized"}), 404
     db.session.delete(post)
+    social_counters.on_post(user, -1)
     db.session.commit()
     return jsonify({"deleted": True})
 
@@ -94,19 +112,20 @@ def toggle_like(user, post_id):
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
-    existing = PostLike.query.filter_by(post_id=post_id, user_id=user.id).first()
-    if existing:
-        db.session.delete(existing)
-        post.likes_count = max(0, post.likes_count - 1)
+    removed = PostLike.query.filter_by(
+        post_id=post_id, user_id=user.id
+    ).delete(synchronize_session=False)
+    if removed:
+        post_counters.change(post_id, "likes_count", -1)
         liked = False
     else:
         like = PostLike(post_id=post_id, user_id=user.id)
         db.session.add(like)
-        post.likes_count += 1
+        post_counters.change(post_id, "likes_count", 1)
         liked = True
 
     db.session.commit()
-    return jsonify({"liked": liked, "likes_count": post.likes_count})
+    return jsonify({"liked": liked, "likes_count": post_counters.current(post, "likes_count")})
 
 
 # ── Comments ──────────────────────────────────────────────────────────
@@ -130,7 +149,7 @@ def add_comment(user, post_id):
     data = request.get_json()
     comment = Comment(post_id=post_id, author_id=user.id, text=data["text"])
     db.session.add(comment)
-    post.comments_count += 1
+    post_counters.change(post_id, "comments_count", 1)
     db.session.commit()
     return jsonify({"comment": comment.to_dict()}), 201
 
@@ -142,9 +161,7 @@ def delete_comment(user, comment_id):
     comment = Comment.query.get(comment_id)
     if not comment or comment.author_id != user.id:
         return jsonify({"error": "Not found"}), 404
-    post = Post.query.get(comment.post_id)
-    if post:
-        post.comments_count = max(0, post.comments_count - 1)
+    post_counters.change(comment.post_id, "comments_count", -1)
     db.session.delete(comment)
     db.session.commit()
     return jsonify({"deleted": True})
@@ -160,19 +177,20 @@ def toggle_save(user, post_id):
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
-    existing = SavedPost.query.filter_by(user_id=user.id, post_id=post_id).first()
-    if existing:
-        db.session.delete(existing)
-        post.saves_count = max(0, post.saves_count - 1)
+    removed = SavedPost.query.filter_by(
+        user_id=user.id, post_id=post_id
+    ).delete(synchronize_session=False)
+    if removed:
+        post_counters.change(post_id, "saves_count", -1)
         saved = False
     else:
         sp = SavedPost(user_id=user.id, post_id=post_id)
         db.session.add(sp)
-        post.saves_count += 1
+        post_counters.change(post_id, "saves_count", 1)
         saved = True
 
     db.session.commit()
-    return jsonify({"saved": saved, "saves_count": post.saves_count})
+    return jsonify({"saved": saved, "saves_count": post_counters.current(post, "saves_count")})
 
 
 @community_bp.route("/saved", methods=["GET"])
@@ -180,7 +198,8 @@ def toggle_save(user, post_id):
 def get_saved(user):
     """Get saved posts."""
     saved = SavedPost.query.filter_by(user_id=user.id).order_by(SavedPost.created_at.desc()).all()
-    return jsonify({"posts": [s.post.to_dict(current_user_id=user.id) for s in saved if s.post]})
+    posts = [s.post for s in saved if s.post]
+    return jsonify({"posts": Post.serialize_many(posts, current_user_id=user.id)})
 
 
 # ── Follow ────────────────────────────────────────────────────────────
@@ -196,13 +215,20 @@ def toggle_follow(user, target_id):
     if not target:
         return jsonify({"error": "User not found"}), 404
 
-    existing = Follow.query.filter_by(follower_id=user.id, following_id=target_id).first()
-    if existing:
-        db.session.delete(existing)
+    # Deleting by rowcount, so two concurrent unfollows decrement only once
+    removed = Follow.query.filter_by(
+        follower_id=user.id, following_id=target_id
+    ).delete(synchronize_session=False)
+    if removed:
+        social_counters.on_follow(user, target, -1)
+        timeline.on_unfollow(user.id, target_id)
         following = False
     else:
         follow = Follow(follower_id=user.id, following_id=target_id)
         db.session.add(follow)
+        social_counters.on_follow(user, target, 1)
+        db.session.flush()
+        timeline.on_follow(user.id, target_id)
         following = True
 
     db.session.commit()
@@ -215,14 +241,14 @@ def toggle_follow(user, target_id):
 @coach_required
 def get_profile(user, user_id):
     """Get public coach profile."""
-    target = User.query.get(user_id)
-    if not target:
+    # Header from one row: denormalized counters plus an EXISTS for the follow
+    followed = select(Follow.id).where(
+        Follow.follower_id == user.id, Follow.following_id == User.id
+    ).exists()
+    row = db.session.query(User, followed).filter(User.id == user_id).first()
+    if not row:
         return jsonify({"error": "User not found"}), 404
-
-    followers_count = Follow.query.filter_by(following_id=user_id).count()
-    following_count = Follow.query.filter_by(follower_id=user_id).count()
-    posts_count = Post.query.filter_by(author_id=user_id).count()
-    is_following = Follow.query.filter_by(follower_id=user.id, following_id=user_id).first() is not None
+    target, is_following = row
 
     posts = Post.query.filter_by(author_id=user_id).order_by(Post.created_at.desc()).limit(20).all()
 
@@ -234,13 +260,13 @@ def get_profile(user, user_id):
             "sport": target.sport,
             "coaching_level": target.coaching_level,
             "years_experience": target.years_experience,
-            "followers_count": followers_count,
-            "following_count": following_count,
-            "posts_count": posts_count,
-            "is_following": is_following,
+            "followers_count": target.followers_count,
+            "following_count": target.following_count,
+            "posts_count": target.posts_count,
+            "is_following": bool(is_following),
             "is_self": user.id == user_id,
         },
-        "posts": [p.to_dict(current_user_id=user.id) for p in posts],
+        "posts": Post.serialize_many(posts, current_user_id=user.id),
     })
 
 
@@ -254,26 +280,29 @@ def search_coaches(user):
     query = User.query.filter(User.id != user.id, User.onboarding_completed == True)
     if sport:
         query = query.filter(User.sport == sport)
-    if q:
-        query = query.filter(
-            db.or_(
-                User.first_name.ilike(f"%{q}%"),
-                User.last_name.ilike(f"%{q}%"),
-            )
-        )
+    name_filter = coach_search.name_filter(q)
+    if name_filter is not None:
+        query = query.filter(name_filter)
 
-    coaches = query.limit(30).all()
+    # Most followed first
+    coaches = query.order_by(User.followers_count.desc(), User.id).limit(30).all()
+
+    followed_ids = set(db.session.scalars(
+        select(Follow.following_id).where(
+            Follow.follower_id == user.id,
+            Follow.following_id.in_([c.id for c in coaches]),
+        )
+    )) if coaches else set()
 
     results = []
     for c in coaches:
-        is_following = Follow.query.filter_by(follower_id=user.id, following_id=c.id).first() is not None
         results.append({
             "id": c.id,
             "name": f"{c.first_name} {c.last_name}",
             "avatar_url": c.avatar_url,
             "sport": c.sport,
             "coaching_level": c.coaching_level,
-            "is_following": is_following,
+            "is_following": c.id in followed_ids,
         })
 
     return jsonify({"coaches": results})
@@ -286,7 +315,6 @@ def search_coaches(user):
 def import_training(user, post_id):
     """Import a shared training into the user's own team."""
     from app.models.training import TrainingSession, TrainingBlock
-    from app.models.team import Team
     from datetime import date as dt_date
 
     post = Post.query.get(post_id)
@@ -295,8 +323,7 @@ def import_training(user, post_id):
 
     data = request.get_json()
     team_id = data.get("team_id")
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, team_id):
         return jsonify({"error": "Team not found"}), 404
 
     training_data = json.loads(post.shared_training_data)
@@ -6,16 +6,18 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func, extract, case
 from app import db
 from app.models.athlete import Athlete
-from app.models.team import Team
 from app.models.training import TrainingSession
 from app.models.match import Match
 from app.models.evaluation import Evaluation
 from app.models.wellness import WellnessEntry
 from app.models.attendance import Attendance
+from app.models.daily_load import DailyLoad
 from app.models.note import Note
 from app.models.injury import Injury
 from app.models.user import User
-from app.utils.auth import coach_required
+from app.services import dashboard_stats
+from app.services import training_load as training_load_service
+from app.utils.auth import coach_required, get_owned_team, owned_team_ids, owns_team
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -28,7 +30,7 @@ def athlete_dashboard(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
+    team = get_owned_team(user, athlete.team_id)
     if not team:
         return jsonify({"error": "Not authorized"}), 403
 
@@ -60,15 +62,11 @@ def athlete_dashboard(user, athlete_id):
         coach_id=user.id, entity_type="athlete", entity_id=athlete.id
     ).order_by(Note.created_at.desc()).limit(10).all()]
 
-    # Workload last 7 days (sum of RPE * duration from attendances)
-    recent_attendances = Attendance.query.join(TrainingSession).filter(
-        Attendance.athlete_id == athlete.id,
-        TrainingSession.date >= week_ago
-    ).all()
-    weekly_load = sum(
-        (a.rpe or 5) * (a.session.duration_minutes or 60)
-        for a in recent_attendances
-    )
+    # Workload last 7 days (sum of RPE * session duration from the daily load rollup)
+    weekly_load = db.session.query(func.sum(DailyLoad.session_load)).filter(
+        DailyLoad.athlete_id == athlete.id,
+        DailyLoad.date >= week_ago
+    ).scalar() or 0
 
     return jsonify({
         "athlete": athlete.to_dict(),
@@ -88,70 +86,34 @@ def athlete_dashboard(user, athlete_id):
 @coach_required
 def team_stats(user, team_id):
     """Team statistics dashboard."""
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
     month_ago = date.today() - timedelta(days=30)
 
-    # Training stats
-    total_trainings = TrainingSession.query.filter_by(team_id=team.id).count()
-    recent_trainings = TrainingSession.query.filter(
-        TrainingSession.team_id == team.id,
-        TrainingSession.date >= month_ago
-    ).count()
-
-    # Match stats
-    total_matches = Match.query.filter_by(team_id=team.id).count()
-    completed_matches = Match.query.filter_by(team_id=team.id, status="completed").all()
-    wins = sum(1 for m in completed_matches if m.result == "win")
-    draws = sum(1 for m in completed_matches if m.result == "draw")
-    losses = sum(1 for m in completed_matches if m.result == "loss")
-
-    # Athletes stats
-    total_athletes = Athlete.query.filter_by(team_id=team.id).count()
-    available = Athlete.query.filter_by(team_id=team.id, status="available").count()
-    attention = Athlete.query.filter_by(team_id=team.id, status="attention").count()
-    unavailable = Athlete.query.filter_by(team_id=team.id, status="unavailable").count()
-
-    # Average attendance
-    sessions = TrainingSession.query.filter_by(team_id=team.id).all()
-    attendance_rates = []
-    for s in sessions:
-        present = Attendance.query.filter_by(training_session_id=s.id, status="present").count()
-        if total_athletes > 0:
-            attendance_rates.append(present / total_athletes * 100)
-    avg_attendance = round(sum(attendance_rates) / len(attendance_rates), 1) if attendance_rates else 0
+    sessions = dashboard_stats.session_totals(team.id, since=month_ago)
+    record = dashboard_stats.match_record(team.id)
+    athletes = dashboard_stats.athlete_status_counts(team.id)
+
+    avg_attendance = dashboard_stats.avg_attendance_rate(
+        team.id, athletes["total"], sessions["total"]
+    )
 
     # Training load per week (last 4 weeks)
-    weekly_loads = []
-    for w in range(4):
-        start = date.today() - timedelta(days=(w + 1) * 7)
-        end = date.today() - timedelta(days=w * 7)
-        week_sessions = TrainingSession.query.filter(
-            TrainingSession.team_id == team.id,
-            TrainingSession.date >= start,
-            TrainingSession.date < end
-        ).all()
-        total_minutes = sum(s.duration_minutes or 0 for s in week_sessions)
-        weekly_loads.append({
-            "week": f"Sett. -{w + 1}",
-            "sessions": len(week_sessions),
-            "minutes": total_minutes,
-        })
+    weekly_loads = dashboard_stats.weekly_minutes(team.id, date.today())
 
     return jsonify({
         "team": team.to_dict(),
-        "total_trainings": total_trainings,
-        "recent_trainings": recent_trainings,
-        "total_matches": total_matches,
-        "match_record": {"wins": wins, "draws": draws, "losses": losses},
-        "athletes": {
-            "total": total_athletes,
-            "available": available,
-            "attention": attention,
-            "unavailable": unavailable,
+        "total_trainings": sessions["total"],
+        "recent_trainings": sessions["recent"],
+        "total_matches": record["total"],
+        "match_record": {
+            "wins": record["wins"],
+            "draws": record["draws"],
+            "losses": record["losses"],
         },
+        "athletes": athletes,
         "avg_attendance": avg_attendance,
         "weekly_loads": weekly_loads,
     })
@@ -166,7 +128,7 @@ def advanced_team_stats(team_id):
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found or not authorized"}), 404
 
@@ -174,123 +136,40 @@ def advanced_team_stats(team_id):
 
     # ── KPIs ──────────────────────────────────────────────────────────────
 
-    total_athletes = Athlete.query.filter_by(team_id=team.id).count()
-    total_sessions = TrainingSession.query.filter_by(team_id=team.id).count()
-    total_matches = Match.query.filter_by(team_id=team.id).count()
+    athletes = dashboard_stats.athlete_status_counts(team.id)
+    sessions = dashboard_stats.session_totals(team.id)
+    record = dashboard_stats.match_record(team.id)
 
     # Win rate: percentage of completed matches that were won
-    completed_matches = Match.query.filter_by(
-        team_id=team.id, status="completed"
-    ).all()
-    wins = sum(1 for m in completed_matches if m.result == "win")
-    win_rate = round((wins / len(completed_matches) * 100) if completed_matches else 0, 1)
-
-    # Average session duration (across all sessions that have a duration)
-    avg_duration_result = db.session.query(
-        func.avg(TrainingSession.duration_minutes)
-    ).filter(
-        TrainingSession.team_id == team.id,
-        TrainingSession.duration_minutes.isnot(None)
-    ).scalar()
-    avg_session_duration = round(float(avg_duration_result), 1) if avg_duration_result else 0
-
-    # Completed sessions
-    completed_sessions = TrainingSession.query.filter_by(
-        team_id=team.id, status="completed"
-    ).count()
+    win_rate = round(
+        (record["wins"] / record["completed"] * 100) if record["completed"] else 0, 1
+    )
 
     kpis = {
-        "total_athletes": total_athletes,
-        "total_sessions": total_sessions,
-        "total_matches": total_matches,
+        "total_athletes": athletes["total"],
+        "total_sessions": sessions["total"],
+        "total_matches": record["total"],
         "win_rate": win_rate,
-        "avg_session_duration": avg_session_duration,
-        "completed_sessions": completed_sessions,
+        "avg_session_duration": sessions["avg_duration"],
+        "completed_sessions": sessions["completed"],
     }
 
     # ── Weekly trend (last 4 weeks) ───────────────────────────────────────
 
-    weekly_trend = []
-    for w in range(4):
-        week_end = today - timedelta(days=w * 7)
-        week_start = week_end - timedelta(days=6)
-        iso_year, iso_week, _ = week_start.isocalendar()
-        week_label = f"{iso_year}-W{iso_week:02d}"
-
-        # Sessions in this week window
-        week_sessions = TrainingSession.query.filter(
-            TrainingSession.team_id == team.id,
-            TrainingSession.date >= week_start,
-            TrainingSession.date <= week_end
-        ).all()
-
-        # Matches in this week window
-        week_matches_count = Match.query.filter(
-            Match.team_id == team.id,
-            Match.date >= week_start,
-            Match.date <= week_end
-        ).count()
-
-        # Average RPE across sessions in this week (from session-level rpe_avg)
-        session_rpes = [s.rpe_avg for s in week_sessions if s.rpe_avg is not None]
-        if not session_rpes:
-            # Fallback: compute from individual attendance RPE records
-            session_ids = [s.id for s in week_sessions]
-            if session_ids:
-                avg_rpe_result = db.session.query(
-                    func.avg(Attendance.rpe)
-                ).filter(
-                    Attendance.training_session_id.in_(session_ids),
-                    Attendance.rpe.isnot(None)
-                ).scalar()
-                avg_rpe = round(float(avg_rpe_result), 1) if avg_rpe_result else None
-            else:
-                avg_rpe = None
-        else:
-            avg_rpe = round(sum(session_rpes) / len(session_rpes), 1)
-
-        weekly_trend.append({
-            "week": week_label,
-            "sessions": len(week_sessions),
-            "matches": week_matches_count,
-            "avg_rpe": avg_rpe,
-        })
-
-    # Return in chronological order (oldest week first)
-    weekly_trend.reverse()
+    weekly_trend = dashboard_stats.weekly_trend(team.id, today)
 
     # ── Attendance summary ────────────────────────────────────────────────
 
-    if total_athletes > 0 and total_sessions > 0:
-        all_sessions = TrainingSession.query.filter_by(team_id=team.id).all()
-        attendance_rates = []
-        for s in all_sessions:
-            present = Attendance.query.filter_by(
-                training_session_id=s.id, status="present"
-            ).count()
-            attendance_rates.append(present / total_athletes * 100)
-        avg_attendance_rate = round(
-            sum(attendance_rates) / len(attendance_rates), 1
-        ) if attendance_rates else 0
-    else:
-        avg_attendance_rate = 0
+    avg_attendance_rate = dashboard_stats.avg_attendance_rate(
+        team.id, athletes["total"], sessions["total"]
+    )
 
     # ── Team health ───────────────────────────────────────────────────────
 
-    athletes_available = Athlete.query.filter_by(
-        team_id=team.id, status="available"
-    ).count()
-    athletes_attention = Athlete.query.filter_by(
-        team_id=team.id, status="attention"
-    ).count()
-    athletes_unavailable = Athlete.query.filter_by(
-        team_id=team.id, status="unavailable"
-    ).count()
-
     team_health = {
-        "athletes_available": athletes_available,
-        "athletes_attention": athletes_attention,
-        "athletes_unavailable": athletes_unavailable,
+        "athletes_available": athletes["available"],
+        "athletes_attention": athletes["attention"],
+        "athletes_unavailable": athletes["unavailable"],
     }
 
     return jsonify({
@@ -305,7 +184,7 @@ def advanced_team_stats(team_id):
 @coach_required
 def training_suggestions(user, team_id):
     """AI-driven training suggestions based on team wellness, workload and injuries."""
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -494,8 +373,7 @@ def achievements(user):
     achievements = []
 
     # Count-based achievements
-    teams = Team.query.filter_by(coach_id=user.id).all()
-    team_ids = [t.id for t in teams]
+    team_ids = owned_team_ids(user)
 
     total_athletes = Athlete.query.filter(Athlete.team_id.in_(team_ids)).count() if team_ids else 0
     total_sessions = TrainingSession.query.filter(TrainingSession.team_id.in_(team_ids)).count() if team_ids else 0
@@ -551,8 +429,7 @@ def activity_log(user, athlete_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     timeline = []
@@ -634,115 +511,76 @@ def activity_log(user, athlete_id):
 @dashboard_bp.route("/training-load/<int:team_id>", methods=["GET"])
 @coach_required
 def training_load(user, team_id):
-    """ACWR (Acute:Chronic Workload Ratio), monotony and strain for a team."""
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    """ACWR (Acute:Chronic Workload Ratio), monotony and strain for a team and its athletes."""
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
-    today = date.today()
+    acute_days = request.args.get("acute", 7, type=int)
+    chronic_days = request.args.get("chronic", 28, type=int)
+    max_days = training_load_service.MAX_WINDOW_DAYS
+    if not 1 <= acute_days <= chronic_days <= max_days:
+        return jsonify({"error": f"acute and chronic must satisfy 1 <= acute <= chronic <= {max_days}"}), 400
 
-    # Collect daily loads for the last 35 days (28 chronic + 7 acute)
-    start_date = today - timedelta(days=35)
-    sessions = TrainingSession.query.filter(
-        TrainingSession.team_id == team.id,
-        TrainingSession.date >= start_date,
-    ).all()
+    today = date.today()
+    trend_weeks = 6
+    start_date = training_load_service.history_start(today, chronic_days, trend_weeks)
 
-    # Build daily load map: load = RPE * duration
-    daily_loads = {}
-    for s in sessions:
-        day_key = s.date.isoformat()
-        load = (s.rpe_avg or 5) * (s.duration_minutes or 60)
-        daily_loads[day_key] = daily_loads.get(day_key, 0) + load
-
-    # Compute 7-day windows for acute and chronic
-    def get_window_loads(end_day, days):
-        total = 0
-        vals = []
-        for d in range(days):
-            day = (end_day - timedelta(days=d)).isoformat()
-            v = daily_loads.get(day, 0)
-            total += v
-            vals.append(v)
-        return total, vals
-
-    # Acute load (last 7 days)
-    acute_total, acute_vals = get_window_loads(today, 7)
-    acute_avg = acute_total / 7
-
-    # Chronic load (last 28 days)
-    chronic_total, chronic_vals = get_window_loads(today, 28)
-    chronic_avg = chronic_total / 28
-
-    # ACWR
-    acwr = round(acute_avg / chronic_avg, 2) if chronic_avg > 0 else 0
-
-    # Monotony (last 7 days): mean / std_dev
-    import statistics
-    if len(acute_vals) > 1 and any(v > 0 for v in acute_vals):
-        mean_load = statistics.mean(acute_vals)
-        std_load = statistics.stdev(acute_vals)
-        monotony = round(mean_load / std_load, 2) if std_load > 0 else 0
-    else:
-        mean_load = 0
-        monotony = 0
+    # Team load from session-level RPE x duration
+    team_loads = training_load_service.team_daily_loads(team.id, start_date, today)
+    team_metrics = training_load_service.load_metrics(team_loads, acute_days, chronic_days)
 
-    # Strain = weekly load * monotony
+    acwr = round(float(team_metrics["acwr"][0]), 2)
+    acwr_ewma = round(float(team_metrics["acwr_ewma"][0]), 2)
+    monotony = round(float(team_metrics["monotony"][0]), 2)
+    acute_total = float(team_metrics["acute_total"][0])
     strain = round(acute_total * monotony, 0)
-
-    # Risk zone
-    if acwr < 0.8:
-        risk = "undertraining"
-        risk_label = "Sottoallenamento"
-        risk_color = "blue"
-    elif acwr <= 1.3:
-        risk = "optimal"
-        risk_label = "Zona ottimale"
-        risk_color = "green"
-    elif acwr <= 1.5:
-        risk = "caution"
-        risk_label = "Attenzione"
-        risk_color = "yellow"
-    else:
-        risk = "danger"
-        risk_label = "Pericolo sovraccarico"
-        risk_color = "red"
+    risk, risk_label, risk_color = training_load_service.risk_zone(acwr)
 
     # Weekly trend (last 6 weeks)
+    week_totals = training_load_service.weekly_totals(team_loads, trend_weeks)[:, 0]
+    week_sessions = training_load_service.weekly_totals(team_loads > 0, trend_weeks)[:, 0]
     weekly_trend = []
-    for w in range(6):
-        week_end = today - timedelta(days=w * 7)
-        week_total, week_vals = get_window_loads(week_end, 7)
-        week_sessions = sum(1 for v in week_vals if v > 0)
+    for i, (week_total, sessions) in enumerate(zip(week_totals, week_sessions)):
+        w = trend_weeks - 1 - i
         weekly_trend.append({
             "week": f"Sett. -{w}" if w > 0 else "Corrente",
-            "load": round(week_total, 0),
-            "sessions": week_sessions,
-            "avg_daily": round(week_total / 7, 0),
+            "load": round(float(week_total), 0),
+            "sessions": int(sessions),
+            "avg_daily": round(float(week_total) / 7, 0),
         })
-    weekly_trend.reverse()
 
-    # Per-athlete loads (last 7 days)
-    athlete_loads = []
+    # Per-athlete loads from individual RPE x minutes trained
     athletes = Athlete.query.filter_by(team_id=team.id).all()
-    for athlete in athletes:
-        attendances = Attendance.query.join(TrainingSession).filter(
-            Attendance.athlete_id == athlete.id,
-            TrainingSession.date >= today - timedelta(days=7),
-        ).all()
-        total = sum((a.rpe or 5) * (a.minutes_trained or a.session.duration_minutes or 60) for a in attendances)
+    athlete_ids = [a.id for a in athletes]
+    loads, sessions = training_load_service.athlete_daily_loads(athlete_ids, start_date, today)
+    athlete_metrics = training_load_service.load_metrics(loads, acute_days, chronic_days)
+    acute_sessions = sessions[-acute_days:].sum(axis=0)
+
+    athlete_loads = []
+    for i, athlete in enumerate(athletes):
+        athlete_acwr = round(float(athlete_metrics["acwr"][i]), 2)
         athlete_loads.append({
             "athlete_id": athlete.id,
-            "name": athlete.full_name,
-            "load": round(total, 0),
-            "sessions": len(attendances),
+            "name": f"{athlete.first_name} {athlete.last_name}",
+            "load": round(float(athlete_metrics["acute_total"][i]), 0),
+            "sessions": int(acute_sessions[i]),
+            "chronic_load": round(float(athlete_metrics["chronic_total"][i]), 0),
+            "acwr": athlete_acwr,
+            "acwr_ewma": round(float(athlete_metrics["acwr_ewma"][i]), 2),
+            "monotony": round(float(athlete_metrics["monotony"][i]), 2),
+            "strain": round(float(athlete_metrics["strain"][i]), 0),
+            "risk": training_load_service.risk_zone(athlete_acwr)[0],
         })
     athlete_loads.sort(key=lambda x: x["load"], reverse=True)
 
     return jsonify({
         "acwr": acwr,
+        "acwr_ewma": acwr_ewma,
+        "acute_days": acute_days,
+        "chronic_days": chronic_days,
         "acute_load": round(acute_total, 0),
-        "chronic_load": round(chronic_total, 0),
+        "chronic_load": round(float(team_metrics["chronic_total"][0]), 0),
         "monotony": monotony,
         "strain": strain,
         "risk": risk,
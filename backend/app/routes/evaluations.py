@@ -3,8 +3,7 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models.evaluation import Evaluation
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, owns_team
 
 evaluations_bp = Blueprint("evaluations", __name__)
 
@@ -20,8 +19,7 @@ def list_evaluations(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     evaluations = Evaluation.query.filter_by(athlete_id=athlete.id)\
@@ -37,8 +35,7 @@ def create_evaluation(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     evaluation = Evaluation(
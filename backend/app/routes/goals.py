@@ -3,8 +3,7 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models.goal import Goal
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, owns_team
 
 goals_bp = Blueprint("goals", __name__)
 
@@ -21,8 +20,7 @@ def list_goals(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     goals = Goal.query.filter_by(athlete_id=athlete.id)\
@@ -42,8 +40,7 @@ def create_goal(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     if not data.get("title"):
@@ -80,8 +77,7 @@ def update_goal(user, goal_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
@@ -130,8 +126,7 @@ def delete_goal(user, goal_id):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     db.session.delete(goal)
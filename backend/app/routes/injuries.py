@@ -2,8 +2,7 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models.injury import Injury
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, owns_team
 
 injuries_bp = Blueprint("injuries", __name__)
 
@@ -19,8 +18,7 @@ def list_injuries(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     status = request.args.get("status")
@@ -40,8 +38,7 @@ def create_injury(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     injury = Injury(
@@ -70,8 +67,7 @@ def update_injury(user, injury_id):
         return jsonify({"error": "Injury not found"}), 404
 
     athlete = Athlete.query.get(injury.athlete_id)
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
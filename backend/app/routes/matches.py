@@ -2,9 +2,8 @@ import json
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.match import Match
-from app.models.team import Team
 from app.models.athlete import Athlete
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, get_owned_team, owns_team
 
 matches_bp = Blueprint("matches", __name__)
 
@@ -16,7 +15,7 @@ def list_matches(user):
     if not team_id:
         return jsonify({"error": "team_id is required"}), 400
 
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -32,8 +31,7 @@ def get_match(user, match_id):
     if not match:
         return jsonify({"error": "Match not found"}), 404
 
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, match.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     return jsonify({"match": match.to_dict()})
@@ -44,7 +42,7 @@ def get_match(user, match_id):
 def create_match(user):
     data = request.get_json()
     team_id = data.get("team_id")
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -76,8 +74,7 @@ def update_match(user, match_id):
     if not match:
         return jsonify({"error": "Match not found"}), 404
 
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, match.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
@@ -106,8 +103,7 @@ def delete_match(user, match_id):
     if not match:
         return jsonify({"error": "Match not found"}), 404
 
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, match.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     db.session.delete(match)
@@ -121,7 +117,7 @@ def delete_match(user, match_id):
 @coach_required
 def get_callup(match_id, user):
     match = Match.query.get_or_404(match_id)
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
+    team = get_owned_team(user, match.team_id)
     if not team:
         return jsonify({'error': 'Not found'}), 404
 
@@ -139,7 +135,7 @@ def get_callup(match_id, user):
 @coach_required
 def update_callup(match_id, user):
     match = Match.query.get_or_404(match_id)
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
+    team = get_owned_team(user, match.team_id)
     if not team:
         return jsonify({'error': 'Not found'}), 404
 
@@ -161,7 +157,7 @@ def update_callup(match_id, user):
 @coach_required
 def callup_history(match_id, user):
     match = Match.query.get_or_404(match_id)
-    team = Team.query.filter_by(id=match.team_id, coach_id=user.id).first()
+    team = get_owned_team(user, match.team_id)
     if not team:
         return jsonify({'error': 'Not found'}), 404
 
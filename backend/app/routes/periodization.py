@@ -5,8 +5,7 @@ from app import db
 from app.models.periodization import PeriodizationCycle
 from app.models.training import TrainingSession
 from app.models.match import Match
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, owns_team
 
 periodization_bp = Blueprint("periodization", __name__)
 
@@ -18,8 +17,7 @@ def list_cycles(user):
     cycle_type = request.args.get("cycle_type")
     if not team_id:
         return jsonify({"error": "team_id required"}), 400
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, team_id):
         return jsonify({"error": "Team not found"}), 404
     q = PeriodizationCycle.query.filter_by(team_id=team_id)
     if cycle_type:
@@ -33,8 +31,7 @@ def list_cycles(user):
 def create_cycle(user):
     data = request.get_json()
     team_id = data.get("team_id")
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, team_id):
         return jsonify({"error": "Team not found"}), 404
     cycle = PeriodizationCycle(
         team_id=team_id,
@@ -59,8 +56,7 @@ def update_cycle(user, cycle_id):
     cycle = PeriodizationCycle.query.get(cycle_id)
     if not cycle:
         return jsonify({"error": "Cycle not found"}), 404
-    team = Team.query.filter_by(id=cycle.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, cycle.team_id):
         return jsonify({"error": "Not authorized"}), 403
     data = request.get_json()
     for field in ["name", "cycle_type", "objectives", "planned_load", "notes", "color", "parent_id"]:
@@ -80,8 +76,7 @@ def delete_cycle(user, cycle_id):
     cycle = PeriodizationCycle.query.get(cycle_id)
     if not cycle:
         return jsonify({"error": "Cycle not found"}), 404
-    team = Team.query.filter_by(id=cycle.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, cycle.team_id):
         return jsonify({"error": "Not authorized"}), 403
     db.session.delete(cycle)
     db.session.commit()
@@ -96,8 +91,7 @@ def calendar_view(user):
     end = request.args.get("end")
     if not team_id or not start or not end:
         return jsonify({"error": "team_id, start and end required"}), 400
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, team_id):
         return jsonify({"error": "Team not found"}), 404
     start_date = date.fromisoformat(start)
     end_date = date.fromisoformat(end)
@@ -132,7 +126,7 @@ def calendar_view(user):
         wk["avg_rpe"] = round(sum(rpes) / len(rpes), 1) if rpes else None
     return jsonify({
         "cycles": [c.to_dict() for c in cycles],
-        "sessions": [s.to_dict() for s in sessions],
+        "sessions": TrainingSession.serialize_many(sessions),
         "matches": [m.to_dict() for m in matches],
         "weekly_loads": weekly_loads,
     })
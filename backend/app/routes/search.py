@@ -1,74 +1,59 @@
 from flask import Blueprint, request, jsonify
-from app.models.team import Team
 from app.models.athlete import Athlete
 from app.models.training import TrainingSession
 from app.models.match import Match
 from app.models.note import Note
 from app.models.ai_report import AIReport
+from app.services import search_index
 from app.utils.auth import coach_required
 
 search_bp = Blueprint("search", __name__)
 
 RESULTS_PER_CATEGORY = 5
 
+# Response key -> (model, indexed entity types)
+CATEGORIES = {
+    "athletes": (Athlete, ["athlete"]),
+    "sessions": (TrainingSession, ["training", "training_block"]),
+    "matches": (Match, ["match"]),
+    "notes": (Note, ["note"]),
+    "reports": (AIReport, ["ai_report"]),
+}
+
+
+def _ranked_ids(hits):
+    """Entity ids in rank order; training block hits count for their session."""
+    ids = []
+    for entity_type, entity_id, parent_id in hits:
+        entity_id = parent_id if entity_type == "training_block" else entity_id
+        if entity_id not in ids:
+            ids.append(entity_id)
+    return ids[:RESULTS_PER_CATEGORY]
+
 
 @search_bp.route("", methods=["GET"])
 @coach_required
 def search(user):
-    """Search across multiple entities for the current coach."""
+    """Search across multiple entities for the current coach, best matches first."""
     q = request.args.get("q", "").strip()
     if not q:
         return jsonify({"error": "Search query (q) is required"}), 400
 
-    like_pattern = f"%{q}%"
-
-    # Get IDs of teams owned by this coach (used to scope athletes, sessions, matches)
-    coach_team_ids = [t.id for t in Team.query.filter_by(coach_id=user.id).all()]
-
-    # -- Athletes --
-    athletes = []
-    if coach_team_ids:
-        athletes = Athlete.query.filter(
-            Athlete.team_id.in_(coach_team_ids),
-            (Athlete.first_name.ilike(like_pattern) | Athlete.last_name.ilike(like_pattern))
-        ).limit(RESULTS_PER_CATEGORY).all()
-
-    # -- Training Sessions --
-    sessions = []
-    if coach_team_ids:
-        sessions = TrainingSession.query.filter(
-            TrainingSession.team_id.in_(coach_team_ids),
-            TrainingSession.title.ilike(like_pattern)
-        ).order_by(TrainingSession.date.desc())\
-         .limit(RESULTS_PER_CATEGORY).all()
-
-    # -- Matches --
-    matches = []
-    if coach_team_ids:
-        matches = Match.query.filter(
-            Match.team_id.in_(coach_team_ids),
-            (Match.opponent.ilike(like_pattern) | Match.competition.ilike(like_pattern))
-        ).order_by(Match.date.desc())\
-         .limit(RESULTS_PER_CATEGORY).all()
-
-    # -- Notes --
-    notes = Note.query.filter(
-        Note.coach_id == user.id,
-        Note.text.ilike(like_pattern)
-    ).order_by(Note.created_at.desc())\
-     .limit(RESULTS_PER_CATEGORY).all()
-
-    # -- AI Reports --
-    reports = AIReport.query.filter(
-        AIReport.coach_id == user.id,
-        (AIReport.title.ilike(like_pattern) | AIReport.content.ilike(like_pattern))
-    ).order_by(AIReport.created_at.desc())\
-     .limit(RESULTS_PER_CATEGORY).all()
-
-    return jsonify({
-        "athletes": [a.to_dict() for a in athletes],
-        "sessions": [s.to_dict() for s in sessions],
-        "matches": [m.to_dict() for m in matches],
-        "notes": [n.to_dict() for n in notes],
-        "reports": [r.to_dict() for r in reports],
-    })
+    terms = search_index.terms_of(q)
+    if not terms:
+        return jsonify({key: [] for key in CATEGORIES})
+
+    backend = search_index.get_backend()
+    results = {}
+    for key, (model, entity_types) in CATEGORIES.items():
+        # Over-fetch sessions so several matching blocks of one session don't crowd out others
+        limit = RESULTS_PER_CATEGORY * (4 if len(entity_types) > 1 else 1)
+        ids = _ranked_ids(backend.search(user.id, entity_types, terms, limit))
+        found = {obj.id: obj for obj in model.query.filter(model.id.in_(ids)).all()} if ids else {}
+        objects = [found[i] for i in ids if i in found]
+        if model is TrainingSession:
+            results[key] = TrainingSession.serialize_many(objects)
+        else:
+            results[key] = [obj.to_dict() for obj in objects]
+
+    return jsonify(results)
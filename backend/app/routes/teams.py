@@ -2,7 +2,7 @@ import json
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, get_owned_team
 
 teams_bp = Blueprint("teams", __name__)
 
@@ -17,7 +17,7 @@ def list_teams(user):
 @teams_bp.route("/<int:team_id>", methods=["GET"])
 @coach_required
 def get_team(user, team_id):
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
     return jsonify({"team": team.to_dict()})
@@ -50,7 +50,7 @@ def create_team(user):
 @teams_bp.route("/<int:team_id>", methods=["PATCH"])
 @coach_required
 def update_team(user, team_id):
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -69,7 +69,7 @@ def update_team(user, team_id):
 @teams_bp.route("/<int:team_id>", methods=["DELETE"])
 @coach_required
 def delete_team(user, team_id):
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -3,8 +3,7 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.training import TrainingSession, TrainingBlock
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, get_owned_team
 
 templates_bp = Blueprint("templates", __name__)
 
@@ -75,7 +74,7 @@ def create_template(user):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
+    team = get_owned_team(user, session.team_id)
     if not team:
         return jsonify({"error": "Not authorized"}), 403
 
@@ -118,7 +117,7 @@ def use_template(user, template_id):
     if not team_id or not date:
         return jsonify({"error": "team_id and date are required"}), 400
 
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
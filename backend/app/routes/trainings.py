@@ -2,8 +2,8 @@ import json
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.training import TrainingSession, TrainingBlock
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.services import load_rollup
+from app.utils.auth import coach_required, get_owned_team, owns_team
 
 trainings_bp = Blueprint("trainings", __name__)
 
@@ -15,13 +15,13 @@ def list_trainings(user):
     if not team_id:
         return jsonify({"error": "team_id is required"}), 400
 
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
     sessions = TrainingSession.query.filter_by(team_id=team.id)\
         .order_by(TrainingSession.date.desc()).all()
-    return jsonify({"sessions": [s.to_dict() for s in sessions]})
+    return jsonify({"sessions": TrainingSession.serialize_many(sessions)})
 
 
 @trainings_bp.route("/<int:session_id>", methods=["GET"])
@@ -31,8 +31,7 @@ def get_training(user, session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     return jsonify({"session": session.to_dict(include_blocks=True)})
@@ -43,7 +42,7 @@ def get_training(user, session_id):
 def create_training(user):
     data = request.get_json()
     team_id = data.get("team_id")
-    team = Team.query.filter_by(id=team_id, coach_id=user.id).first()
+    team = get_owned_team(user, team_id)
     if not team:
         return jsonify({"error": "Team not found"}), 404
 
@@ -95,11 +94,11 @@ def update_training(user, session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
+    old_date = session.date
     updatable = ["date", "start_time", "end_time", "duration_minutes", "title",
                  "status", "rpe_avg", "session_rating", "what_worked", "what_to_improve"]
     for field in updatable:
@@ -108,6 +107,11 @@ def update_training(user, session_id):
     if "objectives" in data:
         session.objectives = json.dumps(data["objectives"])
 
+    if "date" in data or "duration_minutes" in data:
+        db.session.flush()
+        new_date = load_rollup.session_date(session.id)
+        load_rollup.refresh(load_rollup.session_keys(session.id, old_date, new_date))
+
     db.session.commit()
     return jsonify({"session": session.to_dict(include_blocks=True)})
 
@@ -119,11 +123,13 @@ def delete_training(user, session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
+    affected = load_rollup.session_keys(session.id, session.date)
     db.session.delete(session)
+    db.session.flush()
+    load_rollup.refresh(affected)
     db.session.commit()
     return jsonify({"message": "Session deleted"})
 
@@ -137,8 +143,7 @@ def add_block(user, session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
@@ -175,8 +180,7 @@ def update_block(user, session_id, block_id):
         return jsonify({"error": "Block not found"}), 404
 
     session = TrainingSession.query.get(session_id)
-    team = Team.query.filter_by(id=session.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, session.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
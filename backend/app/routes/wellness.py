@@ -2,8 +2,7 @@ from flask import Blueprint, request, jsonify
 from app import db
 from app.models.wellness import WellnessEntry
 from app.models.athlete import Athlete
-from app.models.team import Team
-from app.utils.auth import coach_required
+from app.utils.auth import coach_required, owns_team
 
 wellness_bp = Blueprint("wellness", __name__)
 
@@ -19,8 +18,7 @@ def list_wellness(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     entries = WellnessEntry.query.filter_by(athlete_id=athlete.id)\
@@ -36,8 +34,7 @@ def create_wellness(user):
     if not athlete:
         return jsonify({"error": "Athlete not found"}), 404
 
-    team = Team.query.filter_by(id=athlete.team_id, coach_id=user.id).first()
-    if not team:
+    if not owns_team(user, athlete.team_id):
         return jsonify({"error": "Not authorized"}), 403
 
     entry = WellnessEntry(
@@ -0,0 +1,202 @@
+"""
+Endpoint benchmark: latency and query counts of the hot read endpoints.
+
+Each endpoint of every blueprint is called through the Flask test client as
+a seeded coach (see ``app.seed.generator``), a few times to warm up and then
+``iterations`` times. The results can be saved as a JSON baseline and later
+runs compared against it: more queries than the baseline, or a median
+latency more than ``tolerance`` above it, is reported as a regression.
+
+Query counts are deterministic for a given dataset, so they are the
+reliable signal between commits; latencies depend on the machine and are
+only comparable with a baseline recorded on the same host.
+"""
+
+import statistics
+import time
+from datetime import timedelta
+
+import click
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, select
+
+from app import db
+from app.models.athlete import Athlete
+from app.models.community import ChatRequest, Follow, Post
+from app.models.match import Match
+from app.models.season import Season
+from app.models.team import Team
+from app.models.training import TrainingSession
+
+# (blueprint, path); fields are filled from ``_context``
+ENDPOINTS = [
+    ("auth", "/api/auth/me"),
+    ("onboarding", "/api/onboarding/sports"),
+    ("teams", "/api/teams"),
+    ("teams", "/api/teams/{team_id}"),
+    ("athletes", "/api/athletes?team_id={team_id}"),
+    ("athletes", "/api/athletes/{athlete_id}"),
+    ("trainings", "/api/trainings?team_id={team_id}"),
+    ("trainings", "/api/trainings/{session_id}"),
+    ("matches", "/api/matches?team_id={team_id}"),
+    ("matches", "/api/matches/{match_id}"),
+    ("evaluations", "/api/evaluations?athlete_id={athlete_id}"),
+    ("wellness", "/api/wellness?athlete_id={athlete_id}"),
+    ("injuries", "/api/injuries?athlete_id={athlete_id}"),
+    ("goals", "/api/goals?athlete_id={athlete_id}"),
+    ("notes", "/api/notes"),
+    ("ai_reports", "/api/ai/reports"),
+    ("ai_reports", "/api/ai/jobs"),
+    ("dashboard", "/api/dashboard/athlete/{athlete_id}"),
+    ("dashboard", "/api/dashboard/team/{team_id}/stats"),
+    ("dashboard", "/api/dashboard/stats/{team_id}"),
+    ("dashboard", "/api/dashboard/suggestions/{team_id}"),
+    ("dashboard", "/api/dashboard/achievements"),
+    ("dashboard", "/api/dashboard/training-load/{team_id}"),
+    ("templates", "/api/templates"),
+    ("search", "/api/search?q={search_term}"),
+    ("attendance", "/api/attendance/{session_id}"),
+    ("staff", "/api/staff"),
+    ("seasons", "/api/seasons"),
+    ("seasons", "/api/seasons/{season_id}"),
+    ("backup", "/api/backup/"),
+    ("periodization", "/api/periodization/?team_id={team_id}"),
+    ("periodization", "/api/periodization/calendar?team_id={team_id}&start={week_start}&end={week_end}"),
+    ("community", "/api/community/feed"),
+    ("community", "/api/community/discover"),
+    ("community", "/api/community/coaches"),
+    ("community", "/api/community/saved"),
+    ("community", "/api/community/profile/{followed_id}"),
+    ("community", "/api/community/posts/{post_id}/comments"),
+    ("chat", "/api/chat/conversations"),
+    ("chat", "/api/chat/requests"),
+    ("chat", "/api/chat/messages/{chat_partner_id}"),
+    ("chat", "/api/chat/unread-count"),
+]
+
+
+def _context(coach_id):
+    """Ids to fill the endpoint paths: the coach's most recent team, etc."""
+    scalar = db.session.scalar
+    team_id = scalar(
+        select(Team.id).where(Team.coach_id == coach_id).order_by(Team.season_id.desc(), Team.id)
+    )
+    if team_id is None:
+        raise click.UsageError(f"Coach {coach_id} has no team to benchmark: run `flask seed generate`.")
+    athlete_id = scalar(select(Athlete.id).where(Athlete.team_id == team_id).order_by(Athlete.id))
+    followed_id = scalar(select(Follow.following_id).where(Follow.follower_id == coach_id).order_by(Follow.id))
+    # The messages endpoint only answers for an accepted chat
+    partner = scalar(
+        select(ChatRequest).where(
+            ChatRequest.status == "accepted",
+            (ChatRequest.from_user_id == coach_id) | (ChatRequest.to_user_id == coach_id),
+        ).order_by(ChatRequest.id)
+    )
+    session = db.session.scalars(
+        select(TrainingSession).where(TrainingSession.team_id == team_id, TrainingSession.status == "completed")
+        .order_by(TrainingSession.date.desc())
+    ).first()
+    if session is None:
+        raise click.UsageError(
+            f"Team {team_id} of coach {coach_id} has no completed training session to benchmark."
+        )
+    week_start = session.date - timedelta(days=session.date.weekday())
+    return {
+        "team_id": team_id,
+        "athlete_id": athlete_id,
+        "session_id": session.id,
+        "week_start": week_start.isoformat(),
+        "week_end": (week_start + timedelta(days=6)).isoformat(),
+        "match_id": scalar(select(Match.id).where(Match.team_id == team_id).order_by(Match.date.desc())),
+        "season_id": scalar(select(Season.id).where(Season.coach_id == coach_id, Season.is_active.is_(True))),
+        "search_term": scalar(select(Athlete.last_name).where(Athlete.id == athlete_id)),
+        "followed_id": followed_id or coach_id,
+        "post_id": scalar(select(Post.id).order_by(Post.likes_count.desc(), Post.id)),
+        "chat_partner_id": (partner.to_user_id if partner.from_user_id == coach_id else partner.from_user_id)
+        if partner else coach_id,
+    }
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def run(app, coach_id, iterations=20, warmup=2, only=None):
+    """Benchmark every endpoint (or the blueprints in ``only``) as ``coach_id``.
+
+    Returns ``{path template: {blueprint, status, queries, p50_ms, p95_ms, mean_ms}}``.
+    """
+    with app.app_context():
+        context = _context(coach_id)
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(coach_id))}"}
+        engine = db.engine
+        # Each request starts from a fresh session, as in production
+        db.session.remove()
+
+    client = app.test_client()
+    results = {}
+    for blueprint, template in ENDPOINTS:
+        if only and blueprint not in only:
+            continue
+        path = template.format(**context)
+        for _ in range(warmup):
+            client.get(path, headers=headers)
+
+        timings = []
+        with _QueryCounter(engine) as counter:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                response = client.get(path, headers=headers)
+                response.get_data()
+                timings.append((time.perf_counter() - started) * 1000)
+
+        results[template] = {
+            "blueprint": blueprint,
+            "status": response.status_code,
+            "queries": round(counter.count / iterations, 1),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(_percentile(timings, 0.95), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=2.0):
+    """Regressions of ``results`` against a ``baseline`` from an earlier run.
+
+    An endpoint regresses if it runs more queries, starts failing, or its
+    median is over ``tolerance`` (and ``min_delta_ms``) slower. A baseline
+    without ``p50_ms`` (a query budget, as in ``tests/``) skips the latency check.
+    """
+    regressions = []
+    for template, current in results.items():
+        previous = baseline.get(template)
+        if previous is None:
+            continue
+        if current["status"] >= 400 > previous["status"]:
+            regressions.append(f"{template}: status {previous['status']} -> {current['status']}")
+        if current["queries"] > previous["queries"]:
+            regressions.append(f"{template}: {previous['queries']} -> {current['queries']} queries")
+        if "p50_ms" not in previous:
+            continue
+        slower = current["p50_ms"] - previous["p50_ms"]
+        if slower > min_delta_ms and current["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{template}: p50 {previous['p50_ms']} -> {current['p50_ms']} ms")
+    return regressions
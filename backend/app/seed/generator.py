@@ -0,0 +1,464 @@
+"""
+Synthetic data for local load testing and the endpoint benchmark.
+
+``generate()`` builds coaches with several seasons of history (teams,
+athletes, sessions with blocks, attendance, matches, evaluations,
+wellness, injuries, notes and AI reports) plus a community of users with
+posts, follows, likes, comments, saves and chats. Follower counts follow a
+power law, so a few authors are followed by most of the community, as in
+production.
+
+Coach data goes through ``backup_restore.Restore`` (the same batched
+inserts a backup restore uses); everything else is Core ``insert()``
+batches. The derived data (search index, daily load rollup, community
+counters, feed timelines) is rebuilt at the end. Nothing is committed: the caller
+commits.
+
+The output is deterministic for a given ``seed`` and ``today``.
+"""
+
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta
+
+import bcrypt
+from sqlalchemy import insert
+
+from app import db
+from app.models.user import User
+from app.models.attendance import Attendance
+from app.models.community import (
+    ChatMessage, ChatRequest, Comment, Conversation, Follow, Post, PostLike, SavedPost,
+)
+from app.services import (
+    backup_restore, coach_search, load_rollup, search_index, social_counters, timeline, trending,
+)
+from app.utils.auth import invalidate_team_ids
+from app.utils.sport_config import SPORT_CONFIG
+
+SPORTS = ("football", "basketball", "volleyball")
+DEFAULT_PASSWORD = "seed-password"
+EMAIL_DOMAIN = "seed.coachpartner.test"
+
+FIRST_NAMES = (
+    "Luca", "Marco", "Giulia", "Sofia", "Matteo", "Alessandro", "Chiara", "Francesca", "Lorenzo",
+    "Andrea", "Martina", "Davide", "Sara", "Federico", "Elena", "Simone", "Giorgia", "Niccolò",
+    "Tommaso", "Beatrice", "Riccardo", "Alice", "Gabriele", "Aurora", "Édouard", "Zoë",
+)
+LAST_NAMES = (
+    "Rossi", "Russo", "Ferrari", "Esposito", "Bianchi", "Romano", "Colombo", "Ricci", "Marino",
+    "Greco", "Bruno", "Gallo", "Conti", "De Luca", "Mancini", "Costa", "Giordano", "Rizzo",
+    "Lombardi", "Moretti", "Barbieri", "Fontana", "Santoro", "Mariani", "D'Angelo", "Nicolò",
+)
+OPPONENTS = (
+    "Virtus", "Audace", "Pro Patria", "Sporting", "Atletico", "Polisportiva", "Libertas",
+    "Fortitudo", "Juventina", "Real", "Union", "Aurora",
+)
+TRAINING_DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday")
+INTENSITIES = ("low", "medium", "high", "very_high")
+MOODS = ("great", "good", "neutral", "low", "bad")
+ATTENDANCE_STATUSES = ("present",) * 16 + ("absent", "absent", "injured", "excused")
+INJURY_TYPES = ("muscular", "ligament", "bone", "tendon", "contusion")
+BODY_PARTS = ("hamstring", "ankle", "knee", "calf", "shoulder", "groin", "back")
+NOTE_TEXTS = (
+    "Buon atteggiamento, deve migliorare la comunicazione in campo.",
+    "Pressing alto efficace nel primo tempo, calo fisico nel finale.",
+    "Lavorare sulla ricezione e sul primo controllo orientato.",
+    "Ottima settimana, pronto per partire titolare.",
+    "Da monitorare il carico dopo il rientro dall'infortunio.",
+    "Transizioni difensive lente, ripetere le esercitazioni 4v4.",
+)
+POST_TEXTS = (
+    "Esercitazione di possesso 5v3 con transizione: ottima per lavorare sul pressing.",
+    "Oggi seduta tattica sulle palle inattive, i ragazzi hanno risposto bene.",
+    "Qualcuno ha idee per un riscaldamento con la palla per under 12?",
+    "Condivido la mia progressione per la costruzione dal basso.",
+    "Vittoria sofferta ma meritata, grande spirito di squadra!",
+    "Come gestite il carico nella settimana con doppia partita?",
+)
+COMMENT_TEXTS = ("Grazie, la provo!", "Molto utile.", "Che dimensioni usi per il campo?", "Top 👏", "Interessante.")
+CHAT_TEXTS = ("Ciao, posso chiederti un consiglio?", "Certo, dimmi pure.", "Come imposti il microciclo?",
+              "Tre sedute più la partita, ti mando lo schema.", "Perfetto, grazie mille!")
+
+
+def _sport_values(sport, key):
+    return [item["value"] for item in SPORT_CONFIG[sport][key]]
+
+
+def _password_hash(password):
+    # bcrypt is deliberately slow: hash once and share it across seeded users
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def _insert(model, rows, batch_size=backup_restore.BATCH_SIZE):
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(insert(model.__table__), rows[start:start + batch_size])
+
+
+class _Generator:
+    def __init__(self, rng, today):
+        self.rng = rng
+        self.today = today
+        self.now = datetime.combine(today, dt_time(12))
+        self.ids = itertools.count(1)  # Synthetic record ids for Restore
+        self.counts = Counter()
+        self.rosters = {}  # team record id -> athlete record ids
+        self.completed = []  # (team record id, session record id) to take attendance for
+
+    def name(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def moment(self, day, hour=None):
+        hour = self.rng.randint(8, 21) if hour is None else hour
+        return datetime.combine(day, dt_time(hour, self.rng.choice((0, 15, 30, 45))))
+
+    # ── Users ─────────────────────────────────────────────────────────
+
+    def users(self, count, prefix, password_hash):
+        rows = []
+        for i in range(count):
+            first, last = self.name()
+            joined = self.today - timedelta(days=self.rng.randint(30, 900))
+            rows.append({
+                "email": f"{prefix}{i + 1}@{EMAIL_DOMAIN}",
+                "password_hash": password_hash,
+                "first_name": first,
+                "last_name": last,
+                "search_name": coach_search.search_name(first, last),
+                "sport": self.rng.choice(SPORTS),
+                "coaching_level": self.rng.choice(("youth", "amateur", "semi-pro", "pro")),
+                "years_experience": self.rng.randint(1, 25),
+                "onboarding_completed": True,
+                "onboarding_step": 5,
+                "created_at": self.moment(joined),
+                "updated_at": self.moment(joined),
+            })
+        ids = backup_restore.Restore._insert(User, rows)
+        self.counts["user"] += len(ids)
+        return [(user_id, row["sport"]) for user_id, row in zip(ids, rows)]
+
+    # ── Coach data ────────────────────────────────────────────────────
+
+    def coach(self, coach_id, sport, seasons, teams_per_season, athletes_per_team,
+              weeks, sessions_per_week):
+        job = backup_restore.Restore(coach_id)
+        current_start = date(self.today.year if self.today.month >= 8 else self.today.year - 1, 8, 20)
+
+        for offset in range(seasons - 1, -1, -1):
+            start = current_start.replace(year=current_start.year - offset)
+            end = date(start.year + 1, 6, 30)
+            season_name = f"{start.year}-{start.year + 1}"
+            season = {"id": next(self.ids), "name": season_name, "start_date": start.isoformat(),
+                      "end_date": end.isoformat(), "is_active": offset == 0}
+            job.add("season", season)
+
+            for _ in range(teams_per_season):
+                self.team(job, sport, season, start, athletes_per_team, weeks, sessions_per_week)
+
+        job.flush()
+        self.attendance(job)
+        for record_type, count in job.counts.items():
+            self.counts[record_type] += count
+        invalidate_team_ids(coach_id)
+
+    def team(self, job, sport, season, start, athletes_per_team, weeks, sessions_per_week):
+        rng = self.rng
+        positions = _sport_values(sport, "positions")
+        block_types = _sport_values(sport, "block_types")
+        category = rng.choice(_sport_values(sport, "categories"))
+        days = sorted(rng.sample(range(5), sessions_per_week)) if sessions_per_week <= 5 else list(range(5))
+
+        team = {
+            "id": next(self.ids), "name": f"{rng.choice(OPPONENTS)} {category}", "sport": sport,
+            "category": category, "level": rng.choice(("amateur", "elite")),
+            "gender": rng.choice(("male", "female", "mixed")), "num_athletes": athletes_per_team,
+            "training_days": json.dumps([TRAINING_DAYS[d] for d in days]), "match_day": "saturday",
+            "season": season["name"], "season_id": season["id"],
+        }
+        job.add("team", team)
+
+        athletes = []
+        for number in range(1, athletes_per_team + 1):
+            first, last = self.name()
+            athlete = {
+                "id": next(self.ids), "team_id": team["id"], "first_name": first, "last_name": last,
+                "birth_date": date(start.year - rng.randint(11, 30), rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+                "jersey_number": number, "position": rng.choice(positions),
+                "dominant_foot" if sport == "football" else "dominant_hand": rng.choice(("left", "right", "right", "both")),
+                "height_cm": rng.randint(150, 200), "weight_kg": round(rng.uniform(45, 95), 1),
+                "status": rng.choice(("available",) * 8 + ("attention", "unavailable")),
+            }
+            job.add("athlete", athlete)
+            athletes.append(athlete)
+        self.rosters[team["id"]] = [a["id"] for a in athletes]
+
+        monday = start - timedelta(days=start.weekday())
+        sessions, matches = [], []
+        for week in range(weeks):
+            week_start = monday + timedelta(weeks=week)
+            for day in days:
+                session_date = week_start + timedelta(days=day)
+                done = session_date < self.today
+                session_id = next(self.ids)
+                blocks = [{
+                    "session_id": session_id, "order": order, "block_type": block_type, "name": f"{block_type.replace('_', ' ').title()} {order + 1}",
+                    "objective": rng.choice(SPORT_CONFIG[sport]["session_objectives"]),
+                    "duration_minutes": rng.choice((10, 15, 20, 25)), "intensity": rng.choice(INTENSITIES),
+                    "completed": done, "actual_rpe": round(rng.uniform(3, 9), 1) if done else None,
+                } for order, block_type in enumerate(
+                    ["warmup"] + rng.sample(block_types, min(len(block_types), rng.randint(2, 4))) + ["cooldown"]
+                )]
+                session = {
+                    "id": session_id, "team_id": team["id"], "date": session_date.isoformat(),
+                    "start_time": "18:00:00", "end_time": "19:30:00",
+                    "duration_minutes": sum(b["duration_minutes"] for b in blocks),
+                    "title": f"Seduta {week + 1}.{day + 1}",
+                    "objectives": json.dumps(rng.sample(SPORT_CONFIG[sport]["session_objectives"], 2)),
+                    "status": "completed" if done else "planned",
+                    "rpe_avg": round(rng.uniform(4, 8), 1) if done else None,
+                    "session_rating": rng.randint(2, 5) if done else None,
+                    "what_worked": rng.choice(NOTE_TEXTS) if done else None,
+                    "blocks": blocks,
+                }
+                sessions.append(session)
+
+            match_date = week_start + timedelta(days=5)
+            done = match_date < self.today
+            score_home, score_away = (rng.randint(0, 4), rng.randint(0, 4)) if done else (None, None)
+            match = {
+                "id": next(self.ids), "team_id": team["id"], "date": match_date.isoformat(),
+                "time": "15:00:00", "competition": "Campionato", "opponent": f"{rng.choice(OPPONENTS)} {category}",
+                "home_away": rng.choice(("home", "away")), "status": "completed" if done else "upcoming",
+                "called_up": json.dumps([a["id"] for a in athletes[:min(len(athletes), 18)]]),
+                "score_home": score_home, "score_away": score_away,
+                "result": None if not done else ("win" if score_home > score_away else
+                                                 "loss" if score_home < score_away else "draw"),
+                "what_worked": rng.choice(NOTE_TEXTS) if done else None,
+            }
+            matches.append(match)
+
+        # Grouped by type, so Restore inserts them in full batches
+        for session in sessions:
+            job.add("training_session", session)
+        for match in matches:
+            job.add("match", match)
+
+        for athlete in athletes:
+            for session in sessions[::sessions_per_week * 4]:
+                if session["status"] != "completed":
+                    continue
+                scores = {k: rng.randint(4, 9) for k in ("technical", "tactical", "physical", "mental")}
+                job.add("evaluation", {
+                    "athlete_id": athlete["id"], "training_session_id": session["id"], "date": session["date"],
+                    **scores, "overall": round(sum(scores.values()) / 4), "comment": rng.choice(NOTE_TEXTS),
+                })
+        for athlete in athletes:
+            for session in sessions:
+                if session["status"] == "completed" and rng.random() < 0.6:
+                    job.add("wellness_entry", {
+                        "athlete_id": athlete["id"], "date": session["date"],
+                        "energy": rng.randint(4, 10), "sleep_quality": rng.randint(4, 10), "stress": rng.randint(1, 7),
+                        "doms": rng.randint(1, 7), "pain": rng.randint(0, 4), "mood": rng.choice(MOODS),
+                    })
+        for athlete in rng.sample(athletes, len(athletes) // 6):
+            occurred = date.fromisoformat(rng.choice(sessions)["date"])
+            returned = occurred + timedelta(days=rng.randint(7, 60))
+            job.add("injury", {
+                "athlete_id": athlete["id"], "injury_type": rng.choice(INJURY_TYPES),
+                "body_part": rng.choice(BODY_PARTS), "date_occurred": occurred.isoformat(),
+                "date_return": returned.isoformat(),
+                "status": "cleared" if returned < self.today else "recovery",
+                "severity": rng.choice(("mild", "moderate", "severe")),
+            })
+        for entity_type, items in (("athlete", athletes), ("training", sessions), ("match", matches)):
+            for item in rng.sample(items, len(items) // 4):
+                job.add("note", {
+                    "entity_type": entity_type, "entity_id": item["id"], "text": rng.choice(NOTE_TEXTS),
+                    "is_quick_note": rng.random() < 0.3,
+                    "created_at": self.moment(date.fromisoformat(item.get("date") or start.isoformat())).isoformat(),
+                })
+        for session in sessions[::sessions_per_week * 2]:
+            if session["status"] == "completed":
+                job.add("ai_report", {
+                    "report_type": "post_training", "title": f"Report {session['title']}",
+                    "input_refs": json.dumps({"training_ids": [session["id"]]}),
+                    "content": rng.choice(NOTE_TEXTS), "confidence": "medium", "model_used": "seed",
+                    "created_at": self.moment(date.fromisoformat(session["date"]), 21).isoformat(),
+                })
+        self.completed += [(team["id"], s["id"]) for s in sessions if s["status"] == "completed"]
+
+    def attendance(self, job):
+        rng = self.rng
+        session_ids, athlete_ids = job.ids["training_session"], job.ids["athlete"]
+        rows = []
+        for team_id, session_id in self.completed:
+            for athlete_id in self.rosters[team_id]:
+                status = rng.choice(ATTENDANCE_STATUSES)
+                present = status == "present"
+                rows.append({
+                    "athlete_id": athlete_ids[athlete_id], "training_session_id": session_ids[session_id],
+                    "status": status, "minutes_trained": rng.choice((None, 60, 75, 90)) if present else None,
+                    "rpe": rng.randint(3, 9) if present and rng.random() < 0.8 else None,
+                })
+        _insert(Attendance, rows)
+        self.counts["attendance"] += len(rows)
+        self.completed, self.rosters = [], {}
+
+    # ── Community ─────────────────────────────────────────────────────
+
+    def community(self, users, posts_per_user, follows_per_user, chats_per_user):
+        rng = self.rng
+        user_ids = [user_id for user_id, _ in users]
+        sport_of = dict(users)
+        # Zipf-like popularity: the k-th user is followed/liked with weight 1/k
+        ranked = rng.sample(user_ids, len(user_ids))
+        weights = [1 / rank for rank in range(1, len(ranked) + 1)]
+        cum_weights = list(itertools.accumulate(weights))  # choices() would re-sum them on every call
+
+        follows = set()
+        for follower in user_ids:
+            wanted = min(len(user_ids) - 1, max(0, int(rng.expovariate(1 / follows_per_user)))) if follows_per_user else 0
+            for target in rng.choices(ranked, cum_weights=cum_weights, k=wanted * 2):
+                if target == follower or (follower, target) in follows:
+                    continue
+                follows.add((follower, target))
+                wanted -= 1
+                if wanted <= 0:
+                    break
+        _insert(Follow, [
+            {"follower_id": a, "following_id": b, "created_at": self.now - timedelta(days=rng.randint(1, 365))}
+            for a, b in sorted(follows)
+        ])
+        self.counts["follow"] += len(follows)
+
+        post_rows = []
+        for author in user_ids:
+            for _ in range(rng.randint(0, posts_per_user * 2)):
+                post_rows.append({
+                    "author_id": author, "sport": sport_of[author],
+                    "post_type": rng.choice(("text", "text", "photo", "exercise")),
+                    "content": rng.choice(POST_TEXTS),
+                    "created_at": self.now - timedelta(minutes=rng.randint(1, 180 * 24 * 60)),
+                })
+        post_rows.sort(key=lambda row: row["created_at"])
+        post_ids = backup_restore.Restore._insert(Post, post_rows)
+        self.counts["post"] += len(post_ids)
+
+        likes, comments, saves = [], [], []
+        likes_count, comments_count, saves_count = Counter(), Counter(), Counter()
+        popularity = dict(zip(ranked, weights))
+        for post_id, row in zip(post_ids, post_rows):
+            # Popular authors' posts get more engagement
+            reach = popularity[row["author_id"]] * len(user_ids) * 0.5 + rng.expovariate(0.5)
+            for user_id in set(rng.sample(user_ids, min(len(user_ids), int(reach)))):
+                when = row["created_at"] + timedelta(minutes=rng.randint(1, 600))
+                likes.append({"post_id": post_id, "user_id": user_id, "created_at": when})
+                likes_count[post_id] += 1
+                if rng.random() < 0.15:
+                    comments.append({"post_id": post_id, "author_id": user_id,
+                                     "text": rng.choice(COMMENT_TEXTS), "created_at": when})
+                    comments_count[post_id] += 1
+                if rng.random() < 0.1:
+                    saves.append({"post_id": post_id, "user_id": user_id, "created_at": when})
+                    saves_count[post_id] += 1
+        _insert(PostLike, likes)
+        _insert(Comment, comments)
+        _insert(SavedPost, saves)
+        for post_id in post_ids:
+            if likes_count[post_id] or comments_count[post_id] or saves_count[post_id]:
+                db.session.execute(
+                    Post.__table__.update().where(Post.id == post_id).values(
+                        likes_count=likes_count[post_id], comments_count=comments_count[post_id],
+                        saves_count=saves_count[post_id],
+                    )
+                )
+        self.counts["like"] += len(likes)
+        self.counts["comment"] += len(comments)
+        self.counts["saved_post"] += len(saves)
+
+        self.chats(user_ids, chats_per_user)
+
+    def chats(self, user_ids, chats_per_user):
+        rng = self.rng
+        pairs = set()
+        for user_id in user_ids:
+            for other in rng.sample(user_ids, min(len(user_ids), chats_per_user)):
+                if other != user_id and (other, user_id) not in pairs:
+                    pairs.add((user_id, other))
+
+        requests, messages = [], []
+        for sender, receiver in sorted(pairs):
+            status = rng.choice(("accepted", "accepted", "accepted", "pending", "rejected"))
+            started = self.now - timedelta(minutes=rng.randint(60, 90 * 24 * 60))
+            requests.append({"from_user_id": sender, "to_user_id": receiver, "status": status, "created_at": started})
+            if status != "accepted":
+                continue
+            when = started
+            for i in range(rng.randint(1, 12)):
+                when += timedelta(minutes=rng.randint(1, 3 * 24 * 60))
+                if when >= self.now:
+                    break
+                messages.append({
+                    "sender_id": sender if i % 2 == 0 else receiver,
+                    "receiver_id": receiver if i % 2 == 0 else sender,
+                    "text": CHAT_TEXTS[i % len(CHAT_TEXTS)], "read": when < self.now - timedelta(days=1),
+                    "created_at": when,
+                })
+        _insert(ChatRequest, requests)
+        messages.sort(key=lambda row: row["created_at"])
+        message_ids = backup_restore.Restore._insert(ChatMessage, messages)
+
+        conversations = {}
+        for message_id, message in zip(message_ids, messages):
+            user_a, user_b = Conversation.pair(message["sender_id"], message["receiver_id"])
+            conversation = conversations.setdefault((user_a, user_b), {
+                "user_a_id": user_a, "user_b_id": user_b, "unread_a": 0, "unread_b": 0,
+                "created_at": message["created_at"],
+            })
+            conversation.update(last_message_id=message_id, last_message_at=message["created_at"],
+                                last_activity_at=message["created_at"])
+            if not message["read"]:
+                conversation["unread_a" if message["receiver_id"] == user_a else "unread_b"] += 1
+        _insert(Conversation, list(conversations.values()))
+
+        self.counts["chat_request"] += len(requests)
+        self.counts["chat_message"] += len(messages)
+        self.counts["conversation"] += len(conversations)
+
+
+def generate(coaches=3, seasons=2, teams_per_season=2, athletes_per_team=18, weeks=30,
+             sessions_per_week=3, community_users=300, posts_per_user=4, follows_per_user=25,
+             chats_per_user=2, password=DEFAULT_PASSWORD, seed=0, today=None):
+    """Insert a synthetic dataset (without committing).
+
+    Coaches are ``coach<n>@seed.coachpartner.test`` and community users
+    ``user<n>@...``, all with ``password``. Returns the seeded coach ids,
+    row counts per record type and the elapsed time.
+    """
+    started = time.perf_counter()
+    gen = _Generator(random.Random(seed), today or date.today())
+    password_hash = _password_hash(password)
+
+    coach_users = gen.users(coaches, "coach", password_hash)
+    for coach_id, sport in coach_users:
+        gen.coach(coach_id, sport, seasons, teams_per_season, athletes_per_team, weeks, sessions_per_week)
+
+    members = coach_users + gen.users(community_users, "user", password_hash)
+    gen.community(members, posts_per_user, follows_per_user, chats_per_user)
+
+    # Core inserts bypass the ORM hooks that maintain the derived tables
+    search_index.reindex()
+    load_rollup.rebuild()
+    social_counters.reconcile()
+    trending.rescore()
+    if timeline.is_enabled():
+        timeline.rebuild()
+
+    return {
+        "coach_ids": [coach_id for coach_id, _ in coach_users],
+        "counts": dict(gen.counts),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
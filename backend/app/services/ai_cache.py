@@ -0,0 +1,104 @@
+"""
+Content-addressed cache for AI completions.
+
+The key is a SHA-256 of the model, the generation parameters and the
+messages. The prompts embed the serialized session/match/athlete data, notes
+and attendance, so any change to the inputs changes the key. Entries live in
+the ``ai_cache_entries`` table (shared by every worker, survives restarts)
+and expire after AI_CACHE_TTL seconds. Beyond AI_CACHE_MAX_ENTRIES, the
+least recently used entries are evicted.
+
+Reads and writes run on ``db.session``, in the caller's transaction, and are
+committed with it (the report saved with the completion, or the job's own
+commit). A separate connection could wait on the write lock the caller's
+session holds, which on SQLite ends in "database is locked".
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+
+from app import db
+from app.models.ai_cache import AICacheEntry
+
+# Bump to invalidate every entry when the cached payload format changes
+CACHE_VERSION = 1
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def is_enabled():
+    return current_app.config.get("AI_CACHE_ENABLED", True)
+
+
+def make_key(model, params, messages):
+    payload = json.dumps(
+        {"v": CACHE_VERSION, "model": model, "params": params, "messages": messages},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _count(outcome):
+    with _lock:
+        _stats[outcome] += 1
+
+
+def stats():
+    """Hit/miss counters of this process since start."""
+    with _lock:
+        result = dict(_stats)
+    lookups = result["hits"] + result["misses"]
+    result["hit_rate"] = round(result["hits"] / lookups, 3) if lookups else None
+    return result
+
+
+def get(key):
+    """Cached completion for ``key`` (content, model, token counts), or None."""
+    now = datetime.utcnow()
+    table = AICacheEntry.__table__
+    row = db.session.execute(
+        select(table.c.content, table.c.model, table.c.prompt_tokens, table.c.completion_tokens)
+        .where(table.c.key == key, table.c.expires_at > now)
+    ).first()
+    if row is None:
+        _count("misses")
+        return None
+    db.session.execute(
+        update(table).where(table.c.key == key)
+        .values(hits=table.c.hits + 1, last_used_at=now)
+    )
+    _count("hits")
+    return dict(row._mapping)
+
+
+def put(key, model, content, prompt_tokens=None, completion_tokens=None):
+    """Store a completion, then evict expired and least recently used entries."""
+    now = datetime.utcnow()
+    ttl = timedelta(seconds=current_app.config.get("AI_CACHE_TTL", 7 * 24 * 3600))
+    max_entries = current_app.config.get("AI_CACHE_MAX_ENTRIES", 5000)
+    table = AICacheEntry.__table__
+
+    session = db.session
+    session.execute(delete(table).where(table.c.key == key))
+    session.execute(insert(table).values(
+        key=key, model=model, content=content,
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+        hits=0, created_at=now, last_used_at=now, expires_at=now + ttl,
+    ))
+
+    session.execute(delete(table).where(table.c.expires_at <= now))
+    excess = session.execute(select(func.count()).select_from(table)).scalar() - max_entries
+    if excess > 0:
+        oldest = select(table.c.key).order_by(table.c.last_used_at.asc()).limit(excess)
+        session.execute(delete(table).where(table.c.key.in_(oldest)))
+
+
+def clear():
+    """Drop every cached entry (without committing). Returns the number removed."""
+    return db.session.execute(delete(AICacheEntry.__table__)).rowcount
@@ -0,0 +1,193 @@
+"""
+Process-wide OpenAI client manager.
+
+One ``OpenAI`` client (and so one pooled, keep-alive HTTP connection pool)
+is created per process and shared by every request and AI job thread. The
+manager owns the timeouts, retries (the SDK's exponential backoff on
+connection errors, 408/409/429 and 5xx), a concurrency limit, and per-call
+latency/token metrics.
+
+Configuration: OPENAI_API_KEY, OPENAI_BASE_URL (e.g. a local stub server),
+OPENAI_MODEL, AI_TIMEOUT, AI_CONNECT_TIMEOUT, AI_MAX_RETRIES,
+AI_MAX_CONCURRENCY.
+"""
+
+import threading
+import time
+
+import httpx
+from flask import current_app
+from openai import OpenAI
+
+
+class AIBusyError(Exception):
+    """No concurrency slot became free within the timeout."""
+
+
+class AIClientManager:
+    def __init__(self, api_key, base_url=None, model="gpt-4o-mini", timeout=60.0,
+                 connect_timeout=5.0, max_retries=2, max_concurrency=4, logger=None):
+        self.model = model
+        self.timeout = timeout
+        self.logger = logger
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._http = httpx.Client(
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url or None,
+            max_retries=max_retries,
+            http_client=self._http,
+        )
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "latency_ms_total": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def chat(self, messages, max_tokens, temperature=0.7, model=None):
+        """Run a chat completion; returns the content plus call metrics.
+
+        Waits up to the request timeout for a free concurrency slot.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise AIBusyError("Too many concurrent AI requests")
+
+        model = model or self.model
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        except Exception:
+            self._record(time.perf_counter() - started, None, error=True)
+            raise
+        finally:
+            self._slots.release()
+
+        metrics = self._record(time.perf_counter() - started, response.usage)
+        if self.logger:
+            self.logger.info(
+                "AI call model=%s latency=%.0fms prompt_tokens=%s completion_tokens=%s",
+                model, metrics["latency_ms"], metrics["prompt_tokens"], metrics["completion_tokens"],
+            )
+        return {
+            "content": response.choices[0].message.content,
+            "model": model,
+            **metrics,
+        }
+
+    def chat_stream(self, messages, max_tokens, temperature=0.7, model=None):
+        """Streaming chat completion.
+
+        Yields ``("token", text)`` for each content delta as it arrives, then
+        ``("done", result)`` with the full content and the same metrics as
+        ``chat`` plus ``ttft_ms`` (time to first token).
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise AIBusyError("Too many concurrent AI requests")
+
+        model = model or self.model
+        started = time.perf_counter()
+        first_token_at = None
+        parts = []
+        usage = None
+        try:
+            stream = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            with stream:
+                for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        parts.append(text)
+                        yield "token", text
+        except Exception:
+            self._record(time.perf_counter() - started, None, error=True)
+            raise
+        finally:
+            self._slots.release()
+
+        metrics = self._record(time.perf_counter() - started, usage)
+        ttft_ms = round((first_token_at - started) * 1000, 1) if first_token_at else None
+        if self.logger:
+            self.logger.info(
+                "AI stream model=%s ttft=%sms latency=%.0fms prompt_tokens=%s completion_tokens=%s",
+                model, ttft_ms, metrics["latency_ms"], metrics["prompt_tokens"], metrics["completion_tokens"],
+            )
+        yield "done", {"content": "".join(parts), "model": model, "ttft_ms": ttft_ms, **metrics}
+
+    def _record(self, elapsed, usage, error=False):
+        metrics = {
+            "latency_ms": round(elapsed * 1000, 1),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        }
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["errors"] += int(error)
+            self._stats["latency_ms_total"] += metrics["latency_ms"]
+            self._stats["prompt_tokens"] += metrics["prompt_tokens"] or 0
+            self._stats["completion_tokens"] += metrics["completion_tokens"] or 0
+        return metrics
+
+    def stats(self):
+        """Totals since the process started."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["latency_ms_avg"] = round(stats["latency_ms_total"] / stats["calls"], 1) if stats["calls"] else None
+        return stats
+
+    def close(self):
+        self._http.close()
+
+
+_create_lock = threading.Lock()
+
+
+def get_ai_client():
+    """The app-wide client manager, or None when no API key is configured."""
+    manager = current_app.extensions.get("ai_client")
+    if manager is not None:
+        return manager
+
+    config = current_app.config
+    if not config.get("OPENAI_API_KEY"):
+        return None
+    # Locked: a batch job's threads all ask for the client at once, and
+    # building one per thread is slow and leaks connection pools
+    with _create_lock:
+        manager = current_app.extensions.get("ai_client")
+        if manager is None:
+            manager = AIClientManager(
+                api_key=config["OPENAI_API_KEY"],
+                base_url=config.get("OPENAI_BASE_URL"),
+                model=config.get("OPENAI_MODEL", "gpt-4o-mini"),
+                timeout=config.get("AI_TIMEOUT", 60.0),
+                connect_timeout=config.get("AI_CONNECT_TIMEOUT", 5.0),
+                max_retries=config.get("AI_MAX_RETRIES", 2),
+                max_concurrency=config.get("AI_MAX_CONCURRENCY", 4),
+                logger=current_app.logger,
+            )
+            current_app.extensions["ai_client"] = manager
+    return manager
@@ -0,0 +1,373 @@
+"""
+Background execution of AI report generation.
+
+Generate endpoints store an ``AIJob`` row and hand its id to a thread pool
+(AI_JOB_WORKERS threads per process); the worker loads the inputs, calls
+``ai_service`` outside any database transaction, saves the ``AIReport`` and
+marks the job. Clients poll ``/api/ai/jobs/<id>``.
+
+Batch jobs (``team_weekly``) prefetch every item's inputs in a few grouped
+queries, then run the AI calls on a short-lived pool of AI_BATCH_CONCURRENCY
+threads and record per-item progress on the job as each call completes.
+
+Jobs are claimed with a conditional UPDATE, so a job re-dispatched by
+``flask ai run-pending`` after a crash is never run twice concurrently.
+"""
+
+import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import partial
+
+from flask import current_app
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models.ai_job import AIJob
+from app.models.ai_report import AIReport
+from app.models.athlete import Athlete
+from app.models.evaluation import Evaluation
+from app.models.match import Match
+from app.models.note import Note
+from app.models.team import Team
+from app.models.training import TrainingSession
+from app.models.wellness import WellnessEntry
+from app.services.ai_service import (
+    generate_post_training_report,
+    generate_post_match_report,
+    generate_athlete_weekly_summary,
+)
+
+
+class JobError(Exception):
+    """Expected job failure (missing data, AI not configured, provider error)."""
+
+
+# ── Job types ─────────────────────────────────────────────────────────
+# Each builder reads its inputs and returns the report fields plus a
+# zero-argument ``generate`` callable that performs the AI call.
+
+def _post_training(coach_id, params):
+    session = db.session.get(TrainingSession, params.get("session_id"))
+    if not session:
+        raise JobError("Session not found")
+
+    notes = [n.to_dict() for n in Note.query.filter_by(
+        coach_id=coach_id, entity_type="training", entity_id=session.id
+    ).order_by(Note.created_at.desc()).all()]
+    attendances = [a.to_dict() for a in session.attendances.all()]
+
+    return {
+        "report_type": "post_training",
+        "title": f"Report: {session.title or session.date}",
+        "input_refs": {"training_ids": [session.id]},
+        "generate": partial(
+            generate_post_training_report, session.to_dict(include_blocks=True), notes, attendances,
+            force=params.get("force", False),
+        ),
+    }
+
+
+def _post_match(coach_id, params):
+    match = db.session.get(Match, params.get("match_id"))
+    if not match:
+        raise JobError("Match not found")
+
+    evaluations = [e.to_dict() for e in Evaluation.query.filter_by(match_id=match.id).all()]
+    notes = [n.to_dict() for n in Note.query.filter_by(
+        coach_id=coach_id, entity_type="match", entity_id=match.id
+    ).order_by(Note.created_at.desc()).all()]
+
+    return {
+        "report_type": "post_match",
+        "title": f"Report: vs {match.opponent}",
+        "input_refs": {"match_ids": [match.id]},
+        "generate": partial(
+            generate_post_match_report, match.to_dict(), evaluations, notes,
+            force=params.get("force", False),
+        ),
+    }
+
+
+def _weekly_spec(athlete, evaluations, wellness, notes, force):
+    return {
+        "report_type": "athlete_weekly",
+        "title": f"Settimana: {athlete.first_name} {athlete.last_name}",
+        "input_refs": {"athlete_ids": [athlete.id]},
+        "generate": partial(
+            generate_athlete_weekly_summary, athlete.to_dict(), evaluations, wellness, notes,
+            force=force,
+        ),
+    }
+
+
+def _athlete_weekly(coach_id, params):
+    athlete = db.session.get(Athlete, params.get("athlete_id"))
+    if not athlete:
+        raise JobError("Athlete not found")
+
+    evaluations = [e.to_dict() for e in athlete.evaluations.order_by(
+        Evaluation.date.desc()).limit(7).all()]
+    wellness = [w.to_dict() for w in athlete.wellness_entries.order_by(
+        WellnessEntry.date.desc()).limit(7).all()]
+    notes = [n.to_dict() for n in Note.query.filter_by(
+        coach_id=coach_id, entity_type="athlete", entity_id=athlete.id
+    ).order_by(Note.created_at.desc()).limit(10).all()]
+
+    return _weekly_spec(athlete, evaluations, wellness, notes, params.get("force", False))
+
+
+def _latest_per(model, group_column, ids, order_by, limit, *criteria):
+    """The latest ``limit`` rows per ``group_column`` value, as dicts, in one query.
+
+    Same rows and order as a per-id ``ORDER BY ... LIMIT`` query.
+    """
+    rank = func.row_number().over(partition_by=group_column, order_by=order_by).label("rank")
+    ranked = select(model, rank).where(group_column.in_(ids), *criteria).subquery()
+    row = aliased(model, ranked)
+
+    grouped = defaultdict(list)
+    for item in db.session.scalars(
+        select(row).where(ranked.c.rank <= limit).order_by(ranked.c.rank)
+    ):
+        grouped[getattr(item, group_column.key)].append(item.to_dict())
+    return grouped
+
+
+def _team_weekly(coach_id, params):
+    team = db.session.get(Team, params.get("team_id"))
+    if not team:
+        raise JobError("Team not found")
+
+    athletes = team.athletes.order_by(Athlete.last_name, Athlete.first_name).all()
+    ids = [a.id for a in athletes]
+    evaluations = _latest_per(Evaluation, Evaluation.athlete_id, ids, Evaluation.date.desc(), 7)
+    wellness = _latest_per(WellnessEntry, WellnessEntry.athlete_id, ids, WellnessEntry.date.desc(), 7)
+    notes = _latest_per(Note, Note.entity_id, ids, Note.created_at.desc(), 10,
+                        Note.coach_id == coach_id, Note.entity_type == "athlete")
+
+    force = params.get("force", False)
+    return {
+        "items": [
+            (athlete.id, _weekly_spec(athlete, evaluations[athlete.id], wellness[athlete.id],
+                                      notes[athlete.id], force))
+            for athlete in athletes
+        ],
+    }
+
+
+JOB_TYPES = {
+    "post_training": _post_training,
+    "post_match": _post_match,
+    "athlete_weekly": _athlete_weekly,
+    "team_weekly": _team_weekly,
+}
+
+
+def build(job_type, coach_id, params):
+    """Load a job type's inputs: report fields plus the ``generate`` callable.
+
+    Batch job types return ``{"items": [(item id, spec), ...]}`` instead.
+    """
+    return JOB_TYPES[job_type](coach_id, params)
+
+
+def save_report(coach_id, spec, result):
+    """Persist and commit the AIReport for a finished generation."""
+    report = AIReport(
+        coach_id=coach_id,
+        report_type=spec["report_type"],
+        title=spec["title"],
+        input_refs=json.dumps(spec["input_refs"]),
+        content=result["content"],
+        confidence=result.get("confidence"),
+        prompt_used=result.get("prompt_used"),
+        model_used=result.get("model_used"),
+        prompt_tokens=result.get("prompt_tokens"),
+        completion_tokens=result.get("completion_tokens"),
+        raw_prompt_tokens=result.get("raw_prompt_tokens"),
+    )
+    db.session.add(report)
+    db.session.commit()
+    return report
+
+
+# ── Execution ─────────────────────────────────────────────────────────
+
+def get_executor():
+    """The app-wide thread pool, created lazily from AI_JOB_WORKERS."""
+    executor = current_app.extensions.get("ai_job_executor")
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=current_app.config.get("AI_JOB_WORKERS", 4),
+            thread_name_prefix="ai-job",
+        )
+        current_app.extensions["ai_job_executor"] = executor
+    return executor
+
+
+def submit(coach_id, job_type, params):
+    """Persist a queued job and schedule it. Returns the job."""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Unknown AI job type: {job_type}")
+
+    job = AIJob(coach_id=coach_id, job_type=job_type, params=json.dumps(params))
+    db.session.add(job)
+    db.session.commit()
+    dispatch(job.id)
+    return job
+
+
+def dispatch(job_id):
+    app = current_app._get_current_object()
+    if app.config.get("AI_JOBS_EAGER"):
+        # Run inline (CLI, debugging): same code path, no thread hand-off
+        execute(job_id)
+    else:
+        get_executor().submit(_run_in_app, app, job_id)
+
+
+def _run_in_app(app, job_id):
+    with app.app_context():
+        try:
+            execute(job_id)
+        finally:
+            db.session.remove()
+
+
+def _claim(job_id):
+    result = db.session.execute(
+        update(AIJob)
+        .where(AIJob.id == job_id, AIJob.status == "queued")
+        .values(status="running", started_at=datetime.utcnow(), attempts=AIJob.attempts + 1)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def _finish(job_id, **values):
+    db.session.execute(
+        update(AIJob).where(AIJob.id == job_id).values(finished_at=datetime.utcnow(), **values)
+    )
+    db.session.commit()
+
+
+def execute(job_id):
+    """Run one queued job to completion, recording success or failure."""
+    if not _claim(job_id):
+        return
+
+    job = db.session.get(AIJob, job_id)
+    try:
+        spec = build(job.job_type, job.coach_id, job.get_params())
+        coach_id = job.coach_id
+        # Release the connection while waiting on the AI provider
+        db.session.commit()
+
+        if "items" in spec:
+            _execute_batch(job_id, coach_id, spec["items"])
+            return
+
+        result = spec["generate"]()
+        if result.get("error"):
+            raise JobError(result["error"])
+
+        report_id = save_report(coach_id, spec, result).id
+    except JobError as e:
+        db.session.rollback()
+        _finish(job_id, status="failed", error=str(e))
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("AI job %s failed", job_id)
+        _finish(job_id, status="failed", error=f"{type(e).__name__}: {e}")
+    else:
+        _finish(job_id, status="succeeded", report_id=report_id)
+
+
+def _generate_in_app(app, spec):
+    with app.app_context():
+        try:
+            result = spec["generate"]()
+            # The AI cache entry written on this thread's session
+            db.session.commit()
+            return result
+        finally:
+            db.session.remove()
+
+
+def _execute_batch(job_id, coach_id, items):
+    """Run a batch's AI calls in parallel, saving reports as they complete.
+
+    Reports and progress are written from this thread only; the pool threads
+    just call the AI provider. The job fails only if every item failed.
+    """
+    app = current_app._get_current_object()
+    progress = {
+        "total": len(items),
+        "completed": 0,
+        "failed": 0,
+        "items": [{"athlete_id": item_id, "status": "queued", "report_id": None, "error": None}
+                  for item_id, _ in items],
+    }
+    _set_progress(job_id, progress)
+
+    workers = max(1, min(app.config.get("AI_BATCH_CONCURRENCY", 4), len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai-batch") as pool:
+        futures = {pool.submit(_generate_in_app, app, spec): (index, spec)
+                   for index, (_, spec) in enumerate(items)}
+        for future in as_completed(futures):
+            index, spec = futures[future]
+            entry = progress["items"][index]
+            error = None
+            try:
+                result = future.result()
+                if result.get("error"):
+                    raise JobError(result["error"])
+                entry["report_id"] = save_report(coach_id, spec, result).id
+            except JobError as e:
+                error = str(e)
+            except Exception as e:
+                current_app.logger.exception("AI job %s item %s failed", job_id, entry["athlete_id"])
+                error = f"{type(e).__name__}: {e}"
+
+            if error:
+                db.session.rollback()
+                entry.update(status="failed", error=error)
+                progress["failed"] += 1
+            else:
+                entry["status"] = "succeeded"
+                progress["completed"] += 1
+            _set_progress(job_id, progress)
+
+    if items and not progress["completed"]:
+        _finish(job_id, status="failed", error=progress["items"][0]["error"])
+    else:
+        _finish(job_id, status="succeeded")
+
+
+def _set_progress(job_id, progress):
+    db.session.execute(update(AIJob).where(AIJob.id == job_id).values(progress=json.dumps(progress)))
+    db.session.commit()
+
+
+def run_pending(stale_after=timedelta(minutes=10)):
+    """Run queued jobs inline, requeueing running ones older than ``stale_after``.
+
+    Recovers jobs lost when a worker process died. Returns the number of jobs run.
+    """
+    cutoff = datetime.utcnow() - stale_after
+    db.session.execute(
+        update(AIJob)
+        .where(AIJob.status == "running", AIJob.started_at < cutoff)
+        .values(status="queued")
+    )
+    db.session.commit()
+
+    job_ids = [job_id for (job_id,) in db.session.query(AIJob.id).filter(
+        AIJob.status == "queued"
+    ).order_by(AIJob.id).all()]
+    for job_id in job_ids:
+        execute(job_id)
+    return len(job_ids)
@@ -0,0 +1,143 @@
+"""
+Token-budgeted prompt building for ``ai_service``.
+
+Model payloads (``to_dict()`` output) are compacted before they go into a
+prompt: null/empty values and keys that mean nothing to the model (ids,
+timestamps, URLs) are dropped and long free text is clipped. If the prompt
+is still over its report type's token budget, the longest list section is
+cut down, and the dropped items are replaced by a summary (how many, plus
+the average of their numeric fields). Callers pass lists most relevant
+first.
+
+Tokens are counted locally with ``tiktoken`` when it is installed and its
+encoding can be loaded; otherwise they are estimated from the length.
+"""
+
+import json
+import logging
+from collections import namedtuple
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Prompt token budget per report type (template included)
+BUDGETS = {
+    "post_training": 3000,
+    "post_match": 3000,
+    "athlete_weekly": 2000,
+    "notes_synthesis": 2000,
+}
+DEFAULT_BUDGET = 3000
+
+# Keys carrying no information for the model
+OMIT_KEYS = {
+    "id", "team_id", "coach_id", "session_id", "training_session_id", "match_id",
+    "entity_type", "entity_id", "created_at", "updated_at", "photo_url", "video_url",
+    "full_name", "blocks_count",
+}
+
+MAX_TEXT_CHARS = 1500
+
+# Rough characters per token for JSON and Italian text, when tiktoken is unavailable
+CHARS_PER_TOKEN = 3
+
+Prompt = namedtuple("Prompt", "text tokens raw_tokens budget")
+
+
+@lru_cache(maxsize=8)
+def _encoding(model):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # The encoding file is downloaded on first use; offline hosts estimate
+        logger.warning("tiktoken encoding for %s unavailable, estimating token counts", model)
+        return None
+
+
+def count_tokens(text, model="gpt-4o-mini"):
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def compact(value):
+    """Drop empty values and ``OMIT_KEYS``, clip long strings, recursively."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in OMIT_KEYS:
+                continue
+            item = compact(item)
+            if item not in (None, "", [], {}):
+                result[key] = item
+        return result
+    if isinstance(value, list):
+        return [item for item in map(compact, value) if item not in (None, "", [], {})]
+    if isinstance(value, str) and len(value) > MAX_TEXT_CHARS:
+        return value[:MAX_TEXT_CHARS] + "…"
+    return value
+
+
+def summarize(items):
+    """Summary of omitted list items: count and numeric averages."""
+    summary = {"omessi": len(items)}
+    totals = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for key, value in item.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals.setdefault(key, []).append(value)
+    if totals:
+        summary["medie"] = {key: round(sum(v) / len(v), 1) for key, v in totals.items()}
+    return summary
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def build(report_type, template, sections, model="gpt-4o-mini"):
+    """Render ``template`` (``str.format`` fields named after ``sections``)
+    with the compacted sections, within the report type's token budget.
+
+    ``raw_tokens`` is the size of the same prompt with the uncompacted
+    payloads, to track savings.
+    """
+    budget = BUDGETS.get(report_type, DEFAULT_BUDGET)
+    raw_tokens = count_tokens(template.format(**{
+        name: json.dumps(value, ensure_ascii=False) for name, value in sections.items()
+    }), model)
+
+    sections = {name: compact(value) for name, value in sections.items()}
+    kept = {name: len(value) for name, value in sections.items() if isinstance(value, list)}
+
+    def render():
+        rendered = {}
+        for name, value in sections.items():
+            if name in kept and kept[name] < len(value):
+                value = value[:kept[name]] + [summarize(value[kept[name]:])]
+            rendered[name] = _dumps(value)
+        return template.format(**rendered)
+
+    text = render()
+    tokens = count_tokens(text, model)
+    while tokens > budget:
+        shrinkable = [name for name, n in kept.items() if n > 1]
+        if not shrinkable:
+            logger.warning("%s prompt is %s tokens, over its %s budget", report_type, tokens, budget)
+            break
+        longest = max(shrinkable, key=lambda name: len(_dumps(sections[name][:kept[name]])))
+        kept[longest] = kept[longest] * 3 // 4
+        text = render()
+        tokens = count_tokens(text, model)
+
+    return Prompt(text, tokens, raw_tokens, budget)
@@ -4,30 +4,77 @@ Uses OpenAI API to generate reports and insights.
 All outputs are editable by the coach - AI assists, never decides.
 """
 
-import json
-import os
-from openai import OpenAI
-
-
-def get_client():
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    if not api_key:
-        return None
-    return OpenAI(api_key=api_key)
-
-
-def generate_post_training_report(session_data, notes, attendances):
+from app.services import ai_cache, ai_prompt
+from app.services.ai_client import get_ai_client
+
+NOT_CONFIGURED = {"error": "AI not configured", "content": None}
+
+
+def _prompt(report_type, template, **sections):
+    """Compact ``sections`` into ``template`` within the report type's token budget."""
+    return ai_prompt.build(report_type, template, sections, get_ai_client().model)
+
+
+def _complete(prompt, max_tokens, confidence="medium", force=False, stream=False):
+    """Run a single-prompt completion (an ``ai_prompt.Prompt``) through the shared client.
+
+    Identical requests are answered from the AI cache unless ``force`` is set.
+    With ``stream`` it returns a generator of ``("token", text)`` events
+    ending with ``("result", result)`` instead of the result itself.
+    """
+    client = get_ai_client()
+    messages = [{"role": "user", "content": prompt.text}]
+    params = {"max_tokens": max_tokens, "temperature": 0.7}
+    use_cache = ai_cache.is_enabled()
+    key = ai_cache.make_key(client.model, params, messages)
+
+    def result(response, cached):
+        if use_cache and not cached:
+            ai_cache.put(key, response["model"], response["content"],
+                         response["prompt_tokens"], response["completion_tokens"])
+        return {
+            "content": response["content"],
+            "confidence": confidence,
+            "prompt_used": prompt.text,
+            "model_used": response["model"],
+            "cached": cached,
+            "latency_ms": response["latency_ms"],
+            # Provider count when reported, else the local one
+            "prompt_tokens": response["prompt_tokens"] or prompt.tokens,
+            "completion_tokens": response["completion_tokens"],
+            "raw_prompt_tokens": prompt.raw_tokens,
+        }
+
+    cached = ai_cache.get(key) if use_cache and not force else None
+    if cached:
+        response = {**cached, "latency_ms": 0.0}
+        if stream:
+            return iter([("token", response["content"]), ("result", result(response, True))])
+        return result(response, True)
+
+    if not stream:
+        return result(client.chat(messages, **params), False)
+
+    def events():
+        for event, payload in client.chat_stream(messages, **params):
+            if event == "token":
+                yield event, payload
+            else:
+                yield "result", result(payload, False)
+    return events()
+
+
+def generate_post_training_report(session_data, notes, attendances, force=False, stream=False):
     """Generate a post-training session recap."""
-    client = get_client()
-    if not client:
-        return {"error": "AI not configured", "content": None}
+    if not get_ai_client():
+        return dict(NOT_CONFIGURED)
 
-    prompt = f"""Sei un assistente per allenatori sportivi. Genera un report post-allenamento
+    template = """Sei un assistente per allenatori sportivi. Genera un report post-allenamento
 basato SOLO sui dati forniti. Non inventare informazioni.
 
-Sessione: {json.dumps(session_data, ensure_ascii=False)}
-Note: {json.dumps(notes, ensure_ascii=False)}
-Presenze: {json.dumps(attendances, ensure_ascii=False)}
+Sessione: {session}
+Note: {notes}
+Presenze: {attendances}
 
 Struttura del report:
 1. **Riassunto sessione** (2-3 frasi)
@@ -36,34 +83,22 @@ Struttura del report:
 4. **Suggerimenti per prossima sessione** (2-3 adattamenti concreti)
 
 Se mancano dati, segnalalo chiaramente. Rispondi in italiano."""
+    prompt = _prompt("post_training", template, session=session_data, notes=notes, attendances=attendances)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=1000,
-        temperature=0.7,
-    )
+    return _complete(prompt, max_tokens=1000, force=force, stream=stream)
 
-    return {
-        "content": response.choices[0].message.content,
-        "confidence": "medium",
-        "prompt_used": prompt,
-        "model_used": "gpt-4o-mini",
-    }
 
-
-def generate_post_match_report(match_data, evaluations, notes):
+def generate_post_match_report(match_data, evaluations, notes, force=False, stream=False):
     """Generate a post-match report."""
-    client = get_client()
-    if not client:
-        return {"error": "AI not configured", "content": None}
+    if not get_ai_client():
+        return dict(NOT_CONFIGURED)
 
-    prompt = f"""Sei un assistente per allenatori sportivi. Genera un report post-gara
+    template = """Sei un assistente per allenatori sportivi. Genera un report post-gara
 basato SOLO sui dati forniti.
 
-Partita: {json.dumps(match_data, ensure_ascii=False)}
-Valutazioni: {json.dumps(evaluations, ensure_ascii=False)}
-Note: {json.dumps(notes, ensure_ascii=False)}
+Partita: {match}
+Valutazioni: {evaluations}
+Note: {notes}
 
 Struttura:
 1. **Summary** (risultato + sintesi prestazione)
@@ -71,35 +106,24 @@ Struttura:
 3. **Top 3 priorità allenamento** (basate su cosa migliorare)
 
 Se mancano dati, segnalalo. Rispondi in italiano."""
+    prompt = _prompt("post_match", template, match=match_data, evaluations=evaluations, notes=notes)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=1000,
-        temperature=0.7,
-    )
-
-    return {
-        "content": response.choices[0].message.content,
-        "confidence": "medium",
-        "prompt_used": prompt,
-        "model_used": "gpt-4o-mini",
-    }
+    return _complete(prompt, max_tokens=1000, force=force, stream=stream)
 
 
-def generate_athlete_weekly_summary(athlete_data, evaluations, wellness, notes):
+def generate_athlete_weekly_summary(athlete_data, evaluations, wellness, notes,
+                                    force=False, stream=False):
     """Generate a weekly athlete summary: what happened, readiness trend, practical suggestions."""
-    client = get_client()
-    if not client:
-        return {"error": "AI not configured", "content": None}
+    if not get_ai_client():
+        return dict(NOT_CONFIGURED)
 
-    prompt = f"""Sei un assistente per allenatori sportivi. Genera una sintesi settimanale
+    template = """Sei un assistente per allenatori sportivi. Genera una sintesi settimanale
 per un atleta basata SOLO sui dati forniti.
 
-Atleta: {json.dumps(athlete_data, ensure_ascii=False)}
-Valutazioni recenti: {json.dumps(evaluations, ensure_ascii=False)}
-Wellness: {json.dumps(wellness, ensure_ascii=False)}
-Note: {json.dumps(notes, ensure_ascii=False)}
+Atleta: {athlete}
+Valutazioni recenti: {evaluations}
+Wellness: {wellness}
+Note: {notes}
 
 Struttura:
 1. **Cosa è successo questa settimana** (sintesi)
@@ -107,49 +131,28 @@ Struttura:
 3. **3 suggerimenti pratici** (con motivazione)
 
 Se mancano dati, chiedilo esplicitamente. Rispondi in italiano."""
+    prompt = _prompt("athlete_weekly", template, athlete=athlete_data, evaluations=evaluations,
+                     wellness=wellness, notes=notes)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=800,
-        temperature=0.7,
-    )
-
-    return {
-        "content": response.choices[0].message.content,
-        "confidence": "medium",
-        "prompt_used": prompt,
-        "model_used": "gpt-4o-mini",
-    }
+    return _complete(prompt, max_tokens=800, force=force, stream=stream)
 
 
-def synthesize_coach_notes(notes_list):
+def synthesize_coach_notes(notes_list, force=False, stream=False):
     """Transform sparse coach notes into 3 insights + 1 recommendation."""
-    client = get_client()
-    if not client:
-        return {"error": "AI not configured", "content": None}
+    if not get_ai_client():
+        return dict(NOT_CONFIGURED)
 
-    prompt = f"""Sei un assistente per allenatori. Analizza queste note sparse dell'allenatore
+    template = """Sei un assistente per allenatori. Analizza queste note sparse dell'allenatore
 e trasformale in insight utili. Basati SOLO sulle note fornite.
 
-Note: {json.dumps(notes_list, ensure_ascii=False)}
+Note: {notes}
 
 Output:
 1. **3 Insight chiave** (pattern che emergono dalle note)
 2. **1 Raccomandazione** (azione concreta suggerita)
 
 Se le note sono poche o poco significative, dillo. Rispondi in italiano."""
+    prompt = _prompt("notes_synthesis", template, notes=notes_list)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=600,
-        temperature=0.7,
-    )
-
-    return {
-        "content": response.choices[0].message.content,
-        "confidence": "low" if len(notes_list) < 3 else "medium",
-        "prompt_used": prompt,
-        "model_used": "gpt-4o-mini",
-    }
+    confidence = "low" if len(notes_list) < 3 else "medium"
+    return _complete(prompt, max_tokens=600, confidence=confidence, force=force, stream=stream)
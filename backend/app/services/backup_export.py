@@ -0,0 +1,252 @@
+"""
+Streaming export of a coach's data (``/api/backup``).
+
+Rows are read in id order with ``yield_per`` and serialized chunk by chunk;
+each chunk's children (evaluations, wellness entries, injuries, training
+blocks, attendance) are loaded with one ``IN`` query per relationship. Memory therefore
+stays bounded by the chunk size, whatever the size of the export.
+
+Two formats share the same loaders:
+
+- ``json``: the nested document the export always produced, written
+  incrementally.
+- ``ndjson``: one ``{"type", "data"}`` record per line in a fixed
+  (type, id) order, so an interrupted download can be resumed with
+  ``after=<type>:<id>``.
+"""
+
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+
+from app.models.season import Season
+from app.models.team import Team
+from app.models.athlete import Athlete
+from app.models.training import TrainingSession, TrainingBlock
+from app.models.match import Match
+from app.models.attendance import Attendance
+from app.models.evaluation import Evaluation
+from app.models.wellness import WellnessEntry
+from app.models.injury import Injury
+from app.models.note import Note
+from app.models.ai_report import AIReport
+
+CHUNK_SIZE = 500
+BUFFER_SIZE = 64 * 1024
+FORMAT_VERSION = 1
+
+# Per-athlete collections, as nested under each athlete in the JSON format
+ATHLETE_CHILDREN = [
+    ("evaluations", Evaluation),
+    ("wellness_entries", WellnessEntry),
+    ("injuries", Injury),
+]
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _chunks(query, size=CHUNK_SIZE):
+    """Stream a query's rows as lists of at most ``size`` objects."""
+    rows = iter(query.yield_per(size))
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _group_by(model, column, ids, *order_by):
+    grouped = defaultdict(list)
+    if ids:
+        for row in model.query.filter(column.in_(ids)).order_by(*order_by, model.id):
+            grouped[getattr(row, column.key)].append(row)
+    return grouped
+
+
+def coach_profile(user):
+    """Coach info without contact details."""
+    data = user.to_dict()
+    data.pop("email", None)
+    data.pop("phone", None)
+    return data
+
+
+# ── Serialized chunks ─────────────────────────────────────────────────
+
+def athlete_chunks(query):
+    """Athlete dicts with their evaluations, wellness entries and injuries."""
+    for athletes in _chunks(query):
+        ids = [a.id for a in athletes]
+        children = {
+            key: _group_by(model, model.athlete_id, ids)
+            for key, model in ATHLETE_CHILDREN
+        }
+        chunk = []
+        for athlete in athletes:
+            data = athlete.to_dict()
+            for key, _ in ATHLETE_CHILDREN:
+                data[key] = [row.to_dict() for row in children[key][athlete.id]]
+            chunk.append(data)
+        yield chunk
+
+
+def session_chunks(query, attendance=False):
+    """Training session dicts with their blocks, and optionally their attendance."""
+    for sessions in _chunks(query):
+        ids = [s.id for s in sessions]
+        blocks = _group_by(TrainingBlock, TrainingBlock.session_id, ids, TrainingBlock.order)
+        present = _group_by(Attendance, Attendance.training_session_id, ids) if attendance else None
+        chunk = []
+        for session in sessions:
+            data = session.to_dict(include_blocks=True, blocks=blocks[session.id])
+            if attendance:
+                data["attendance"] = [row.to_dict() for row in present[session.id]]
+            chunk.append(data)
+        yield chunk
+
+
+def plain_chunks(query):
+    for rows in _chunks(query):
+        yield [row.to_dict() for row in rows]
+
+
+# ── Nested JSON ───────────────────────────────────────────────────────
+
+def _array(chunks):
+    yield "["
+    first = True
+    for chunk in chunks:
+        for item in chunk:
+            yield _dumps(item) if first else "," + _dumps(item)
+            first = False
+    yield "]"
+
+
+def stream_json(user):
+    """The nested export document, as a generator of text fragments."""
+    yield '{"export_date": ' + _dumps(datetime.utcnow().isoformat())
+    yield ', "coach": ' + _dumps(coach_profile(user))
+    yield ', "seasons": '
+    yield from _array(plain_chunks(Season.query.filter_by(coach_id=user.id).order_by(Season.id)))
+
+    yield ', "teams": ['
+    teams = Team.query.filter_by(coach_id=user.id).order_by(Team.id).all()
+    for i, team in enumerate(teams):
+        # Reopen the team object to append its nested collections
+        yield ("," if i else "") + _dumps(team.to_dict())[:-1]
+        yield ', "athletes": '
+        yield from _array(athlete_chunks(Athlete.query.filter_by(team_id=team.id).order_by(Athlete.id)))
+        yield ', "training_sessions": '
+        yield from _array(session_chunks(
+            TrainingSession.query.filter_by(team_id=team.id).order_by(TrainingSession.id), attendance=True
+        ))
+        yield ', "matches": '
+        yield from _array(plain_chunks(Match.query.filter_by(team_id=team.id).order_by(Match.id)))
+        yield "}"
+    yield "]"
+
+    yield ', "notes": '
+    yield from _array(plain_chunks(Note.query.filter_by(coach_id=user.id).order_by(Note.id)))
+    yield ', "ai_reports": '
+    yield from _array(plain_chunks(AIReport.query.filter_by(coach_id=user.id).order_by(AIReport.id)))
+    yield "}"
+
+
+# ── NDJSON ────────────────────────────────────────────────────────────
+
+def _team_scoped(model, user):
+    return model.query.join(Team, Team.id == model.team_id).filter(Team.coach_id == user.id)
+
+
+def _session_scoped(model, user):
+    return model.query.join(TrainingSession, TrainingSession.id == model.training_session_id).join(
+        Team, Team.id == TrainingSession.team_id
+    ).filter(Team.coach_id == user.id)
+
+
+def _athlete_scoped(model, user):
+    return model.query.join(Athlete, Athlete.id == model.athlete_id).join(
+        Team, Team.id == Athlete.team_id
+    ).filter(Team.coach_id == user.id)
+
+
+# Record type -> (model, scoped query, chunk serializer), in export order.
+# Athletes are exported flat here: their children have their own record types.
+# Parents always precede the records referencing them, so a restore can remap
+# ids in a single pass.
+NDJSON_SECTIONS = {
+    "season": (Season, lambda user: Season.query.filter_by(coach_id=user.id), plain_chunks),
+    "team": (Team, lambda user: Team.query.filter_by(coach_id=user.id), plain_chunks),
+    "athlete": (Athlete, lambda user: _team_scoped(Athlete, user), plain_chunks),
+    "training_session": (TrainingSession, lambda user: _team_scoped(TrainingSession, user), session_chunks),
+    "match": (Match, lambda user: _team_scoped(Match, user), plain_chunks),
+    "attendance": (Attendance, lambda user: _session_scoped(Attendance, user), plain_chunks),
+    "evaluation": (Evaluation, lambda user: _athlete_scoped(Evaluation, user), plain_chunks),
+    "wellness_entry": (WellnessEntry, lambda user: _athlete_scoped(WellnessEntry, user), plain_chunks),
+    "injury": (Injury, lambda user: _athlete_scoped(Injury, user), plain_chunks),
+    "note": (Note, lambda user: Note.query.filter_by(coach_id=user.id), plain_chunks),
+    "ai_report": (AIReport, lambda user: AIReport.query.filter_by(coach_id=user.id), plain_chunks),
+}
+
+
+def parse_resume_token(token):
+    """Parse ``<type>:<id>`` into ``(type, id)``; raises ValueError if invalid."""
+    record_type, _, record_id = token.partition(":")
+    if record_type not in NDJSON_SECTIONS or not record_id.isdigit():
+        raise ValueError(f"Invalid resume token: {token}")
+    return record_type, int(record_id)
+
+
+def stream_ndjson(user, after=None):
+    """One JSON record per line; ``after=(type, id)`` skips what was already received."""
+    yield _dumps({
+        "type": "export",
+        "data": {"export_date": datetime.utcnow().isoformat(), "format_version": FORMAT_VERSION},
+    }) + "\n"
+    if after is None:
+        yield _dumps({"type": "coach", "data": coach_profile(user)}) + "\n"
+
+    count = 0
+    skipping = after is not None
+    for record_type, (model, scoped, serialize) in NDJSON_SECTIONS.items():
+        query = scoped(user)
+        if skipping:
+            if record_type != after[0]:
+                continue
+            query = query.filter(model.id > after[1])
+            skipping = False
+        for chunk in serialize(query.order_by(model.id)):
+            yield "".join(_dumps({"type": record_type, "data": item}) + "\n" for item in chunk)
+            count += len(chunk)
+
+    yield _dumps({"type": "end", "data": {"records": count}}) + "\n"
+
+
+# ── Transport ─────────────────────────────────────────────────────────
+
+def buffered(fragments, size=BUFFER_SIZE):
+    """Join small text fragments into ~``size`` byte UTF-8 chunks."""
+    buffer, length = [], 0
+    for fragment in fragments:
+        data = fragment.encode("utf-8")
+        buffer.append(data)
+        length += len(data)
+        if length >= size:
+            yield b"".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzipped(chunks, level=6):
+    """Gzip a stream of byte chunks incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
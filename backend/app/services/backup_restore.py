@@ -0,0 +1,293 @@
+"""
+Restore a coach backup (the ``/api/backup`` export, JSON or NDJSON).
+
+Records are remapped to fresh ids and written with Core ``insert()``
+executemany batches (``RETURNING id`` in parameter order gives the new ids
+for remapping children), all inside the caller's transaction. Records must
+arrive parents first, which both export formats guarantee.
+
+Ids held inside values rather than foreign keys (``Note.entity_id``, the
+JSON ``AIReport.input_refs``) are remapped too. Ids that point outside the
+backup are dropped, since they would otherwise reference another coach's
+rows.
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, time as dt_time
+
+from sqlalchemy import insert, types
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models.season import Season
+from app.models.team import Team
+from app.models.athlete import Athlete
+from app.models.training import TrainingSession, TrainingBlock
+from app.models.match import Match
+from app.models.attendance import Attendance
+from app.models.evaluation import Evaluation
+from app.models.wellness import WellnessEntry
+from app.models.injury import Injury
+from app.models.note import Note
+from app.models.ai_report import AIReport
+from app.services import load_rollup, search_index
+from app.utils.auth import invalidate_team_ids
+
+BATCH_SIZE = 1000
+
+# Foreign keys pointing at the coach doing the restore
+COACH = object()
+
+# Record type -> (model, {foreign key column: referenced record type})
+RECORD_TYPES = {
+    "season": (Season, {"coach_id": COACH}),
+    "team": (Team, {"coach_id": COACH, "season_id": "season"}),
+    "athlete": (Athlete, {"team_id": "team"}),
+    "training_session": (TrainingSession, {"team_id": "team"}),
+    "training_block": (TrainingBlock, {"session_id": "training_session"}),
+    "match": (Match, {"team_id": "team"}),
+    "attendance": (Attendance, {"athlete_id": "athlete", "training_session_id": "training_session"}),
+    "evaluation": (Evaluation, {
+        "athlete_id": "athlete", "training_session_id": "training_session", "match_id": "match",
+    }),
+    "wellness_entry": (WellnessEntry, {"athlete_id": "athlete"}),
+    "injury": (Injury, {"athlete_id": "athlete"}),
+    "note": (Note, {"coach_id": COACH}),
+    "ai_report": (AIReport, {"coach_id": COACH}),
+}
+
+# Note.entity_type -> record type its entity_id refers to
+NOTE_ENTITIES = {"athlete": "athlete", "training": "training_session", "match": "match"}
+
+# AIReport.input_refs key -> record type of the ids it lists
+INPUT_REFS = {"training_ids": "training_session", "match_ids": "match", "athlete_ids": "athlete"}
+
+# NDJSON records that carry no restorable data
+METADATA_TYPES = {"export", "coach", "end"}
+
+
+def records_from_document(doc):
+    """(type, data) records from the nested JSON export, parents first."""
+    if not isinstance(doc, dict) or not isinstance(doc.get("teams", []), list):
+        raise ValueError("Not a backup document")
+
+    teams = doc.get("teams", [])
+    athletes = [a for team in teams for a in team.get("athletes", [])]
+
+    for season in doc.get("seasons", []):
+        yield "season", season
+    for team in teams:
+        yield "team", {k: v for k, v in team.items() if k not in ("athletes", "training_sessions", "matches")}
+    for athlete in athletes:
+        yield "athlete", {k: v for k, v in athlete.items() if k not in ("evaluations", "wellness_entries", "injuries")}
+    for team in teams:
+        for session in team.get("training_sessions", []):
+            yield "training_session", session
+    for team in teams:
+        for match in team.get("matches", []):
+            yield "match", match
+    for team in teams:
+        for session in team.get("training_sessions", []):
+            for item in session.get("attendance", []):
+                yield "attendance", item
+    for key, record_type in (("evaluations", "evaluation"), ("wellness_entries", "wellness_entry"),
+                             ("injuries", "injury")):
+        for athlete in athletes:
+            for item in athlete.get(key, []):
+                yield record_type, item
+    for note in doc.get("notes", []):
+        yield "note", note
+    for report in doc.get("ai_reports", []):
+        yield "ai_report", report
+
+
+def records_from_ndjson(lines):
+    """(type, data) records from NDJSON export lines."""
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            record_type, data = record["type"], record["data"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"Invalid record on line {number}")
+        if record_type in METADATA_TYPES:
+            continue
+        yield record_type, data
+
+
+def _convert(column, value):
+    """Parse ISO strings back into date/time values for the column type."""
+    if value is None or not isinstance(value, str):
+        return value
+    if isinstance(column.type, types.DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, types.Date):
+        return date.fromisoformat(value)
+    if isinstance(column.type, types.Time):
+        return dt_time.fromisoformat(value)
+    return value
+
+
+class InvalidRecord(ValueError):
+    """A record the database refused; the caller's transaction must be rolled back."""
+
+    def __init__(self, record_type, error):
+        detail = getattr(error, "orig", None) or error
+        super().__init__(f"Invalid {record_type} record: {detail}")
+        self.record_type = record_type
+
+
+class Restore:
+    """Buffers records per type and inserts them in batches, remapping ids."""
+
+    def __init__(self, coach_id, batch_size=BATCH_SIZE):
+        self.coach_id = coach_id
+        self.batch_size = batch_size
+        self.ids = defaultdict(dict)  # record type -> {old id: new id}
+        self.counts = Counter()
+        self.skipped = Counter()
+        self._type = None
+        self._batch = []
+
+    def add(self, record_type, data):
+        if record_type not in RECORD_TYPES:
+            raise ValueError(f"Unknown record type: {record_type}")
+        if not isinstance(data, dict):
+            raise ValueError(f"Invalid {record_type} record")
+        if record_type != self._type or len(self._batch) >= self.batch_size:
+            self.flush()
+        self._type = record_type
+        self._batch.append(data)
+
+    def flush(self):
+        batch, record_type = self._batch, self._type
+        self._batch = []
+        if not batch:
+            return
+
+        rows, old_ids, kept = [], [], []
+        for data in batch:
+            try:
+                row = self._row(record_type, data)
+            except (TypeError, ValueError) as e:
+                raise InvalidRecord(record_type, e) from e
+            if row is None:
+                self.skipped[record_type] += 1
+                continue
+            rows.append(row)
+            old_ids.append(data.get("id"))
+            kept.append(data)
+
+        try:
+            new_ids = self._insert(RECORD_TYPES[record_type][0], rows)
+        except SQLAlchemyError as e:
+            # Wrong value types, NOT NULL or unique violations
+            raise InvalidRecord(record_type, e) from e
+        for old_id, new_id in zip(old_ids, new_ids):
+            if old_id is not None:
+                self.ids[record_type][old_id] = new_id
+        self.counts[record_type] += len(rows)
+
+        if record_type == "training_session":
+            # Blocks are nested in their session record
+            self._type = "training_block"
+            self._batch = [block for data in kept for block in data.get("blocks") or []]
+            self.flush()
+            self._type = record_type
+
+    def _row(self, record_type, data):
+        """Insert parameters for a record, or None if a required parent is missing."""
+        model, refs = RECORD_TYPES[record_type]
+        row = {}
+        for column in model.__table__.columns:
+            name = column.name
+            if name == "id":
+                continue
+            if name in refs:
+                value = self._ref(refs[name], data.get(name))
+                if value is None and not column.nullable:
+                    return None
+                row[name] = value
+            elif name in data:
+                row[name] = _convert(column, data[name])
+
+        if record_type == "note" and row.get("entity_id") is not None:
+            target = NOTE_ENTITIES.get(row.get("entity_type"))
+            if target:
+                row["entity_id"] = self.ids[target].get(row["entity_id"])
+        if record_type == "ai_report" and row.get("input_refs"):
+            row["input_refs"] = self._input_refs(row["input_refs"])
+        return row
+
+    def _input_refs(self, value):
+        try:
+            refs = json.loads(value)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(refs, dict):
+            return None
+        for key, target in INPUT_REFS.items():
+            if isinstance(refs.get(key), list):
+                refs[key] = [self.ids[target][i] for i in refs[key] if i in self.ids[target]]
+        return json.dumps(refs)
+
+    def _ref(self, target, old_id):
+        if target is COACH:
+            return self.coach_id
+        if old_id is None:
+            return None
+        return self.ids[target].get(old_id)
+
+    @staticmethod
+    def _insert(model, rows):
+        """executemany INSERT ... RETURNING id; new ids in the order of ``rows``."""
+        table = model.__table__
+        # executemany needs one parameter set shape per statement
+        groups = defaultdict(list)
+        for i, row in enumerate(rows):
+            groups[tuple(sorted(row))].append(i)
+
+        new_ids = [None] * len(rows)
+        for indexes in groups.values():
+            result = db.session.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                [rows[i] for i in indexes],
+            )
+            for i, (new_id,) in zip(indexes, result):
+                new_ids[i] = new_id
+        return new_ids
+
+
+def restore(records, coach_id, batch_size=BATCH_SIZE):
+    """Insert backup records for ``coach_id`` (without committing).
+
+    Returns counts per record type, skipped records and throughput.
+    """
+    started = time.perf_counter()
+    job = Restore(coach_id, batch_size)
+    for record_type, data in records:
+        job.add(record_type, data)
+    job.flush()
+
+    # Core inserts bypass the ORM flush hooks that maintain the search index
+    # and the team ownership cache, and the attendance route's rollup refresh
+    search_index.reindex(coach_id)
+    if job.counts["attendance"]:
+        for team_id in job.ids["team"].values():
+            load_rollup.rebuild(team_id)
+    invalidate_team_ids(coach_id)
+
+    elapsed = time.perf_counter() - started
+    total = sum(job.counts.values())
+    return {
+        "records": total,
+        "by_type": dict(job.counts),
+        "skipped": dict(job.skipped),
+        "seconds": round(elapsed, 3),
+        "records_per_second": round(total / elapsed) if elapsed else total,
+    }
@@ -0,0 +1,226 @@
+"""
+Pub/sub broker for real-time chat events (Server-Sent Events).
+
+Routes publish events per recipient user id after committing; the
+``/api/chat/stream`` endpoint subscribes and forwards them to the browser.
+
+- ``memory://`` (default): in-process queues, for a single worker process.
+- ``local:///path/to/dir``: the stand-in for several worker processes on one
+  host, with no server to run. Each process binds a Unix datagram socket in
+  the directory and relays what it receives to its in-process queues.
+- ``redis://...``: Redis (or any Redis-compatible server) pub/sub, for
+  workers on several hosts.
+
+A stream holds its connection open for up to CHAT_STREAM_MAX_SECONDS, so
+serve the app with an async worker class (gunicorn ``-k gevent``), where an
+open stream costs a greenlet rather than a thread.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+# Within the default Unix socket buffers; chat events are a few hundred bytes
+MAX_DATAGRAM = 64 * 1024
+
+_create_lock = threading.Lock()
+
+
+class MemorySubscription:
+    def __init__(self, broker, user_id):
+        self._broker = broker
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def get(self, timeout):
+        """Next ``(event, data)`` pair, or None if nothing arrived within ``timeout``."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+
+class MemoryBroker:
+    """Thread-safe in-process broker; events only reach the same worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = MemorySubscription(self, user_id)
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait((event, data))
+            except queue.Full:
+                # Slow consumer: drop the event, the client resyncs on reconnect
+                pass
+
+
+class LocalBroker:
+    """Relays events between the worker processes of one host over Unix datagram sockets.
+
+    Publishing sends the event to every socket in ``directory``, this
+    process's included; each process delivers what it receives to its own
+    subscribers. Sockets left behind by dead processes are removed by the
+    next publish that fails to reach them.
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._local = MemoryBroker()
+        os.makedirs(directory, exist_ok=True)
+        self._path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._receiver.bind(self._path)
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # A full receive buffer drops the event instead of blocking the request
+        self._sender.setblocking(False)
+        self._sender_lock = threading.Lock()
+        threading.Thread(target=self._receive, name="chat-broker", daemon=True).start()
+        atexit.register(self.close)
+
+    def _receive(self):
+        while True:
+            try:
+                payload = self._receiver.recv(MAX_DATAGRAM)
+            except OSError:
+                return  # Closed
+            try:
+                message = json.loads(payload)
+                self._local.publish(message["user_id"], message["event"], message["data"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Dropping malformed chat broker datagram (%d bytes)", len(payload))
+
+    def subscribe(self, user_id):
+        return self._local.subscribe(user_id)
+
+    def publish(self, user_id, event, data):
+        payload = json.dumps({"user_id": user_id, "event": event, "data": data}).encode("utf-8")
+        if len(payload) > MAX_DATAGRAM:
+            logger.warning("Dropping %s event for user %s: %d bytes exceeds MAX_DATAGRAM", event, user_id, len(payload))
+            return
+        for name in os.listdir(self._directory):
+            if not name.endswith(".sock"):
+                continue
+            path = os.path.join(self._directory, name)
+            try:
+                with self._sender_lock:
+                    self._sender.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                pass  # Slow process: drop the event, like a full subscriber queue
+            except OSError:
+                logger.exception("Sending a chat event to %s failed", path)
+
+    def close(self):
+        self._receiver.close()
+        self._sender.close()
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+
+class RedisSubscription:
+    def __init__(self, pubsub, user_id):
+        self._pubsub = pubsub
+        self.user_id = user_id
+
+    def get(self, timeout):
+        message = self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if not message:
+            return None
+        payload = json.loads(message["data"])
+        return payload["event"], payload["data"]
+
+    def close(self):
+        self._pubsub.close()
+
+
+class RedisBroker:
+    """Redis pub/sub broker: one channel per user, shared by every worker."""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CHAT_BROKER_URL uses redis:// but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _channel(user_id):
+        return f"chat:user:{user_id}"
+
+    def subscribe(self, user_id):
+        pubsub = self._client.pubsub()
+        pubsub.subscribe(self._channel(user_id))
+        return RedisSubscription(pubsub, user_id)
+
+    def publish(self, user_id, event, data):
+        self._client.publish(self._channel(user_id), json.dumps({"event": event, "data": data}))
+
+
+def create_broker(url):
+    if not url or url.startswith("memory://"):
+        return MemoryBroker()
+    if url.startswith("local://"):
+        return LocalBroker(url[len("local://"):] or os.path.join(tempfile.gettempdir(), "coach-partner-chat"))
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported CHAT_BROKER_URL: {url}")
+
+
+def get_broker():
+    """The app-wide broker, created lazily from CHAT_BROKER_URL."""
+    broker = current_app.extensions.get("chat_broker")
+    if broker is None:
+        with _create_lock:
+            broker = current_app.extensions.get("chat_broker")
+            if broker is None:
+                broker = create_broker(current_app.config.get("CHAT_BROKER_URL"))
+                current_app.extensions["chat_broker"] = broker
+    return broker
+
+
+def publish(user_id, event, data):
+    """Publish an event to every open stream of ``user_id``."""
+    try:
+        get_broker().publish(user_id, event, data)
+    except Exception:
+        # Real-time delivery is best effort; clients still resync via the REST API
+        current_app.logger.exception("Failed to publish chat event %s", event)
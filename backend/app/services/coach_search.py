@@ -0,0 +1,162 @@
+"""
+Name search for coach discovery (/api/community/coaches).
+
+``User.search_name`` holds the lower-cased, accent-folded full name, kept up
+to date on every flush. Query terms are folded the same way and each must
+occur in the name:
+
+- PostgreSQL: ``LIKE '%term%'`` served by a ``pg_trgm`` GIN index.
+- SQLite: an FTS5 ``trigram`` table over the column (``user_names_fts``),
+  kept in sync by triggers.
+- Anything else (or SQLite without the FTS table): a scan.
+
+Trigram indexes need at least three characters, so shorter terms match the
+start of a name word instead. When every term is short, the first one must
+start the full name, which the plain B-tree index on ``search_name`` serves.
+"""
+
+import re
+import unicodedata
+
+from flask import current_app
+from sqlalchemy import and_, event, or_, select, text
+
+from app import db
+from app.models.user import User
+
+MAX_TERMS = 4
+TRIGRAM = 3
+
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS user_names_fts USING fts5(
+        search_name, content='users', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS users_search_name_ai AFTER INSERT ON users BEGIN
+        INSERT INTO user_names_fts(rowid, search_name) VALUES (new.id, new.search_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_search_name_ad AFTER DELETE ON users BEGIN
+        INSERT INTO user_names_fts(user_names_fts, rowid, search_name) VALUES ('delete', old.id, old.search_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_search_name_au AFTER UPDATE OF search_name ON users BEGIN
+        INSERT INTO user_names_fts(user_names_fts, rowid, search_name) VALUES ('delete', old.id, old.search_name);
+        INSERT INTO user_names_fts(rowid, search_name) VALUES (new.id, new.search_name);
+    END""",
+]
+
+POSTGRES_TRGM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_search_name_trgm ON users USING GIN (search_name gin_trgm_ops)",
+]
+
+
+def fold(value):
+    """Lower-case, strip accents and collapse whitespace ("Nicolò  D'Angelo" -> "nicolo d'angelo")."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split())
+
+
+def search_name(first_name, last_name):
+    return fold(f"{first_name or ''} {last_name or ''}") or None
+
+
+def terms_of(q):
+    """Folded word tokens of a query; ``_`` and ``%`` never reach a LIKE pattern."""
+    return re.findall(r"[^\W_]+", fold(q))[:MAX_TERMS]
+
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _set_search_name(mapper, connection, user):
+    name = search_name(user.first_name, user.last_name)
+    if user.search_name != name:
+        user.search_name = name
+
+
+# ── Matching ──────────────────────────────────────────────────────────
+
+def _fts_table_exists():
+    return db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_names_fts'"
+    )).first() is not None
+
+
+def _mode():
+    """"trigram-fts", "trigram-like" or "scan", cached per app."""
+    mode = current_app.extensions.get("coach_search")
+    if mode is None:
+        dialect = db.engine.dialect.name
+        if dialect == "sqlite" and _fts_table_exists():
+            mode = "trigram-fts"
+        elif dialect == "postgresql":
+            mode = "trigram-like"
+        else:
+            mode = "scan"
+        current_app.extensions["coach_search"] = mode
+    return mode
+
+
+def _prefix(term):
+    """``search_name`` starts with ``term``, as an index range."""
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return and_(User.search_name >= term, User.search_name < upper)
+
+
+def name_filter(q):
+    """Condition on ``User`` matching every term of ``q``, or None for no terms."""
+    terms = terms_of(q)
+    if not terms:
+        return None
+
+    long_terms = [t for t in terms if len(t) >= TRIGRAM]
+    short_terms = [t for t in terms if len(t) < TRIGRAM]
+
+    conditions = []
+    if long_terms and _mode() == "trigram-fts":
+        match = " ".join(f'"{t}"' for t in long_terms)
+        conditions.append(User.id.in_(
+            select(text("rowid")).select_from(text("user_names_fts"))
+            .where(text("user_names_fts MATCH :name_match").bindparams(name_match=match))
+        ))
+    else:
+        conditions += [User.search_name.like(f"%{t}%") for t in long_terms]
+
+    if short_terms and not long_terms:
+        # Nothing narrows the search yet: anchor the first term at the start of the name
+        conditions.append(_prefix(short_terms[0]))
+        short_terms = short_terms[1:]
+    conditions += [
+        or_(User.search_name.like(f"{t}%"), User.search_name.like(f"% {t}%")) for t in short_terms
+    ]
+    return and_(*conditions)
+
+
+# ── Maintenance ───────────────────────────────────────────────────────
+
+def reindex():
+    """Refresh stale ``search_name`` values and (re)build the trigram index. Returns users updated."""
+    users = db.session.execute(select(User.id, User.first_name, User.last_name, User.search_name))
+    updates = [
+        {"user_id": user_id, "name": name}
+        for user_id, first, last, current in users
+        if (name := search_name(first, last)) != current
+    ]
+    if updates:
+        table = User.__table__
+        db.session.execute(
+            table.update().where(table.c.id == db.bindparam("user_id")).values(search_name=db.bindparam("name")),
+            updates,
+        )
+
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS:
+            db.session.execute(text(statement))
+        db.session.execute(text("INSERT INTO user_names_fts(user_names_fts) VALUES ('rebuild')"))
+        # Without statistics SQLite prefers the (sport, followers_count) index for every search
+        db.session.execute(text("ANALYZE users"))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_TRGM:
+            db.session.execute(text(statement))
+    current_app.extensions.pop("coach_search", None)
+    return len(updates)
@@ -0,0 +1,193 @@
+"""
+Dashboard aggregation helpers.
+Each helper computes a whole dashboard section with a fixed number of grouped
+queries, so the cost of a request does not grow with the session history.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import func, case
+
+from app import db
+from app.models.athlete import Athlete
+from app.models.training import TrainingSession
+from app.models.match import Match
+from app.models.attendance import Attendance
+
+
+def athlete_status_counts(team_id):
+    """Total athletes and per-status counts in a single query."""
+    row = db.session.query(
+        func.count(Athlete.id),
+        func.sum(case((Athlete.status == "available", 1), else_=0)),
+        func.sum(case((Athlete.status == "attention", 1), else_=0)),
+        func.sum(case((Athlete.status == "unavailable", 1), else_=0)),
+    ).filter(Athlete.team_id == team_id).one()
+
+    return {
+        "total": row[0] or 0,
+        "available": int(row[1] or 0),
+        "attention": int(row[2] or 0),
+        "unavailable": int(row[3] or 0),
+    }
+
+
+def session_totals(team_id, since=None):
+    """Session count, completed count, average duration and recent count."""
+    recent = case((TrainingSession.date >= since, 1), else_=0) if since else 0
+    row = db.session.query(
+        func.count(TrainingSession.id),
+        func.sum(case((TrainingSession.status == "completed", 1), else_=0)),
+        func.avg(TrainingSession.duration_minutes),
+        func.sum(recent),
+    ).filter(TrainingSession.team_id == team_id).one()
+
+    return {
+        "total": row[0] or 0,
+        "completed": int(row[1] or 0),
+        "avg_duration": round(float(row[2]), 1) if row[2] else 0,
+        "recent": int(row[3] or 0),
+    }
+
+
+def match_record(team_id):
+    """Match count and win/draw/loss record of completed matches."""
+    completed = Match.status == "completed"
+    row = db.session.query(
+        func.count(Match.id),
+        func.sum(case((completed, 1), else_=0)),
+        func.sum(case((completed & (Match.result == "win"), 1), else_=0)),
+        func.sum(case((completed & (Match.result == "draw"), 1), else_=0)),
+        func.sum(case((completed & (Match.result == "loss"), 1), else_=0)),
+    ).filter(Match.team_id == team_id).one()
+
+    return {
+        "total": row[0] or 0,
+        "completed": int(row[1] or 0),
+        "wins": int(row[2] or 0),
+        "draws": int(row[3] or 0),
+        "losses": int(row[4] or 0),
+    }
+
+
+def avg_attendance_rate(team_id, total_athletes, total_sessions):
+    """Average per-session attendance percentage.
+
+    The mean of ``present / athletes`` over every session equals the total
+    number of "present" records divided by ``sessions * athletes``, so one
+    COUNT over the team's attendances is enough.
+    """
+    if not total_athletes or not total_sessions:
+        return 0
+
+    present = db.session.query(func.count(Attendance.id)).join(
+        TrainingSession, Attendance.training_session_id == TrainingSession.id
+    ).filter(
+        TrainingSession.team_id == team_id,
+        Attendance.status == "present",
+    ).scalar() or 0
+
+    return round(present / (total_sessions * total_athletes) * 100, 1)
+
+
+def _week_bucket(column, today, weeks):
+    """CASE expression mapping a date to its 7-day window index (0 = current)."""
+    whens = [
+        (column >= today - timedelta(days=w * 7 + 6), w)
+        for w in range(weeks - 1)
+    ]
+    return case(*whens, else_=weeks - 1)
+
+
+def weekly_trend(team_id, today, weeks=4):
+    """Sessions, matches and average RPE for the last ``weeks`` 7-day windows.
+
+    Returns a list in chronological order (oldest week first). The average RPE
+    comes from the session-level ``rpe_avg`` and falls back to individual
+    attendance RPE for weeks where no session has one.
+    """
+    start = today - timedelta(days=weeks * 7 - 1)
+
+    session_bucket = _week_bucket(TrainingSession.date, today, weeks)
+    session_rows = db.session.query(
+        session_bucket,
+        func.count(TrainingSession.id),
+        func.avg(TrainingSession.rpe_avg),
+    ).filter(
+        TrainingSession.team_id == team_id,
+        TrainingSession.date >= start,
+        TrainingSession.date <= today,
+    ).group_by(session_bucket).all()
+
+    match_bucket = _week_bucket(Match.date, today, weeks)
+    match_rows = db.session.query(
+        match_bucket,
+        func.count(Match.id),
+    ).filter(
+        Match.team_id == team_id,
+        Match.date >= start,
+        Match.date <= today,
+    ).group_by(match_bucket).all()
+
+    attendance_rows = db.session.query(
+        session_bucket,
+        func.avg(Attendance.rpe),
+    ).join(
+        TrainingSession, Attendance.training_session_id == TrainingSession.id
+    ).filter(
+        TrainingSession.team_id == team_id,
+        TrainingSession.date >= start,
+        TrainingSession.date <= today,
+        Attendance.rpe.isnot(None),
+    ).group_by(session_bucket).all()
+
+    sessions = {w: (count, avg_rpe) for w, count, avg_rpe in session_rows}
+    matches = dict(match_rows)
+    attendance_rpe = dict(attendance_rows)
+
+    trend = []
+    for w in range(weeks):
+        week_end = today - timedelta(days=w * 7)
+        week_start = week_end - timedelta(days=6)
+        iso_year, iso_week, _ = week_start.isocalendar()
+
+        count, avg_rpe = sessions.get(w, (0, None))
+        if avg_rpe is None:
+            avg_rpe = attendance_rpe.get(w)
+
+        trend.append({
+            "week": f"{iso_year}-W{iso_week:02d}",
+            "sessions": count,
+            "matches": matches.get(w, 0),
+            "avg_rpe": round(float(avg_rpe), 1) if avg_rpe is not None else None,
+        })
+
+    trend.reverse()
+    return trend
+
+
+def weekly_minutes(team_id, today, weeks=4):
+    """Session count and total minutes for the last ``weeks`` half-open 7-day windows."""
+    start = today - timedelta(days=weeks * 7)
+    # Windows are [today - (w + 1) * 7, today - w * 7), so shift by one day
+    # to reuse the inclusive bucket boundaries.
+    bucket = _week_bucket(TrainingSession.date, today - timedelta(days=1), weeks)
+    rows = db.session.query(
+        bucket,
+        func.count(TrainingSession.id),
+        func.sum(TrainingSession.duration_minutes),
+    ).filter(
+        TrainingSession.team_id == team_id,
+        TrainingSession.date >= start,
+        TrainingSession.date < today,
+    ).group_by(bucket).all()
+
+    by_week = {w: (count, minutes) for w, count, minutes in rows}
+    return [
+        {
+            "week": f"Sett. -{w + 1}",
+            "sessions": by_week.get(w, (0, 0))[0],
+            "minutes": int(by_week.get(w, (0, 0))[1] or 0),
+        }
+        for w in range(weeks)
+    ]
@@ -0,0 +1,213 @@
+"""
+Per-request query and latency instrumentation (opt-in: INSTRUMENTATION_ENABLED).
+
+SQLAlchemy cursor events count the statements each request runs and the
+time spent in the database. Every response gets a ``Server-Timing`` header.
+Requests slower than SLOW_REQUEST_MS are logged with their costliest
+statements. A statement shape repeated more than N_PLUS_ONE_THRESHOLD
+times in one request is logged as a likely N+1.
+
+Totals per endpoint are kept in process memory and served in Prometheus
+text format at ``/api/_metrics``, together with the AI client and AI cache
+counters. With several workers each process reports its own; scrape them
+individually or aggregate. Queries run while a streamed body is sent, after
+the response has started, are not counted.
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, has_request_context, request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services import ai_cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PARAMS = re.compile(r"(?:\?|%\(\w+\)s|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|%s))*")
+_SPACES = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_requests = defaultdict(lambda: {
+    "count": 0, "duration": 0.0, "buckets": [0] * len(DURATION_BUCKETS),
+    "queries": 0, "db_seconds": 0.0,
+})  # (method, endpoint, status) -> totals
+_n_plus_one = defaultdict(int)  # (method, endpoint) -> flagged requests
+
+
+def shape(statement):
+    """A statement with its parameter placeholders (and IN lists) collapsed."""
+    return _PARAMS.sub("?", _SPACES.sub(" ", statement).strip())
+
+
+# ── SQLAlchemy hooks ──────────────────────────────────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["instrumentation_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("instrumentation_started", None)
+    if started is None or not has_request_context():
+        return
+    stats = g.get("instrumentation")
+    if stats is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats["queries"] += 1
+    stats["db_seconds"] += elapsed
+    entry = stats["shapes"].setdefault(shape(statement), [0, 0.0])
+    entry[0] += 1
+    entry[1] += elapsed
+
+
+# ── Request hooks ─────────────────────────────────────────────────────
+
+def _start():
+    g.instrumentation = {
+        "started": time.perf_counter(), "queries": 0, "db_seconds": 0.0, "shapes": {},
+    }
+
+
+def _finish(response):
+    stats = g.pop("instrumentation", None)
+    if stats is None:
+        return response
+
+    duration = time.perf_counter() - stats["started"]
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={stats["db_seconds"] * 1000:.1f};desc="{stats["queries"]} queries", '
+        f'app;dur={duration * 1000:.1f}',
+    )
+
+    method = request.method
+    endpoint = request.url_rule.rule if request.url_rule else "<unmatched>"
+    config = current_app.config
+    repeated = [(s, n) for s, (n, _) in stats["shapes"].items()
+                if n > config.get("N_PLUS_ONE_THRESHOLD", 10)]
+
+    with _lock:
+        totals = _requests[(method, endpoint, str(response.status_code))]
+        totals["count"] += 1
+        totals["duration"] += duration
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                totals["buckets"][i] += 1
+        totals["queries"] += stats["queries"]
+        totals["db_seconds"] += stats["db_seconds"]
+        if repeated:
+            _n_plus_one[(method, endpoint)] += 1
+
+    logger = current_app.logger
+    for statement, count in repeated:
+        logger.warning("Possible N+1 in %s %s: %d× %s", method, endpoint, count, statement[:300])
+    if duration * 1000 > config.get("SLOW_REQUEST_MS", 500):
+        top = sorted(stats["shapes"].items(), key=lambda item: item[1][1], reverse=True)[:3]
+        logger.warning(
+            "Slow request %s %s %s: %.0fms, %d queries in %.0fms%s",
+            method, request.path, response.status_code, duration * 1000,
+            stats["queries"], stats["db_seconds"] * 1000,
+            "".join(f"\n  {n}× {seconds * 1000:.1f}ms {s[:300]}" for s, (n, seconds) in top),
+        )
+    return response
+
+
+# ── Prometheus exposition ─────────────────────────────────────────────
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_metrics():
+    with _lock:
+        requests_ = {key: {**v, "buckets": list(v["buckets"])} for key, v in _requests.items()}
+        n_plus_one = dict(_n_plus_one)
+
+    lines = [
+        "# HELP http_requests_total Requests handled by this process.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, endpoint, status), totals in sorted(requests_.items()):
+        lines.append(f"http_requests_total{_labels(method=method, endpoint=endpoint, status=status)} {totals['count']}")
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency, until the response starts.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, endpoint, status), totals in sorted(requests_.items()):
+        labels = dict(method=method, endpoint=endpoint, status=status)
+        # Each bucket counts every request up to its bound, i.e. cumulative
+        for bound, n in zip(DURATION_BUCKETS, totals["buckets"]):
+            lines.append(f"http_request_duration_seconds_bucket{_labels(**labels, le=bound)} {n}")
+        lines.append(f"http_request_duration_seconds_bucket{_labels(**labels, le='+Inf')} {totals['count']}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(**labels)} {totals['duration']:.6f}")
+        lines.append(f"http_request_duration_seconds_count{_labels(**labels)} {totals['count']}")
+
+    lines += [
+        "# HELP db_queries_total SQL statements run while handling requests.",
+        "# TYPE db_queries_total counter",
+    ]
+    for (method, endpoint, status), totals in sorted(requests_.items()):
+        lines.append(f"db_queries_total{_labels(method=method, endpoint=endpoint, status=status)} {totals['queries']}")
+
+    lines += [
+        "# HELP db_query_duration_seconds_total Time spent in SQL statements while handling requests.",
+        "# TYPE db_query_duration_seconds_total counter",
+    ]
+    for (method, endpoint, status), totals in sorted(requests_.items()):
+        lines.append(
+            f"db_query_duration_seconds_total{_labels(method=method, endpoint=endpoint, status=status)} "
+            f"{totals['db_seconds']:.6f}"
+        )
+
+    lines += [
+        "# HELP http_n_plus_one_requests_total Requests that repeated one statement shape over N_PLUS_ONE_THRESHOLD times.",
+        "# TYPE http_n_plus_one_requests_total counter",
+    ]
+    for (method, endpoint), count in sorted(n_plus_one.items()):
+        lines.append(f"http_n_plus_one_requests_total{_labels(method=method, endpoint=endpoint)} {count}")
+
+    client = current_app.extensions.get("ai_client")
+    if client is not None:
+        stats = client.stats()
+        lines += [
+            "# TYPE ai_client_calls_total counter",
+            f"ai_client_calls_total {stats['calls']}",
+            "# TYPE ai_client_errors_total counter",
+            f"ai_client_errors_total {stats['errors']}",
+            "# TYPE ai_client_latency_seconds_total counter",
+            f"ai_client_latency_seconds_total {stats['latency_ms_total'] / 1000:.6f}",
+            "# TYPE ai_client_tokens_total counter",
+            f"ai_client_tokens_total{_labels(kind='prompt')} {stats['prompt_tokens']}",
+            f"ai_client_tokens_total{_labels(kind='completion')} {stats['completion_tokens']}",
+        ]
+    cache = ai_cache.stats()
+    lines += [
+        "# TYPE ai_cache_lookups_total counter",
+        f"ai_cache_lookups_total{_labels(outcome='hit')} {cache['hits']}",
+        f"ai_cache_lookups_total{_labels(outcome='miss')} {cache['misses']}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return {"error": "Not authorized"}, 401
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    """Instrument requests and serve ``/api/_metrics``."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.add_url_rule("/api/_metrics", "metrics", metrics)
@@ -0,0 +1,149 @@
+"""
+Maintenance of the per-athlete daily load rollup (``DailyLoad``).
+Writes recompute only the (athlete, day) cells they touch, so the rollup stays
+in sync without ever rescanning an athlete's full history.
+"""
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models.athlete import Athlete
+from app.models.attendance import Attendance
+from app.models.daily_load import DailyLoad
+from app.models.training import TrainingSession
+
+DEFAULT_RPE = 5
+DEFAULT_DURATION = 60
+
+
+def _aggregate_query():
+    """Grouped loads per (athlete, day) straight from the raw tables."""
+    rpe = func.coalesce(Attendance.rpe, DEFAULT_RPE)
+    minutes = func.coalesce(
+        Attendance.minutes_trained, TrainingSession.duration_minutes, DEFAULT_DURATION
+    )
+    return db.session.query(
+        Attendance.athlete_id,
+        TrainingSession.date,
+        func.sum(rpe * minutes),
+        func.sum(rpe * func.coalesce(TrainingSession.duration_minutes, DEFAULT_DURATION)),
+        func.sum(minutes),
+        func.count(Attendance.id),
+    ).join(
+        TrainingSession, Attendance.training_session_id == TrainingSession.id
+    ).group_by(Attendance.athlete_id, TrainingSession.date)
+
+
+def _compute(query):
+    """Run an aggregate query and index it by (athlete_id, date)."""
+    return {
+        (athlete_id, day): {
+            "load": float(load or 0),
+            "session_load": float(session_load or 0),
+            "minutes": int(minutes or 0),
+            "sessions": count,
+        }
+        for athlete_id, day, load, session_load, minutes, count in query.all()
+    }
+
+
+def _team_athletes(team_id):
+    return select(Athlete.id).where(Athlete.team_id == team_id)
+
+
+def refresh(keys):
+    """Recompute the rollup cells for an iterable of (athlete_id, date) pairs."""
+    keys = {(athlete_id, day) for athlete_id, day in keys if athlete_id and day}
+    if not keys:
+        return
+
+    athlete_ids = {athlete_id for athlete_id, _ in keys}
+    days = {day for _, day in keys}
+
+    fresh = _compute(_aggregate_query().filter(
+        Attendance.athlete_id.in_(athlete_ids),
+        TrainingSession.date.in_(days),
+    ))
+    existing = {
+        (row.athlete_id, row.date): row
+        for row in DailyLoad.query.filter(
+            DailyLoad.athlete_id.in_(athlete_ids),
+            DailyLoad.date.in_(days),
+        ).all()
+    }
+
+    for key in keys:
+        values = fresh.get(key)
+        row = existing.get(key)
+        if values is None:
+            if row is not None:
+                db.session.delete(row)
+        elif row is None:
+            db.session.add(DailyLoad(athlete_id=key[0], date=key[1], **values))
+        else:
+            for field, value in values.items():
+                setattr(row, field, value)
+
+
+def session_keys(session_id, *days):
+    """Rollup keys for every athlete attending a session, on each of ``days``."""
+    athlete_ids = [
+        athlete_id for (athlete_id,) in db.session.query(Attendance.athlete_id)
+        .filter(Attendance.training_session_id == session_id).all()
+    ]
+    return {(athlete_id, day) for athlete_id in athlete_ids for day in days}
+
+
+def session_date(session_id):
+    """Current stored date of a session (flushed state, always a ``date``)."""
+    return db.session.query(TrainingSession.date).filter(
+        TrainingSession.id == session_id
+    ).scalar()
+
+
+def rebuild(team_id=None):
+    """Drop and recompute the rollup, for one team's current athletes or for everything."""
+    delete = DailyLoad.query
+    query = _aggregate_query()
+    if team_id is not None:
+        delete = delete.filter(DailyLoad.athlete_id.in_(_team_athletes(team_id)))
+        query = query.filter(Attendance.athlete_id.in_(_team_athletes(team_id)))
+
+    delete.delete(synchronize_session=False)
+    fresh = _compute(query)
+    db.session.bulk_insert_mappings(DailyLoad, [
+        {"athlete_id": athlete_id, "date": day, **values}
+        for (athlete_id, day), values in fresh.items()
+    ])
+    return len(fresh)
+
+
+def find_drift(team_id=None):
+    """Compare the rollup with the raw tables and list the cells that differ."""
+    query = _aggregate_query()
+    rows = DailyLoad.query
+    if team_id is not None:
+        query = query.filter(Attendance.athlete_id.in_(_team_athletes(team_id)))
+        rows = rows.filter(DailyLoad.athlete_id.in_(_team_athletes(team_id)))
+
+    expected = _compute(query)
+    actual = {
+        (row.athlete_id, row.date): {
+            "load": row.load,
+            "session_load": row.session_load,
+            "minutes": row.minutes,
+            "sessions": row.sessions,
+        }
+        for row in rows.all()
+    }
+
+    drift = []
+    for key in expected.keys() | actual.keys():
+        if expected.get(key) != actual.get(key):
+            drift.append({
+                "athlete_id": key[0],
+                "date": key[1].isoformat(),
+                "expected": expected.get(key),
+                "actual": actual.get(key),
+            })
+    return drift
@@ -0,0 +1,200 @@
+"""
+Post engagement counters: ``likes_count``, ``comments_count``, ``saves_count``.
+
+Routes call ``change(post_id, column, delta)`` in the transaction that
+inserts or deletes the like, comment or save. By default that is a SQL-side
+increment (``likes_count = likes_count + 1``), so concurrent requests never
+lose updates and nothing reads the current value first. The same UPDATE
+refreshes the post's trending score (see ``app.services.trending``).
+
+With POST_COUNTERS_WRITE_BEHIND, committed deltas are instead coalesced per
+post in process memory, and a background thread applies them every
+POST_COUNTERS_FLUSH_INTERVAL seconds with one UPDATE per post. A viral post
+then takes one row lock per interval and worker instead of one per like.
+Counts read from the database lag by up to the interval (``current`` adds
+this process's pending delta for the acting user's response), and a crash
+loses the pending deltas: ``flask social check --fix`` repairs them.
+"""
+
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from flask import current_app
+from sqlalchemy import case, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.community import Comment, Post, PostLike, SavedPost
+from app.services import trending
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("likes_count", "comments_count", "saves_count")
+
+_lock = threading.Lock()
+
+
+def _incremented(column, delta):
+    """``column + delta``, never below zero."""
+    value = getattr(Post, column) + delta
+    return value if delta >= 0 else case((value < 0, 0), else_=value)
+
+
+def _values(deltas):
+    """SET clause applying ``{column: delta}`` and rescoring the post."""
+    values = {column: _incremented(column, delta) for column, delta in deltas.items()}
+    return {**values, "trending_score": trending.rescored(values)}
+
+
+def _apply(deltas):
+    """One UPDATE per post, in post id order so concurrent flushes lock rows alike."""
+    by_post = defaultdict(dict)
+    for (post_id, column), delta in deltas.items():
+        if delta:
+            by_post[post_id][column] = delta
+    for post_id in sorted(by_post):
+        db.session.execute(update(Post).where(Post.id == post_id).values(**_values(by_post[post_id])))
+
+
+class WriteBehindBuffer:
+    """Committed counter deltas of this process, flushed periodically."""
+
+    def __init__(self, app, interval):
+        self._app = app
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._deltas = Counter()  # (post id, column) -> delta
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="post-counters", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, deltas):
+        with self._lock:
+            self._deltas.update(deltas)
+
+    def pending(self, post_id, column):
+        with self._lock:
+            return self._deltas.get((post_id, column), 0)
+
+    def flush(self):
+        """Apply and commit the pending deltas. Returns the number of posts updated."""
+        with self._lock:
+            deltas, self._deltas = self._deltas, Counter()
+        if not deltas:
+            return 0
+        try:
+            _apply(deltas)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self.add(deltas)  # Retried on the next flush
+            raise
+        return len({post_id for post_id, _ in deltas})
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            with self._app.app_context():
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Flushing post counters failed")
+
+    def close(self):
+        self._stop.set()
+        with self._app.app_context():
+            self.flush()
+
+
+def get_buffer():
+    """The app's write-behind buffer, or None when counters are written inline."""
+    app = current_app._get_current_object()
+    if not app.config.get("POST_COUNTERS_WRITE_BEHIND"):
+        return None
+    buffer = app.extensions.get("post_counter_buffer")
+    if buffer is None:
+        with _lock:
+            buffer = app.extensions.get("post_counter_buffer")
+            if buffer is None:
+                buffer = WriteBehindBuffer(app, app.config.get("POST_COUNTERS_FLUSH_INTERVAL", 1.0))
+                app.extensions["post_counter_buffer"] = buffer
+    return buffer
+
+
+def change(post_id, column, delta):
+    """Count a like, comment or save (``delta=1``) or its removal (``delta=-1``)."""
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown post counter: {column}")
+    if get_buffer() is None:
+        db.session.execute(update(Post).where(Post.id == post_id).values(**_values({column: delta})))
+    else:
+        # Buffered only once the transaction commits
+        db.session.info.setdefault("post_counter_deltas", Counter())[(post_id, column)] += delta
+
+
+def current(post, column):
+    """The counter as this process will write it: stored value plus pending delta."""
+    buffer = get_buffer()
+    value = getattr(post, column) or 0
+    return max(0, value + buffer.pending(post.id, column)) if buffer else value
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    deltas = session.info.pop("post_counter_deltas", None)
+    if deltas:
+        get_buffer().add(deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("post_counter_deltas", None)
+
+
+# ── Reconciliation ────────────────────────────────────────────────────
+
+def _expected():
+    return {
+        "likes_count": select(func.count(PostLike.id)).where(PostLike.post_id == Post.id).scalar_subquery(),
+        "comments_count": select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery(),
+        "saves_count": select(func.count(SavedPost.id)).where(SavedPost.post_id == Post.id).scalar_subquery(),
+    }
+
+
+def _drifted(expected):
+    return or_(*(func.coalesce(getattr(Post, name), 0) != value for name, value in expected.items()))
+
+
+def find_drift():
+    """Posts whose stored counters disagree with the likes, comments and saves tables."""
+    expected = _expected()
+    names = list(expected)
+    query = select(Post.id, *(getattr(Post, name) for name in names), *expected.values()).where(
+        _drifted(expected)
+    ).order_by(Post.id)
+
+    drift = []
+    for row in db.session.execute(query):
+        stored, actual = row[1:1 + len(names)], row[1 + len(names):]
+        drift.append({
+            "post_id": row[0],
+            "expected": dict(zip(names, actual)),
+            "actual": dict(zip(names, stored)),
+        })
+    return drift
+
+
+def reconcile():
+    """Recompute drifted counters from the source tables. Returns the posts fixed.
+
+    Deltas still pending in a write-behind buffer are applied on top
+    afterwards, so run it when the workers are idle or stopped.
+    """
+    expected = _expected()
+    statement = update(Post).where(_drifted(expected)).values(
+        **expected, trending_score=trending.rescored(expected)
+    )
+    result = db.session.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount
@@ -0,0 +1,337 @@
+"""
+Full-text search index for /api/search.
+
+Every flush that creates, updates or deletes a searchable entity rewrites its
+``SearchDocument`` row in the same transaction. Matching and ranking are
+delegated to a backend chosen from the database dialect:
+
+- SQLite: FTS5 external-content table (``search_fts``) kept in sync by
+  triggers, BM25 ranking, prefix queries, diacritics folding. SQLite ships no
+  Italian stemmer, so prefix matching stands in for stemming.
+- PostgreSQL: generated ``tsvector`` column (Italian configuration, title
+  weighted above body) with a GIN index, ``ts_rank`` ranking, prefix queries.
+- Anything else (or SQLite without the FTS table): ILIKE over the documents.
+"""
+
+import re
+
+from flask import current_app
+from sqlalchemy import event, text, select, delete, insert, or_, and_
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.athlete import Athlete
+from app.models.training import TrainingSession, TrainingBlock
+from app.models.match import Match
+from app.models.note import Note
+from app.models.ai_report import AIReport
+from app.models.team import Team
+from app.models.search import SearchDocument
+
+MAX_TERMS = 8
+
+
+def _join(*parts):
+    return " ".join(str(p) for p in parts if p) or None
+
+
+def _team_coach(conn, cache, team_id):
+    if team_id not in cache:
+        cache[team_id] = conn.execute(
+            select(Team.coach_id).where(Team.id == team_id)
+        ).scalar()
+    return cache[team_id]
+
+
+def _session_coach(conn, cache, session_id):
+    key = ("session", session_id)
+    if key not in cache:
+        team_id = conn.execute(
+            select(TrainingSession.team_id).where(TrainingSession.id == session_id)
+        ).scalar()
+        cache[key] = _team_coach(conn, cache, team_id)
+    return cache[key]
+
+
+def _athlete_doc(obj, conn, cache):
+    return {
+        "coach_id": _team_coach(conn, cache, obj.team_id),
+        "title": _join(obj.first_name, obj.last_name),
+        "body": _join(obj.position, obj.secondary_position, obj.notes),
+    }
+
+
+def _training_doc(obj, conn, cache):
+    return {
+        "coach_id": _team_coach(conn, cache, obj.team_id),
+        "title": obj.title,
+        "body": _join(obj.objectives, obj.what_worked, obj.what_to_improve, obj.template_name),
+    }
+
+
+def _block_doc(obj, conn, cache):
+    return {
+        "coach_id": _session_coach(conn, cache, obj.session_id),
+        "parent_id": obj.session_id,
+        "title": obj.name,
+        "body": _join(obj.objective, obj.description, obj.coaching_points, obj.variations),
+    }
+
+
+def _match_doc(obj, conn, cache):
+    return {
+        "coach_id": _team_coach(conn, cache, obj.team_id),
+        "title": _join(obj.opponent, obj.competition),
+        "body": _join(obj.venue, obj.what_worked, obj.what_didnt_work, obj.key_moments),
+    }
+
+
+def _note_doc(obj, conn, cache):
+    return {"coach_id": obj.coach_id, "title": None, "body": _join(obj.text, obj.tags)}
+
+
+def _report_doc(obj, conn, cache):
+    return {"coach_id": obj.coach_id, "title": obj.title, "body": obj.content}
+
+
+# Model -> (entity_type, document builder)
+INDEXED = {
+    Athlete: ("athlete", _athlete_doc),
+    TrainingSession: ("training", _training_doc),
+    TrainingBlock: ("training_block", _block_doc),
+    Match: ("match", _match_doc),
+    Note: ("note", _note_doc),
+    AIReport: ("ai_report", _report_doc),
+}
+
+
+def _sync(session, flush_context):
+    changed = [o for o in session.new if type(o) in INDEXED] + [
+        o for o in session.dirty if type(o) in INDEXED and session.is_modified(o)
+    ]
+    deleted = [o for o in session.deleted if type(o) in INDEXED]
+    if not changed and not deleted:
+        return
+
+    conn = session.connection()
+    cache = {}
+    for obj in changed + deleted:
+        entity_type, _ = INDEXED[type(obj)]
+        conn.execute(delete(SearchDocument).where(
+            SearchDocument.entity_type == entity_type,
+            SearchDocument.entity_id == obj.id,
+        ))
+
+    rows = []
+    for obj in changed:
+        entity_type, build = INDEXED[type(obj)]
+        doc = build(obj, conn, cache)
+        if doc["coach_id"] is None:
+            continue
+        rows.append({"entity_type": entity_type, "entity_id": obj.id, "parent_id": None, **doc})
+    if rows:
+        conn.execute(insert(SearchDocument), rows)
+
+
+def init_app(app):
+    """Keep search documents in sync with every ORM flush."""
+    if not event.contains(Session, "after_flush", _sync):
+        event.listen(Session, "after_flush", _sync)
+
+
+# ── Backends ──────────────────────────────────────────────────────────
+
+def terms_of(q):
+    """Lower-cased word tokens of a query (punctuation and operators dropped)."""
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+class SQLiteFTSBackend:
+    name = "sqlite-fts5"
+
+    SETUP = [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+            title, body,
+            content='search_documents', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+            INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+            INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN
+            INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END""",
+    ]
+
+    def setup(self):
+        for statement in self.SETUP:
+            db.session.execute(text(statement))
+
+    def rebuild(self):
+        """Resync the FTS index with the whole content table."""
+        db.session.execute(text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
+
+    def search(self, coach_id, entity_types, terms, limit):
+        match = " ".join(f'"{t}"*' for t in terms)
+        types = ", ".join(f":type{i}" for i in range(len(entity_types)))
+        rows = db.session.execute(text(f"""
+            SELECT d.entity_type, d.entity_id, d.parent_id
+            FROM search_fts
+            JOIN search_documents d ON d.id = search_fts.rowid
+            WHERE search_fts MATCH :match
+              AND d.coach_id = :coach_id
+              AND d.entity_type IN ({types})
+            ORDER BY bm25(search_fts, 3.0, 1.0)
+            LIMIT :limit
+        """), {
+            "match": match, "coach_id": coach_id, "limit": limit,
+            **{f"type{i}": t for i, t in enumerate(entity_types)},
+        })
+        return rows.all()
+
+
+class PostgresBackend:
+    name = "postgresql-tsvector"
+
+    SETUP = [
+        """ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('italian', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('italian', coalesce(body, '')), 'B')
+            ) STORED""",
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_vector ON search_documents USING GIN (search_vector)",
+    ]
+
+    def setup(self):
+        for statement in self.SETUP:
+            db.session.execute(text(statement))
+
+    def rebuild(self):
+        # The tsvector column is generated, nothing to refresh
+        pass
+
+    def search(self, coach_id, entity_types, terms, limit):
+        rows = db.session.execute(text("""
+            SELECT entity_type, entity_id, parent_id
+            FROM search_documents, to_tsquery('italian', :query) query
+            WHERE search_vector @@ query
+              AND coach_id = :coach_id
+              AND entity_type = ANY(:types)
+            ORDER BY ts_rank(search_vector, query) DESC
+            LIMIT :limit
+        """), {
+            "query": " & ".join(f"{t}:*" for t in terms),
+            "coach_id": coach_id,
+            "types": list(entity_types),
+            "limit": limit,
+        })
+        return rows.all()
+
+
+class LikeBackend:
+    """Fallback without a full-text index: substring match, newest first."""
+    name = "like"
+
+    def setup(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, coach_id, entity_types, terms, limit):
+        conditions = [
+            or_(SearchDocument.title.ilike(f"%{t}%"), SearchDocument.body.ilike(f"%{t}%"))
+            for t in terms
+        ]
+        return db.session.query(
+            SearchDocument.entity_type, SearchDocument.entity_id, SearchDocument.parent_id,
+        ).filter(
+            SearchDocument.coach_id == coach_id,
+            SearchDocument.entity_type.in_(entity_types),
+            and_(*conditions),
+        ).order_by(SearchDocument.updated_at.desc()).limit(limit).all()
+
+
+def _fts_table_exists():
+    return db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts'"
+    )).first() is not None
+
+
+def get_backend():
+    """Backend for the current database, cached per app."""
+    backend = current_app.extensions.get("search_backend")
+    if backend is not None:
+        return backend
+
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        backend = PostgresBackend()
+    elif dialect == "sqlite" and _fts_table_exists():
+        backend = SQLiteFTSBackend()
+    else:
+        if dialect == "sqlite":
+            current_app.logger.warning("search_fts missing, run 'flask search reindex'; using LIKE search")
+        backend = LikeBackend()
+
+    current_app.extensions["search_backend"] = backend
+    return backend
+
+
+def native_backend():
+    """The full-text backend this database supports, whether or not it is set up yet."""
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        return PostgresBackend()
+    if dialect == "sqlite":
+        return SQLiteFTSBackend()
+    return LikeBackend()
+
+
+def reindex(coach_id=None):
+    """Rebuild search documents from the source tables. Returns the document count.
+
+    A full reindex also creates the full-text index if it is missing; a
+    per-coach reindex relies on the triggers of an existing one.
+    """
+    backend = native_backend() if coach_id is None else get_backend()
+    if coach_id is None:
+        backend.setup()
+        # Resync first: documents written before the index existed must be
+        # known to it before the delete triggers fire.
+        backend.rebuild()
+
+    query = SearchDocument.query
+    if coach_id is not None:
+        query = query.filter(SearchDocument.coach_id == coach_id)
+    query.delete(synchronize_session=False)
+
+    conn = db.session.connection()
+    cache = {}
+    count = 0
+    for model, (entity_type, build) in INDEXED.items():
+        objects = model.query
+        if coach_id is not None:
+            if hasattr(model, "coach_id"):
+                objects = objects.filter(model.coach_id == coach_id)
+            elif model is TrainingBlock:
+                objects = objects.join(TrainingSession).join(Team).filter(Team.coach_id == coach_id)
+            else:
+                objects = objects.join(Team).filter(Team.coach_id == coach_id)
+
+        rows = []
+        for obj in objects.yield_per(500):
+            doc = build(obj, conn, cache)
+            if doc["coach_id"] is None:
+                continue
+            rows.append({"entity_type": entity_type, "entity_id": obj.id, "parent_id": None, **doc})
+        if rows:
+            conn.execute(insert(SearchDocument), rows)
+        count += len(rows)
+
+    current_app.extensions["search_backend"] = backend
+    return count
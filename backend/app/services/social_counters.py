@@ -0,0 +1,69 @@
+"""
+Denormalized community counters on ``User``: followers, following, posts.
+
+The community routes adjust them with SQL-side increments in the same
+transaction as the follow or post they count, so profile headers are read
+from the user row alone. ``find_drift`` and ``reconcile`` compare them with
+``follows`` and ``posts`` and repair any drift (rows written outside the
+routes, e.g. by bulk imports).
+"""
+
+from sqlalchemy import func, or_, select, update
+
+from app import db
+from app.models.community import Follow, Post
+from app.models.user import User
+
+
+def _expected():
+    """Correlated count subqueries for each counter column."""
+    return {
+        "followers_count": select(func.count(Follow.id)).where(Follow.following_id == User.id).scalar_subquery(),
+        "following_count": select(func.count(Follow.id)).where(Follow.follower_id == User.id).scalar_subquery(),
+        "posts_count": select(func.count(Post.id)).where(Post.author_id == User.id).scalar_subquery(),
+    }
+
+
+def _drifted(expected):
+    return or_(*(getattr(User, name) != value for name, value in expected.items()))
+
+
+def on_follow(follower, target, delta):
+    """Count a follow (``delta=1``) or an unfollow (``delta=-1``)."""
+    follower.following_count = User.following_count + delta
+    target.followers_count = User.followers_count + delta
+
+
+def on_post(author, delta):
+    author.posts_count = User.posts_count + delta
+
+
+def find_drift(user_id=None):
+    """Users whose stored counters disagree with the follows and posts tables."""
+    expected = _expected()
+    query = select(User.id, *(getattr(User, name) for name in expected), *expected.values()).where(
+        _drifted(expected)
+    ).order_by(User.id)
+    if user_id is not None:
+        query = query.where(User.id == user_id)
+
+    names = list(expected)
+    drift = []
+    for row in db.session.execute(query):
+        stored, actual = row[1:1 + len(names)], row[1 + len(names):]
+        drift.append({
+            "user_id": row[0],
+            "expected": dict(zip(names, actual)),
+            "actual": dict(zip(names, stored)),
+        })
+    return drift
+
+
+def reconcile(user_id=None):
+    """Recompute drifted counters from the source tables. Returns the users fixed."""
+    expected = _expected()
+    statement = update(User).where(_drifted(expected)).values(**expected)
+    if user_id is not None:
+        statement = statement.where(User.id == user_id)
+    result = db.session.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount
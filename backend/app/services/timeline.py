@@ -0,0 +1,176 @@
+"""
+Fan-out-on-write home timelines for the community feed.
+
+When FEED_FANOUT is enabled, ``create_post`` pushes the new post id into every
+follower's ``TimelineEntry`` rows, so reading a feed is a single range scan on
+``(user_id, sport, created_at)``. Authors with more than
+FEED_FANOUT_MAX_FOLLOWERS followers are skipped at write time; their posts
+(and the reader's own posts) are merged in at read time instead. When an
+unfollow brings an author back to the threshold, the posts they wrote in the
+meantime are pushed to their followers, since they are no longer pulled.
+"""
+
+from flask import current_app
+from sqlalchemy import exists, func, insert, literal, select
+
+from app import db
+from app.models.community import Follow, Post, TimelineEntry
+from app.models.user import User
+from app.utils.pagination import after, decode_cursor, encode_cursor, MAX_PER_PAGE
+
+ENTRY_COLUMNS = ["user_id", "post_id", "author_id", "sport", "created_at"]
+
+
+def is_enabled():
+    return current_app.config.get("FEED_FANOUT", False)
+
+
+def _max_followers():
+    return current_app.config.get("FEED_FANOUT_MAX_FOLLOWERS", 1000)
+
+
+def _followers(author_id):
+    return db.session.scalar(select(User.followers_count).where(User.id == author_id)) or 0
+
+
+def is_high_follower(author_id):
+    """Whether an author is served fan-out-on-read instead of fan-out-on-write."""
+    return _followers(author_id) > _max_followers()
+
+
+def fan_out(post):
+    """Insert a freshly flushed post into its author's followers' timelines."""
+    if not is_enabled() or is_high_follower(post.author_id):
+        return
+
+    rows = select(
+        Follow.follower_id,
+        literal(post.id),
+        literal(post.author_id),
+        literal(post.sport),
+        literal(post.created_at),
+    ).where(Follow.following_id == post.author_id)
+    db.session.execute(insert(TimelineEntry).from_select(ENTRY_COLUMNS, rows))
+
+
+def on_follow(follower_id, target_id):
+    """Backfill the most recent posts of a newly followed author."""
+    if not is_enabled() or is_high_follower(target_id):
+        return
+
+    rows = select(
+        literal(follower_id),
+        Post.id,
+        Post.author_id,
+        Post.sport,
+        Post.created_at,
+    ).where(Post.author_id == target_id).order_by(
+        Post.created_at.desc()
+    ).limit(current_app.config.get("FEED_FANOUT_BACKFILL", 50))
+    db.session.execute(insert(TimelineEntry).from_select(ENTRY_COLUMNS, rows))
+
+
+def on_unfollow(follower_id, target_id):
+    """Drop an unfollowed author's posts from the follower's timeline.
+
+    Call it after the author's follower count is decremented.
+    """
+    TimelineEntry.query.filter_by(
+        user_id=follower_id, author_id=target_id
+    ).delete(synchronize_session=False)
+    if is_enabled() and _followers(target_id) == _max_followers():
+        _push_missing(target_id)
+
+
+def _push_missing(author_id):
+    """Insert the author's posts missing from their followers' timelines."""
+    present = exists().where(
+        TimelineEntry.user_id == Follow.follower_id, TimelineEntry.post_id == Post.id
+    )
+    rows = select(
+        Follow.follower_id,
+        Post.id,
+        Post.author_id,
+        Post.sport,
+        Post.created_at,
+    ).join(Post, Post.author_id == Follow.following_id).where(
+        Follow.following_id == author_id, ~present
+    )
+    db.session.execute(insert(TimelineEntry).from_select(ENTRY_COLUMNS, rows))
+
+
+def _pulled_author_ids(user):
+    """Authors read at request time: the user and followed high-follower authors."""
+    high_follower = select(User.id).join(Follow, Follow.following_id == User.id).where(
+        Follow.follower_id == user.id, User.followers_count > _max_followers()
+    )
+    return [user.id] + list(db.session.scalars(high_follower))
+
+
+def read(user, cursor=None, per_page=20):
+    """Return ``(posts, next_cursor)`` for the user's home feed.
+
+    Uses the same ``(created_at, id)`` cursor format as the fan-out-on-read
+    feed, so clients do not need to know which path served them.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    values = decode_cursor(cursor, 2) if cursor else None
+
+    entries = TimelineEntry.query.filter(
+        TimelineEntry.user_id == user.id,
+        TimelineEntry.sport == user.sport,
+    )
+    if values:
+        entries = entries.filter(after([TimelineEntry.created_at, TimelineEntry.post_id], values))
+    entries = entries.order_by(
+        TimelineEntry.created_at.desc(), TimelineEntry.post_id.desc()
+    ).limit(per_page + 1).all()
+
+    pulled = Post.query.filter(
+        Post.author_id.in_(_pulled_author_ids(user)),
+        Post.sport == user.sport,
+    )
+    if values:
+        pulled = pulled.filter(after([Post.created_at, Post.id], values))
+    pulled = pulled.order_by(Post.created_at.desc(), Post.id.desc()).limit(per_page + 1).all()
+
+    keys = sorted(
+        {(e.created_at, e.post_id) for e in entries} | {(p.created_at, p.id) for p in pulled},
+        reverse=True,
+    )
+    page = keys[:per_page]
+
+    posts_by_id = {p.id: p for p in pulled}
+    missing = [post_id for _, post_id in page if post_id not in posts_by_id]
+    if missing:
+        posts_by_id.update({p.id: p for p in Post.query.filter(Post.id.in_(missing)).all()})
+
+    posts = [posts_by_id[post_id] for _, post_id in page if post_id in posts_by_id]
+    next_cursor = encode_cursor(page[-1]) if len(keys) > per_page else None
+    return posts, next_cursor
+
+
+def rebuild(user_id=None):
+    """Recompute timelines from follows and posts (all users or one)."""
+    delete = TimelineEntry.query
+    if user_id is not None:
+        delete = delete.filter(TimelineEntry.user_id == user_id)
+    delete.delete(synchronize_session=False)
+
+    high_follower = select(Follow.following_id).group_by(Follow.following_id).having(
+        func.count(Follow.id) > _max_followers()
+    )
+    rows = select(
+        Follow.follower_id,
+        Post.id,
+        Post.author_id,
+        Post.sport,
+        Post.created_at,
+    ).join(Post, Post.author_id == Follow.following_id).where(
+        Follow.following_id.not_in(high_follower)
+    )
+    if user_id is not None:
+        rows = rows.where(Follow.follower_id == user_id)
+
+    result = db.session.execute(insert(TimelineEntry).from_select(ENTRY_COLUMNS, rows))
+    return result.rowcount
@@ -0,0 +1,150 @@
+"""
+Training load analytics (ACWR, monotony, strain).
+Daily loads are pulled with one query (athlete loads from the ``DailyLoad``
+rollup) and laid out as a dense day x series matrix, so every metric is
+computed for the whole squad at once.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from sqlalchemy import func
+
+from app import db
+from app.models.training import TrainingSession
+from app.models.daily_load import DailyLoad
+
+DEFAULT_RPE = 5
+DEFAULT_DURATION = 60
+# Longest acute/chronic window accepted, which bounds the history loaded
+MAX_WINDOW_DAYS = 90
+
+
+def team_daily_loads(team_id, start, end):
+    """Session-level daily loads (RPE avg x duration) as a (days, 1) matrix."""
+    load = func.coalesce(TrainingSession.rpe_avg, DEFAULT_RPE) * func.coalesce(
+        TrainingSession.duration_minutes, DEFAULT_DURATION
+    )
+    rows = db.session.query(
+        TrainingSession.date,
+        func.sum(load),
+    ).filter(
+        TrainingSession.team_id == team_id,
+        TrainingSession.date >= start,
+        TrainingSession.date <= end,
+    ).group_by(TrainingSession.date).all()
+
+    matrix = np.zeros(((end - start).days + 1, 1))
+    for day, total in rows:
+        matrix[(day - start).days, 0] = total or 0
+    return matrix
+
+
+def athlete_daily_loads(athlete_ids, start, end):
+    """Per-athlete daily loads and session counts as (days, athletes) matrices.
+
+    Reads the ``DailyLoad`` rollup, so the cost depends on the window size
+    rather than on the athletes' attendance history. Loads from sessions of
+    an athlete's previous teams count too.
+    """
+    rows = db.session.query(
+        DailyLoad.athlete_id,
+        DailyLoad.date,
+        DailyLoad.load,
+        DailyLoad.sessions,
+    ).filter(
+        DailyLoad.athlete_id.in_(athlete_ids),
+        DailyLoad.date >= start,
+        DailyLoad.date <= end,
+    ).all()
+
+    column = {athlete_id: i for i, athlete_id in enumerate(athlete_ids)}
+    shape = ((end - start).days + 1, len(athlete_ids))
+    loads = np.zeros(shape)
+    sessions = np.zeros(shape, dtype=int)
+    for athlete_id, day, total, count in rows:
+        loads[(day - start).days, column[athlete_id]] = total or 0
+        sessions[(day - start).days, column[athlete_id]] = count
+    return loads, sessions
+
+
+def rolling_mean(loads, window):
+    """Trailing ``window``-day mean for every day (zero-padded before day 0)."""
+    padded = np.vstack([np.zeros((window, loads.shape[1])), loads])
+    cumulative = np.cumsum(padded, axis=0)
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+
+def ewma(loads, span):
+    """Exponentially weighted moving average with decay 2 / (span + 1).
+
+    Day ``t`` is ``alpha * sum((1 - alpha) ** (t - k) * loads[k] for k <= t)``,
+    computed as one (days, days) weight matrix product. History is at most
+    ``2 * MAX_WINDOW_DAYS`` days, so the matrix stays small.
+    """
+    alpha = 2 / (span + 1)
+    days = np.arange(loads.shape[0])
+    lags = days[:, None] - days[None, :]
+    weights = np.where(lags >= 0, alpha * (1 - alpha) ** np.maximum(lags, 0), 0.0)
+    return weights @ loads
+
+
+def ratio(acute, chronic):
+    """Element-wise acute:chronic ratio, 0 where the chronic load is 0."""
+    return np.divide(acute, chronic, out=np.zeros_like(acute, dtype=float), where=chronic > 0)
+
+
+def monotony(loads, window):
+    """Mean / sample std of the last ``window`` days, 0 when undefined."""
+    recent = loads[-window:]
+    mean = recent.mean(axis=0)
+    std = recent.std(axis=0, ddof=1) if window > 1 else np.zeros(loads.shape[1])
+    return np.divide(mean, std, out=np.zeros_like(mean), where=std > 0)
+
+
+def weekly_totals(loads, weeks):
+    """Sum of the last ``weeks`` 7-day blocks, oldest first, shape (weeks, series)."""
+    recent = loads[-weeks * 7:]
+    return recent.reshape(weeks, 7, loads.shape[1]).sum(axis=1)
+
+
+def risk_zone(acwr):
+    """Map an ACWR value to (risk, label, color)."""
+    if acwr < 0.8:
+        return "undertraining", "Sottoallenamento", "blue"
+    if acwr <= 1.3:
+        return "optimal", "Zona ottimale", "green"
+    if acwr <= 1.5:
+        return "caution", "Attenzione", "yellow"
+    return "danger", "Pericolo sovraccarico", "red"
+
+
+def load_metrics(loads, acute_days, chronic_days):
+    """ACWR (rolling and EWMA), monotony and strain for each series in ``loads``.
+
+    ``loads`` must cover at least ``chronic_days`` days, ending today.
+    """
+    acute_total = loads[-acute_days:].sum(axis=0)
+    chronic_total = loads[-chronic_days:].sum(axis=0)
+
+    acwr = ratio(rolling_mean(loads, acute_days)[-1], rolling_mean(loads, chronic_days)[-1])
+    acwr_ewma = ratio(ewma(loads, acute_days)[-1], ewma(loads, chronic_days)[-1])
+
+    mono = monotony(loads, acute_days)
+    # Monotony is only meaningful when there was some load in the window
+    mono = np.where(acute_total > 0, mono, 0)
+
+    return {
+        "acute_total": acute_total,
+        "chronic_total": chronic_total,
+        "acwr": acwr,
+        "acwr_ewma": acwr_ewma,
+        "monotony": mono,
+        "strain": acute_total * mono,
+    }
+
+
+def history_start(today, chronic_days, trend_weeks):
+    """First day needed for the chronic window, the weekly trend and EWMA warm-up."""
+    days = max(2 * chronic_days, trend_weeks * 7)
+    return today - timedelta(days=days - 1)
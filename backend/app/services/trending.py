@@ -0,0 +1,94 @@
+"""
+Trending score for community discover (/api/community/discover).
+
+    trending_score = log10(max(likes + 2·comments + 3·saves, 1))
+                     + (created_at - EPOCH) / DECAY_SECONDS
+
+Each ``DECAY_SECONDS`` of age costs a post as much as dividing its
+engagement by ten, so a day-old post needs ten times the likes of a fresh
+one to rank level with it. The age term is fixed at creation: rather than
+lowering old scores over time, every newer post simply starts higher. Stored
+scores therefore never go stale, nothing has to rewrite them periodically,
+and discover is a range scan on ``(sport, trending_score, id)``.
+
+Posts are scored on insert, and ``post_counters`` updates the score in the
+same UPDATE that changes a counter. ``rescore`` recomputes every score, after
+changing the weights or ``DECAY_SECONDS`` (``flask feed rescore``).
+"""
+
+import math
+import sqlite3
+from datetime import datetime
+
+from sqlalchemy import case, event, func, select
+from sqlalchemy.engine import Engine
+
+from app import db
+from app.models.community import Post
+
+WEIGHTS = {"likes_count": 1, "comments_count": 2, "saves_count": 3}
+EPOCH = datetime(2025, 1, 1)
+DECAY_SECONDS = 24 * 3600
+
+
+def score(likes, comments, saves, created_at):
+    engagement = (likes or 0) + 2 * (comments or 0) + 3 * (saves or 0)
+    return math.log10(max(engagement, 1)) + (created_at - EPOCH).total_seconds() / DECAY_SECONDS
+
+
+@event.listens_for(Post, "before_insert")
+def _score_new_post(mapper, connection, post):
+    if post.created_at is None:
+        post.created_at = datetime.utcnow()
+    post.trending_score = score(post.likes_count, post.comments_count, post.saves_count, post.created_at)
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_log(dbapi_connection, connection_record):
+    """Provide ``log(x)`` (base 10, as in PostgreSQL) on SQLite builds without math functions."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    try:
+        dbapi_connection.execute("SELECT log(10)")
+    except sqlite3.OperationalError:
+        dbapi_connection.create_function("log", 1, math.log10, deterministic=True)
+
+
+# ── Incremental updates ───────────────────────────────────────────────
+
+def _engagement(values):
+    total = sum(weight * func.coalesce(values[column], 0) for column, weight in WEIGHTS.items())
+    return func.log(case((total < 1, 1), else_=total))
+
+
+def rescored(new_values):
+    """SQL for ``trending_score`` once the counters in ``new_values`` are SET.
+
+    ``new_values`` maps counter names to the expressions assigned to them in
+    the same UPDATE; counters missing from it keep their value. The age term
+    is carried over from the current score, so no date arithmetic is needed.
+    """
+    old = {column: getattr(Post, column) for column in WEIGHTS}
+    new = {**old, **new_values}
+    return Post.trending_score - _engagement(old) + _engagement(new)
+
+
+# ── Maintenance ───────────────────────────────────────────────────────
+
+def rescore():
+    """Recompute every post's score from its counters. Returns posts updated."""
+    posts = db.session.execute(select(
+        Post.id, Post.likes_count, Post.comments_count, Post.saves_count, Post.created_at, Post.trending_score,
+    ))
+    updates = []
+    for post_id, likes, comments, saves, created_at, current in posts:
+        value = score(likes, comments, saves, created_at or EPOCH)
+        if current is None or abs(value - current) > 1e-9:
+            updates.append({"post_id": post_id, "score": value})
+    if updates:
+        table = Post.__table__
+        db.session.execute(
+            table.update().where(table.c.id == db.bindparam("post_id")).values(trending_score=db.bindparam("score")),
+            updates,
+        )
+    return len(updates)
@@ -1,17 +1,73 @@
 from functools import wraps
-from flask import jsonify
+
+from flask import g, has_app_context, jsonify
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event, select
+
+from app import db
+from app.models.team import Team
 from app.models.user import User
 
 
 def coach_required(f):
-    """Decorator that ensures the current user exists and returns user object."""
+    """Decorator that ensures the current user exists and returns user object.
+
+    The user is loaded once per request and kept on ``g.user``.
+    """
     @wraps(f)
     def decorated(*args, **kwargs):
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({"error": "User not found"}), 404
+        user = g.get("user")
+        if user is None:
+            verify_jwt_in_request()
+            user = db.session.get(User, int(get_jwt_identity()))
+            if not user:
+                return jsonify({"error": "User not found"}), 404
+            g.user = user
         return f(user, *args, **kwargs)
     return decorated
+
+
+# ── Team ownership ────────────────────────────────────────────────────
+# A coach's team ids are loaded once per request (memoized on ``g``) and
+# ownership checks are set lookups. Nothing is cached across requests: team
+# ids are reused (SQLite reassigns the highest id once its team is deleted),
+# so ids remembered from an earlier request could point at another coach's
+# new team. Team mapper events clear the memo when a request creates,
+# reassigns or deletes a team.
+
+
+def owned_team_ids(user):
+    """Ids of the teams ``user`` coaches, as a frozenset (loaded once per request)."""
+    team_ids = g.get("owned_team_ids", {}).get(user.id)
+    if team_ids is None:
+        team_ids = frozenset(db.session.scalars(select(Team.id).where(Team.coach_id == user.id)))
+        g.setdefault("owned_team_ids", {})[user.id] = team_ids
+    return team_ids
+
+
+def owns_team(user, team_id):
+    try:
+        team_id = int(team_id)
+    except (TypeError, ValueError):
+        return False
+    return team_id in owned_team_ids(user)
+
+
+def get_owned_team(user, team_id):
+    """The team if ``user`` coaches it, else None."""
+    return db.session.get(Team, int(team_id)) if owns_team(user, team_id) else None
+
+
+def invalidate_team_ids(coach_id):
+    if has_app_context():
+        g.get("owned_team_ids", {}).pop(coach_id, None)
+
+
+@event.listens_for(Team, "after_insert")
+@event.listens_for(Team, "after_update")
+@event.listens_for(Team, "after_delete")
+def _team_changed(mapper, connection, team):
+    invalidate_team_ids(team.coach_id)
+    history = db.inspect(team).attrs.coach_id.history
+    for previous in history.deleted or ():
+        invalidate_team_ids(previous)
@@ -0,0 +1,86 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the sort key of the last row of
+a page. The next page is fetched with a WHERE clause on that key instead of an
+OFFSET, so deep pages cost the same as the first one and rows inserted in the
+meantime do not shift the window.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+MAX_PER_PAGE = 100
+
+# Types a decoded cursor value may have (datetimes are decoded from {"dt": ...})
+VALUE_TYPES = (str, int, float, datetime, type(None))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Encode a tuple of sort-key values (ints, floats, strings, datetimes)."""
+    payload = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, size):
+    """Decode a cursor produced by ``encode_cursor``; raise InvalidCursor if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list):
+            raise ValueError("Cursor payload is not a list")
+        values = [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+    if len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    # A hand-crafted cursor must not smuggle lists or objects into the WHERE clause
+    if any(isinstance(v, bool) or not isinstance(v, VALUE_TYPES) for v in values):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def after(columns, values):
+    """Filter selecting rows strictly after ``values`` in DESC order of ``columns``.
+
+    Expands ``(a, b, c) < (x, y, z)`` into ``a < x OR (a = x AND b < y) OR ...``
+    which every backend can evaluate with a composite index.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column < values[i]))
+    return or_(*clauses)
+
+
+def paginate(query, columns, cursor=None, per_page=20):
+    """Apply keyset ordering/filtering to ``query``.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    ``columns`` are ORM attributes and define a DESC sort key that must be
+    unique (end it with the primary key).
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    if cursor:
+        query = query.filter(after(columns, decode_cursor(cursor, len(columns))))
+
+    rows = query.order_by(*[c.desc() for c in columns]).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
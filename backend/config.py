@@ -14,6 +14,52 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
+    # Shared OpenAI client: OPENAI_BASE_URL points it at a compatible server
+    # (e.g. a local stub); timeouts in seconds
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "60"))
+    AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+
+    # Content-addressed cache of AI completions (TTL in seconds, LRU beyond max entries)
+    AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))
+    AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000"))
+
+    # Background AI report generation: thread pool size per worker process;
+    # AI_JOBS_EAGER runs jobs inline in the request instead (debugging)
+    AI_JOB_WORKERS = int(os.getenv("AI_JOB_WORKERS", "4"))
+    AI_JOBS_EAGER = os.getenv("AI_JOBS_EAGER", "false").lower() == "true"
+    # Parallel AI calls within one batch job (e.g. a team's weekly summaries)
+    AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+
+    # Community feed: fan-out-on-write timelines (falls back to fan-out-on-read
+    # for authors with more followers than FEED_FANOUT_MAX_FOLLOWERS)
+    FEED_FANOUT = os.getenv("FEED_FANOUT", "false").lower() == "true"
+    FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", "1000"))
+    FEED_FANOUT_BACKFILL = int(os.getenv("FEED_FANOUT_BACKFILL", "50"))
+
+    # Post like/comment/save counters: SQL increments in the request by default;
+    # write-behind coalesces them per post and flushes every interval (seconds)
+    POST_COUNTERS_WRITE_BEHIND = os.getenv("POST_COUNTERS_WRITE_BEHIND", "false").lower() == "true"
+    POST_COUNTERS_FLUSH_INTERVAL = float(os.getenv("POST_COUNTERS_FLUSH_INTERVAL", "1.0"))
+
+    # Real-time chat: memory:// for a single worker process, local:///some/dir
+    # for several on one host, redis://... for workers on several hosts
+    CHAT_BROKER_URL = os.getenv("CHAT_BROKER_URL", "memory://")
+    CHAT_STREAM_HEARTBEAT = int(os.getenv("CHAT_STREAM_HEARTBEAT", "15"))
+    CHAT_STREAM_MAX_SECONDS = int(os.getenv("CHAT_STREAM_MAX_SECONDS", "300"))
+
+    # Per-request query/latency instrumentation: Server-Timing headers, slow
+    # request and N+1 logging, Prometheus metrics at /api/_metrics (optionally
+    # behind "Authorization: Bearer METRICS_TOKEN")
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "false").lower() == "true"
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -23,8 +69,15 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    JWT_SECRET_KEY = "test-jwt-secret-key-long-enough-for-hs256"
+
+
 config = {
     "development": DevelopmentConfig,
     "production": ProductionConfig,
+    "testing": TestingConfig,
     "default": DevelopmentConfig,
 }
@@ -90,9 +90,24 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # The full-text search and coach name indexes live outside the models
+    # (FTS5 tables and their shadow tables on SQLite, generated tsvector
+    # column and trigram index on PostgreSQL), so keep autogenerate from
+    # proposing to drop them
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == "table" and name.startswith(("search_fts", "user_names_fts")):
+            return False
+        if type_ == "column" and name == "search_vector":
+            return False
+        if type_ == "index" and name in ("ix_search_documents_vector", "ix_users_search_name_trgm"):
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
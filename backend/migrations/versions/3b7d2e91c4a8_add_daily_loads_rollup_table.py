@@ -0,0 +1,54 @@
+"""add daily_loads rollup table
+
+Revision ID: 3b7d2e91c4a8
+Revises: 5f0a3da2b09d
+Create Date: 2026-10-16 09:12:44.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d2e91c4a8'
+down_revision = '5f0a3da2b09d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_loads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('athlete_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('load', sa.Float(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('sessions', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['athlete_id'], ['athletes.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('athlete_id', 'date', name='uq_daily_load_athlete_date')
+    )
+    with op.batch_alter_table('daily_loads', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_loads_team_id_date', ['team_id', 'date'], unique=False)
+
+    # Backfill from existing attendance (same formula as app.services.load_rollup)
+    op.execute("""
+        INSERT INTO daily_loads (athlete_id, team_id, date, load, minutes, sessions)
+        SELECT a.athlete_id, s.team_id, s.date,
+               SUM(COALESCE(a.rpe, 5) * COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               SUM(COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               COUNT(a.id)
+        FROM attendances a
+        JOIN training_sessions s ON s.id = a.training_session_id
+        GROUP BY a.athlete_id, s.team_id, s.date
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('daily_loads', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_loads_team_id_date')
+
+    op.drop_table('daily_loads')
@@ -0,0 +1,58 @@
+"""key daily loads by athlete and add session load
+
+Revision ID: a4c8e2f61b39
+Revises: f7d20b6c93a1
+Create Date: 2026-10-17 16:05:27.740152
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e2f61b39'
+down_revision = 'f7d20b6c93a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('daily_loads', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_loads_team_id_date')
+        batch_op.drop_column('team_id')
+        batch_op.add_column(sa.Column('session_load', sa.Float(), nullable=False, server_default='0'))
+
+    # Rows were grouped per team too; recompute them per athlete and day
+    # (same formula as app.services.load_rollup)
+    op.execute("DELETE FROM daily_loads")
+    op.execute("""
+        INSERT INTO daily_loads (athlete_id, date, load, session_load, minutes, sessions)
+        SELECT a.athlete_id, s.date,
+               SUM(COALESCE(a.rpe, 5) * COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               SUM(COALESCE(a.rpe, 5) * COALESCE(s.duration_minutes, 60)),
+               SUM(COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               COUNT(a.id)
+        FROM attendances a
+        JOIN training_sessions s ON s.id = a.training_session_id
+        GROUP BY a.athlete_id, s.date
+    """)
+
+
+def downgrade():
+    op.execute("DELETE FROM daily_loads")
+    with op.batch_alter_table('daily_loads', schema=None) as batch_op:
+        batch_op.drop_column('session_load')
+        batch_op.add_column(sa.Column('team_id', sa.Integer(), nullable=False))
+        batch_op.create_foreign_key('fk_daily_loads_team_id_teams', 'teams', ['team_id'], ['id'])
+        batch_op.create_index('ix_daily_loads_team_id_date', ['team_id', 'date'], unique=False)
+
+    op.execute("""
+        INSERT INTO daily_loads (athlete_id, team_id, date, load, minutes, sessions)
+        SELECT a.athlete_id, s.team_id, s.date,
+               SUM(COALESCE(a.rpe, 5) * COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               SUM(COALESCE(a.minutes_trained, s.duration_minutes, 60)),
+               COUNT(a.id)
+        FROM attendances a
+        JOIN training_sessions s ON s.id = a.training_session_id
+        GROUP BY a.athlete_id, s.team_id, s.date
+    """)
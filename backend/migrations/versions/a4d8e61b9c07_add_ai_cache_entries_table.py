@@ -0,0 +1,42 @@
+"""add ai_cache_entries table
+
+Revision ID: a4d8e61b9c07
+Revises: f3b9c27e5a14
+Create Date: 2026-10-16 16:10:05.377214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d8e61b9c07'
+down_revision = 'f3b9c27e5a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_cache_entries',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=50), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('ai_cache_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ai_cache_entries_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ai_cache_entries_last_used_at'), ['last_used_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ai_cache_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ai_cache_entries_last_used_at'))
+        batch_op.drop_index(batch_op.f('ix_ai_cache_entries_expires_at'))
+
+    op.drop_table('ai_cache_entries')
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: a91f4c27d350
+Revises: 3b7d2e91c4a8
+Create Date: 2026-10-16 10:03:21.554872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91f4c27d350'
+down_revision = '3b7d2e91c4a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_author_created_id', ['author_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_sport_likes_created_id', ['sport', 'likes_count', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_messages_pair_created_id', ['sender_id', 'receiver_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_messages_pair_created_id')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_sport_likes_created_id')
+        batch_op.drop_index('ix_posts_author_created_id')
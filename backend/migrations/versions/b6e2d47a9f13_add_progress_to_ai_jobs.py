@@ -0,0 +1,26 @@
+"""add progress to ai_jobs
+
+Revision ID: b6e2d47a9f13
+Revises: a4d8e61b9c07
+Create Date: 2026-10-16 18:04:12.530981
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d47a9f13'
+down_revision = 'a4d8e61b9c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ai_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('progress', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ai_jobs', schema=None) as batch_op:
+        batch_op.drop_column('progress')
@@ -0,0 +1,45 @@
+"""add timeline_entries table
+
+Revision ID: c52e8b0f19d4
+Revises: a91f4c27d350
+Create Date: 2026-10-16 11:20:08.907316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e8b0f19d4'
+down_revision = 'a91f4c27d350'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('timeline_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('sport', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'post_id', name='uq_timeline_entry')
+    )
+    with op.batch_alter_table('timeline_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_timeline_entries_post_id'), ['post_id'], unique=False)
+        batch_op.create_index('ix_timeline_entries_user_sport_created', ['user_id', 'sport', 'created_at', 'post_id'], unique=False)
+        batch_op.create_index('ix_timeline_entries_user_author', ['user_id', 'author_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('timeline_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeline_entries_user_author')
+        batch_op.drop_index('ix_timeline_entries_user_sport_created')
+        batch_op.drop_index(batch_op.f('ix_timeline_entries_post_id'))
+
+    op.drop_table('timeline_entries')
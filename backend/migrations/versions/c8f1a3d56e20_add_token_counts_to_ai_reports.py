@@ -0,0 +1,30 @@
+"""add token counts to ai_reports
+
+Revision ID: c8f1a3d56e20
+Revises: b6e2d47a9f13
+Create Date: 2026-10-17 09:41:27.118604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f1a3d56e20'
+down_revision = 'b6e2d47a9f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ai_reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('completion_tokens', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('raw_prompt_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ai_reports', schema=None) as batch_op:
+        batch_op.drop_column('raw_prompt_tokens')
+        batch_op.drop_column('completion_tokens')
+        batch_op.drop_column('prompt_tokens')
@@ -0,0 +1,37 @@
+"""add community counters to users
+
+Revision ID: d2a7c94e1b58
+Revises: c8f1a3d56e20
+Create Date: 2026-10-17 11:02:45.390117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c94e1b58'
+down_revision = 'c8f1a3d56e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('followers_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('following_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('posts_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute("""
+        UPDATE users SET
+            followers_count = (SELECT COUNT(*) FROM follows f WHERE f.following_id = users.id),
+            following_count = (SELECT COUNT(*) FROM follows f WHERE f.follower_id = users.id),
+            posts_count = (SELECT COUNT(*) FROM posts p WHERE p.author_id = users.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('posts_count')
+        batch_op.drop_column('following_count')
+        batch_op.drop_column('followers_count')
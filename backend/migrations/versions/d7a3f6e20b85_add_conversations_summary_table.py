@@ -0,0 +1,77 @@
+"""add conversations summary table
+
+Revision ID: d7a3f6e20b85
+Revises: c52e8b0f19d4
+Create Date: 2026-10-16 12:41:37.220591
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3f6e20b85'
+down_revision = 'c52e8b0f19d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('conversations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_a_id', sa.Integer(), nullable=False),
+    sa.Column('user_b_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('last_activity_at', sa.DateTime(), nullable=False),
+    sa.Column('unread_a', sa.Integer(), nullable=False),
+    sa.Column('unread_b', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['last_message_id'], ['chat_messages.id'], ),
+    sa.ForeignKeyConstraint(['user_a_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_b_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_a_id', 'user_b_id', name='uq_conversation_pair')
+    )
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.create_index('ix_conversations_user_a_activity', ['user_a_id', 'last_activity_at', 'id'], unique=False)
+        batch_op.create_index('ix_conversations_user_b_activity', ['user_b_id', 'last_activity_at', 'id'], unique=False)
+
+    # Backfill one row per accepted chat request
+    op.execute("""
+        INSERT INTO conversations (user_a_id, user_b_id, last_message_id, last_message_at,
+                                   last_activity_at, unread_a, unread_b, created_at)
+        SELECT p.a, p.b,
+               (SELECT m.id FROM chat_messages m
+                 WHERE (m.sender_id = p.a AND m.receiver_id = p.b)
+                    OR (m.sender_id = p.b AND m.receiver_id = p.a)
+                 ORDER BY m.created_at DESC, m.id DESC LIMIT 1),
+               (SELECT MAX(m.created_at) FROM chat_messages m
+                 WHERE (m.sender_id = p.a AND m.receiver_id = p.b)
+                    OR (m.sender_id = p.b AND m.receiver_id = p.a)),
+               COALESCE((SELECT MAX(m.created_at) FROM chat_messages m
+                          WHERE (m.sender_id = p.a AND m.receiver_id = p.b)
+                             OR (m.sender_id = p.b AND m.receiver_id = p.a)),
+                        p.created_at, CURRENT_TIMESTAMP),
+               (SELECT COUNT(*) FROM chat_messages m
+                 WHERE m.sender_id = p.b AND m.receiver_id = p.a AND m.read = false),
+               (SELECT COUNT(*) FROM chat_messages m
+                 WHERE m.sender_id = p.a AND m.receiver_id = p.b AND m.read = false),
+               p.created_at
+        FROM (
+            SELECT CASE WHEN from_user_id < to_user_id THEN from_user_id ELSE to_user_id END AS a,
+                   CASE WHEN from_user_id < to_user_id THEN to_user_id ELSE from_user_id END AS b,
+                   MIN(created_at) AS created_at
+            FROM chat_requests
+            WHERE status = 'accepted'
+            GROUP BY 1, 2
+        ) p
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_index('ix_conversations_user_b_activity')
+        batch_op.drop_index('ix_conversations_user_a_activity')
+
+    op.drop_table('conversations')
@@ -0,0 +1,83 @@
+"""add search name to users
+
+Revision ID: e5c31b8f07d4
+Revises: d2a7c94e1b58
+Create Date: 2026-10-17 12:18:09.204551
+
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c31b8f07d4'
+down_revision = 'd2a7c94e1b58'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE user_names_fts USING fts5(
+        search_name, content='users', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER users_search_name_ai AFTER INSERT ON users BEGIN
+        INSERT INTO user_names_fts(rowid, search_name) VALUES (new.id, new.search_name);
+    END""",
+    """CREATE TRIGGER users_search_name_ad AFTER DELETE ON users BEGIN
+        INSERT INTO user_names_fts(user_names_fts, rowid, search_name) VALUES ('delete', old.id, old.search_name);
+    END""",
+    """CREATE TRIGGER users_search_name_au AFTER UPDATE OF search_name ON users BEGIN
+        INSERT INTO user_names_fts(user_names_fts, rowid, search_name) VALUES ('delete', old.id, old.search_name);
+        INSERT INTO user_names_fts(rowid, search_name) VALUES (new.id, new.search_name);
+    END""",
+]
+
+POSTGRES_TRGM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_users_search_name_trgm ON users USING GIN (search_name gin_trgm_ops)",
+]
+
+
+def _fold(value):
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.lower().split()) or None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_name', sa.String(length=201), nullable=True))
+        batch_op.create_index('ix_users_search_name', ['search_name'], unique=False)
+        batch_op.create_index('ix_users_sport_followers', ['sport', 'followers_count'], unique=False)
+
+    # Accent folding has no portable SQL spelling, so the backfill runs here
+    bind = op.get_bind()
+    users = bind.execute(sa.text("SELECT id, first_name, last_name FROM users")).all()
+    if users:
+        bind.execute(sa.text("UPDATE users SET search_name = :name WHERE id = :id"), [
+            {"id": user_id, "name": _fold(f"{first or ''} {last or ''}")} for user_id, first, last in users
+        ])
+
+    setup = {'sqlite': SQLITE_FTS, 'postgresql': POSTGRES_TRGM}.get(bind.dialect.name, [])
+    for statement in setup:
+        op.execute(statement)
+    if bind.dialect.name == 'sqlite':
+        op.execute("INSERT INTO user_names_fts(user_names_fts) VALUES ('rebuild')")
+        op.execute("ANALYZE users")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('users_search_name_ai', 'users_search_name_ad', 'users_search_name_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS user_names_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_users_search_name_trgm")
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_sport_followers')
+        batch_op.drop_index('ix_users_search_name')
+        batch_op.drop_column('search_name')
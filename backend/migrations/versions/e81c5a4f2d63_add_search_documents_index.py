@@ -0,0 +1,116 @@
+"""add search documents full-text index
+
+Revision ID: e81c5a4f2d63
+Revises: d7a3f6e20b85
+Create Date: 2026-10-16 14:05:12.483120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81c5a4f2d63'
+down_revision = 'd7a3f6e20b85'
+branch_labels = None
+depends_on = None
+
+
+def _concat(*columns):
+    return " || ' ' || ".join(f"COALESCE({c}, '')" for c in columns)
+
+
+# entity_type, source table, coach_id expression, joins, parent_id, title, body
+BACKFILL = [
+    ('athlete', 'athletes s', 't.coach_id', 'JOIN teams t ON t.id = s.team_id', 'NULL',
+     _concat('s.first_name', 's.last_name'),
+     _concat('s.position', 's.secondary_position', 's.notes')),
+    ('training', 'training_sessions s', 't.coach_id', 'JOIN teams t ON t.id = s.team_id', 'NULL',
+     's.title',
+     _concat('s.objectives', 's.what_worked', 's.what_to_improve', 's.template_name')),
+    ('training_block', 'training_blocks s', 't.coach_id',
+     'JOIN training_sessions ts ON ts.id = s.session_id JOIN teams t ON t.id = ts.team_id', 's.session_id',
+     's.name',
+     _concat('s.objective', 's.description', 's.coaching_points', 's.variations')),
+    ('match', 'matches s', 't.coach_id', 'JOIN teams t ON t.id = s.team_id', 'NULL',
+     _concat('s.opponent', 's.competition'),
+     _concat('s.venue', 's.what_worked', 's.what_didnt_work', 's.key_moments')),
+    ('note', 'notes s', 's.coach_id', '', 'NULL',
+     'NULL',
+     _concat('s.text', 's.tags')),
+    ('ai_report', 'ai_reports s', 's.coach_id', '', 'NULL',
+     's.title',
+     's.content'),
+]
+
+
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE search_fts USING fts5(
+        title, body,
+        content='search_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+POSTGRES_FTS = [
+    """ALTER TABLE search_documents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('italian', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('italian', coalesce(body, '')), 'B')
+        ) STORED""",
+    "CREATE INDEX ix_search_documents_vector ON search_documents USING GIN (search_vector)",
+]
+
+
+def upgrade():
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('coach_id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.Text(), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['coach_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_document_entity')
+    )
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.create_index('ix_search_documents_coach_type', ['coach_id', 'entity_type'], unique=False)
+
+    # Full-text index (FTS5 table + triggers on SQLite, tsvector + GIN on PostgreSQL)
+    dialect = op.get_bind().dialect.name
+    setup = {'sqlite': SQLITE_FTS, 'postgresql': POSTGRES_FTS}.get(dialect, [])
+    for statement in setup:
+        op.execute(statement)
+
+    for entity_type, source, coach_id, joins, parent_id, title, body in BACKFILL:
+        op.execute(f"""
+            INSERT INTO search_documents (coach_id, entity_type, entity_id, parent_id, title, body, updated_at)
+            SELECT {coach_id}, '{entity_type}', s.id, {parent_id}, {title}, {body}, CURRENT_TIMESTAMP
+            FROM {source} {joins}
+        """)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('search_documents_ai', 'search_documents_ad', 'search_documents_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS search_fts")
+
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_documents_coach_type')
+
+    op.drop_table('search_documents')
@@ -0,0 +1,46 @@
+"""add ai_jobs table
+
+Revision ID: f3b9c27e5a14
+Revises: e81c5a4f2d63
+Create Date: 2026-10-16 15:22:48.910342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9c27e5a14'
+down_revision = 'e81c5a4f2d63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('coach_id', sa.Integer(), nullable=False),
+    sa.Column('job_type', sa.String(length=50), nullable=False),
+    sa.Column('params', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('report_id', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['coach_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['report_id'], ['ai_reports.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ai_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_ai_jobs_coach_created', ['coach_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_ai_jobs_status', ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ai_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_ai_jobs_status')
+        batch_op.drop_index('ix_ai_jobs_coach_created')
+
+    op.drop_table('ai_jobs')
@@ -0,0 +1,56 @@
+"""add trending score to posts
+
+Revision ID: f7d20b6c93a1
+Revises: e5c31b8f07d4
+Create Date: 2026-10-17 14:36:52.118304
+
+"""
+import math
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7d20b6c93a1'
+down_revision = 'e5c31b8f07d4'
+branch_labels = None
+depends_on = None
+
+
+EPOCH = datetime(2025, 1, 1)
+DECAY_SECONDS = 24 * 3600
+
+
+def _score(likes, comments, saves, created_at):
+    engagement = (likes or 0) + 2 * (comments or 0) + 3 * (saves or 0)
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    age = ((created_at or EPOCH) - EPOCH).total_seconds()
+    return math.log10(max(engagement, 1)) + age / DECAY_SECONDS
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trending_score', sa.Float(), nullable=False, server_default='0'))
+        batch_op.drop_index('ix_posts_sport_likes_created_id')
+        batch_op.create_index('ix_posts_sport_trending_id', ['sport', 'trending_score', 'id'], unique=False)
+
+    # Same formula as app.services.trending.score
+    bind = op.get_bind()
+    posts = bind.execute(sa.text(
+        "SELECT id, likes_count, comments_count, saves_count, created_at FROM posts"
+    )).all()
+    if posts:
+        bind.execute(sa.text("UPDATE posts SET trending_score = :score WHERE id = :id"), [
+            {"id": post_id, "score": _score(likes, comments, saves, created_at)}
+            for post_id, likes, comments, saves, created_at in posts
+        ])
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_sport_trending_id')
+        batch_op.create_index('ix_posts_sport_likes_created_id', ['sport', 'likes_count', 'created_at', 'id'], unique=False)
+        batch_op.drop_column('trending_score')
@@ -0,0 +1,168 @@
+"""Shared fixtures: an app on a fresh in-memory SQLite database per test.
+
+No app context stays pushed while a test runs, so every test-client request
+gets its own ``g`` (``coach_required`` caches the user there). Set up data
+inside ``with app.app_context():`` blocks and pass ids around.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.models.team import Team
+from app.models.training import TrainingSession
+from app.models.user import User
+from app.seed.benchmark import _QueryCounter
+from config import TestingConfig
+
+
+@pytest.fixture
+def database_uri():
+    """Override in a test module to run on a SQLite file, e.g. for concurrent requests."""
+    return "sqlite://"
+
+
+@pytest.fixture
+def app(database_uri, monkeypatch):
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", database_uri)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    counter = iter(range(1, 10_000))
+
+    def make_user(sport="football", first_name="Mario", last_name="Rossi"):
+        with app.app_context():
+            user = User(
+                email=f"coach{next(counter)}@example.test", first_name=first_name, last_name=last_name,
+                sport=sport, onboarding_completed=True,
+            )
+            user.set_password("password")
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def make_team(app):
+    def make_team(coach_id, name="Under 16", sport="football"):
+        with app.app_context():
+            team = Team(coach_id=coach_id, name=name, sport=sport)
+            db.session.add(team)
+            db.session.commit()
+            return team.id
+    return make_team
+
+
+@pytest.fixture
+def add_sessions(app):
+    """Add ``count`` training sessions to a team, one per day going back from today."""
+    def add_sessions(team_id, count, **fields):
+        with app.app_context():
+            existing = TrainingSession.query.filter_by(team_id=team_id).count()
+            db.session.add_all([
+                TrainingSession(team_id=team_id, date=date.today() - timedelta(days=existing + i), **fields)
+                for i in range(count)
+            ])
+            db.session.commit()
+    return add_sessions
+
+
+@pytest.fixture
+def auth_headers(app):
+    def auth_headers(user_id):
+        with app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+    return auth_headers
+
+
+@pytest.fixture
+def count_queries(app):
+    """``with count_queries() as counter:`` counts the SQL statements run inside the block."""
+    @contextmanager
+    def count_queries():
+        with app.app_context():
+            engine = db.engine
+        with _QueryCounter(engine) as counter:
+            yield counter
+    return count_queries
+
+
+class StubLLM:
+    """A local OpenAI-compatible server answering ``/v1/chat/completions``.
+
+    ``status`` and ``content`` set the next answers; ``requests`` records the
+    JSON bodies received.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.content = "Report di prova"
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+                if stub.status != 200:
+                    payload = {"error": {"message": "stub failure", "type": "server_error"}}
+                else:
+                    payload = {
+                        "id": "chatcmpl-stub", "object": "chat.completion", "created": 0,
+                        "model": body["model"],
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": stub.content}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                    }
+                data = json.dumps(payload).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_llm(app):
+    """Point the app's AI client at a ``StubLLM``; jobs run inline, without the AI cache."""
+    stub = StubLLM()
+    app.config.update(
+        OPENAI_API_KEY="test-key", OPENAI_BASE_URL=stub.base_url, AI_MAX_RETRIES=0,
+        AI_JOBS_EAGER=True, AI_CACHE_ENABLED=False,
+    )
+    yield stub
+    client = app.extensions.pop("ai_client", None)
+    if client:
+        client.close()
+    stub.close()
@@ -0,0 +1,125 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from app.models.ai_cache import AICacheEntry
+from app.models.athlete import Athlete
+from app.models.note import Note
+from app.models.training import TrainingSession
+from app.services import ai_cache
+
+
+@pytest.fixture
+def database_uri(tmp_path):
+    # A file, so a second connection would really contend for SQLite's write lock
+    return f"sqlite:///{tmp_path / 'app.db'}"
+
+
+@pytest.fixture
+def cached_llm(app, stub_llm):
+    app.config.update(AI_CACHE_ENABLED=True)
+    return stub_llm
+
+
+def _entry(key):
+    return db.session.get(AICacheEntry, key)
+
+
+def _generate(app, client, make_user, make_team, auth_headers):
+    coach_id = make_user()
+    with app.app_context():
+        session = TrainingSession(team_id=make_team(coach_id), date=date.today(), title="Pressing alto")
+        db.session.add(session)
+        db.session.commit()
+        session_id = session.id
+
+    def generate(force=False):
+        response = client.post("/api/ai/generate/post-training", headers=auth_headers(coach_id),
+                               json={"session_id": session_id, "force": force})
+        assert response.status_code == 202
+        result = client.get(f"/api/ai/jobs/{response.json['job']['id']}/result", headers=auth_headers(coach_id))
+        assert result.status_code == 200
+        return result.json["report"]
+    return generate
+
+
+def test_identical_request_is_served_from_the_cache(app, client, cached_llm, make_user, make_team, auth_headers):
+    generate = _generate(app, client, make_user, make_team, auth_headers)
+
+    first, second = generate(), generate()
+
+    assert len(cached_llm.requests) == 1
+    assert second["content"] == first["content"] == "Report di prova"
+    with app.app_context():
+        assert AICacheEntry.query.one().hits == 1
+
+
+def test_force_bypasses_the_cache(app, client, cached_llm, make_user, make_team, auth_headers):
+    generate = _generate(app, client, make_user, make_team, auth_headers)
+    generate()
+    cached_llm.content = "Report rigenerato"
+
+    assert generate(force=True)["content"] == "Report rigenerato"
+    assert len(cached_llm.requests) == 2
+
+
+def test_expired_entries_are_misses(app):
+    with app.app_context():
+        ai_cache.put("k", "gpt-4o-mini", "contenuto")
+        db.session.commit()
+        assert ai_cache.get("k")["content"] == "contenuto"
+
+        db.session.execute(update(AICacheEntry).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        assert ai_cache.get("k") is None
+
+        # Writing the next entry evicts it
+        ai_cache.put("other", "gpt-4o-mini", "altro")
+        db.session.commit()
+        assert _entry("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(app):
+    app.config["AI_CACHE_MAX_ENTRIES"] = 2
+    with app.app_context():
+        ai_cache.put("old", "gpt-4o-mini", "a")
+        ai_cache.put("used", "gpt-4o-mini", "b")
+        db.session.execute(update(AICacheEntry).values(last_used_at=datetime.utcnow() - timedelta(hours=1)))
+        assert ai_cache.get("used") is not None
+
+        ai_cache.put("new", "gpt-4o-mini", "c")
+        db.session.commit()
+
+        assert sorted(e.key for e in AICacheEntry.query) == ["new", "used"]
+
+
+def test_cache_writes_join_the_callers_transaction(app, make_user):
+    coach_id = make_user()
+    with app.app_context():
+        # The caller holds SQLite's write lock, as the streaming path does once the report is staged
+        db.session.add(Note(coach_id=coach_id, text="Rivedere il pressing"))
+        db.session.flush()
+
+        ai_cache.put("k", "gpt-4o-mini", "contenuto")
+        assert ai_cache.get("k")["content"] == "contenuto"
+        db.session.commit()
+
+    with app.app_context():
+        assert _entry("k").hits == 1
+
+
+def test_batch_jobs_keep_their_cache_entries(app, client, cached_llm, make_user, make_team, auth_headers):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    with app.app_context():
+        db.session.add_all([
+            Athlete(team_id=team_id, first_name="Luca", last_name=name) for name in ("Bianchi", "Verdi")
+        ])
+        db.session.commit()
+
+    response = client.post("/api/ai/generate/team-weekly", headers=auth_headers(coach_id), json={"team_id": team_id})
+
+    assert response.status_code == 202
+    with app.app_context():
+        assert AICacheEntry.query.count() == 2
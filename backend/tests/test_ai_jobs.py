@@ -0,0 +1,121 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.ai_job import AIJob
+from app.models.ai_report import AIReport
+from app.models.training import TrainingSession
+from app.services import ai_jobs
+
+
+@pytest.fixture
+def session_id(app, make_user, make_team):
+    coach_id = make_user()
+    with app.app_context():
+        session = TrainingSession(team_id=make_team(coach_id), date=date.today(), title="Possesso palla")
+        db.session.add(session)
+        db.session.commit()
+        return session.id
+
+
+def _coach_of(app, session_id):
+    with app.app_context():
+        return db.session.get(TrainingSession, session_id).team.coach_id
+
+
+def _generate(client, auth_headers, coach_id, session_id):
+    return client.post("/api/ai/generate/post-training", headers=auth_headers(coach_id),
+                       json={"session_id": session_id})
+
+
+def _queued_job(app, coach_id, session_id, **fields):
+    with app.app_context():
+        job = AIJob(coach_id=coach_id, job_type="post_training",
+                    params=f'{{"session_id": {session_id}}}', **fields)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def _job(app, job_id):
+    with app.app_context():
+        return db.session.get(AIJob, job_id).to_dict()
+
+
+def test_job_saves_the_report(app, client, stub_llm, auth_headers, session_id):
+    coach_id = _coach_of(app, session_id)
+
+    response = _generate(client, auth_headers, coach_id, session_id)
+    assert response.status_code == 202
+    job_id = response.json["job"]["id"]
+
+    result = client.get(f"/api/ai/jobs/{job_id}/result", headers=auth_headers(coach_id))
+    assert result.status_code == 200
+    assert result.json["report"]["content"] == "Report di prova"
+    assert len(stub_llm.requests) == 1
+    with app.app_context():
+        report = AIReport.query.filter_by(coach_id=coach_id).one()
+        assert report.input_refs == f'{{"training_ids": [{session_id}]}}'
+
+
+def test_provider_error_fails_the_job(app, client, stub_llm, auth_headers, session_id):
+    coach_id = _coach_of(app, session_id)
+    stub_llm.status = 500
+
+    job_id = _generate(client, auth_headers, coach_id, session_id).json["job"]["id"]
+
+    assert _job(app, job_id)["status"] == "failed"
+    result = client.get(f"/api/ai/jobs/{job_id}/result", headers=auth_headers(coach_id))
+    assert result.status_code == 503
+    assert result.json["job"]["error"]
+    with app.app_context():
+        assert AIReport.query.count() == 0
+
+
+def test_running_job_is_not_claimed_again(app, stub_llm, session_id):
+    job_id = _queued_job(app, _coach_of(app, session_id), session_id,
+                         status="running", started_at=datetime.utcnow(), attempts=1)
+
+    with app.app_context():
+        assert ai_jobs._claim(job_id) is False
+        ai_jobs.execute(job_id)
+
+    assert stub_llm.requests == []
+    assert _job(app, job_id)["status"] == "running"
+    assert _job(app, job_id)["attempts"] == 1
+
+
+def test_run_pending_requeues_stale_jobs(app, stub_llm, session_id):
+    coach_id = _coach_of(app, session_id)
+    stale = _queued_job(app, coach_id, session_id, status="running",
+                        started_at=datetime.utcnow() - timedelta(minutes=30), attempts=1)
+    active = _queued_job(app, coach_id, session_id, status="running", started_at=datetime.utcnow(), attempts=1)
+    queued = _queued_job(app, coach_id, session_id)
+
+    with app.app_context():
+        assert ai_jobs.run_pending(stale_after=timedelta(minutes=10)) == 2
+
+    assert _job(app, stale)["status"] == "succeeded"
+    assert _job(app, stale)["attempts"] == 2
+    assert _job(app, queued)["status"] == "succeeded"
+    assert _job(app, active)["status"] == "running"
+    assert len(stub_llm.requests) == 2
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/ai/generate/post-training", "session"),
+    ("/api/ai/generate/team-weekly", "team"),
+])
+def test_generate_without_a_provider_is_refused_up_front(app, client, auth_headers, session_id, path, body):
+    coach_id = _coach_of(app, session_id)
+    with app.app_context():
+        team_id = db.session.get(TrainingSession, session_id).team_id
+    json = {"session_id": session_id} if body == "session" else {"team_id": team_id}
+
+    response = client.post(path, headers=auth_headers(coach_id), json=json)
+
+    assert response.status_code == 503
+    assert response.json == {"error": "AI not configured"}
+    with app.app_context():
+        assert AIJob.query.count() == 0
@@ -0,0 +1,52 @@
+from sqlalchemy import text
+
+from app import db
+from app.models.user import User
+from app.utils.auth import get_owned_team, owns_team
+
+
+def _delete_elsewhere(app, team_id):
+    """Delete a team without mapper events, as another worker process would."""
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM teams WHERE id = :id"), {"id": team_id})
+
+
+def test_reused_team_id_is_not_granted_to_its_previous_coach(app, client, make_user, make_team,
+                                                             auth_headers):
+    first_coach, second_coach = make_user(), make_user()
+    headers = auth_headers(first_coach)
+    team_id = make_team(first_coach)
+    assert client.get(f"/api/teams/{team_id}", headers=headers).status_code == 200
+    assert client.get(f"/api/periodization/?team_id={team_id}", headers=headers).status_code == 200
+
+    _delete_elsewhere(app, team_id)
+    assert make_team(second_coach, name="Other club") == team_id
+
+    assert client.get(f"/api/teams/{team_id}", headers=headers).status_code == 404
+    assert client.get(f"/api/periodization/?team_id={team_id}", headers=headers).status_code == 404
+    assert client.get(f"/api/teams/{team_id}", headers=auth_headers(second_coach)).status_code == 200
+
+
+def test_a_new_team_is_owned_right_away(app, client, make_user, make_team, auth_headers):
+    coach_id = make_user()
+    headers = auth_headers(coach_id)
+    assert client.get("/api/periodization/?team_id=1", headers=headers).status_code == 404
+
+    assert make_team(coach_id) == 1
+    assert client.get("/api/periodization/?team_id=1", headers=headers).status_code == 200
+
+
+def test_ownership_checks_share_one_query_per_request(app, make_user, make_team, count_queries):
+    coach_id, other_coach_id = make_user(), make_user()
+    team_id, other_team_id = make_team(coach_id), make_team(other_coach_id)
+
+    with app.test_request_context():
+        user = db.session.get(User, coach_id)
+        with count_queries() as counter:
+            assert owns_team(user, team_id)
+            assert owns_team(user, str(team_id))
+            assert not owns_team(user, other_team_id)
+            assert not owns_team(user, "abc")
+            assert get_owned_team(user, other_team_id) is None
+        assert counter.count == 1
@@ -0,0 +1,91 @@
+import json
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models.ai_report import AIReport
+from app.models.athlete import Athlete
+from app.models.attendance import Attendance
+from app.models.daily_load import DailyLoad
+from app.models.match import Match
+from app.models.team import Team
+from app.models.training import TrainingSession
+
+
+@pytest.fixture
+def backed_up_coach(app, make_user, make_team):
+    """A coach with one attendance row and a report referencing the session, match and athlete."""
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    with app.app_context():
+        athlete = Athlete(team_id=team_id, first_name="Luca", last_name="Bianchi")
+        session = TrainingSession(team_id=team_id, date=date.today(), duration_minutes=90)
+        match = Match(team_id=team_id, date=date.today(), opponent="Virtus")
+        db.session.add_all([athlete, session, match])
+        db.session.flush()
+        db.session.add_all([
+            Attendance(athlete_id=athlete.id, training_session_id=session.id, status="present", rpe=7),
+            AIReport(coach_id=coach_id, report_type="post_training", content="ok", input_refs=json.dumps({
+                "training_ids": [session.id], "match_ids": [match.id], "athlete_ids": [athlete.id, 9999],
+            })),
+        ])
+        db.session.commit()
+    return coach_id
+
+
+def _restored(app, coach_id):
+    with app.app_context():
+        athlete = Athlete.query.join(Athlete.team).filter_by(coach_id=coach_id).one()
+        session = TrainingSession.query.filter_by(team_id=athlete.team_id).one()
+        match = Match.query.filter_by(team_id=athlete.team_id).one()
+        attendance = Attendance.query.filter_by(athlete_id=athlete.id).one()
+        report = AIReport.query.filter_by(coach_id=coach_id).one()
+        daily = DailyLoad.query.filter_by(athlete_id=athlete.id).one()
+        return {
+            "attendance": (attendance.training_session_id, attendance.rpe),
+            "input_refs": json.loads(report.input_refs),
+            "load": daily.load,
+            "expected_refs": {
+                "training_ids": [session.id], "match_ids": [match.id], "athlete_ids": [athlete.id],
+            },
+            "session_id": session.id,
+        }
+
+
+@pytest.mark.parametrize("fmt, mimetype", [("json", "application/json"), ("ndjson", "application/x-ndjson")])
+def test_restore_round_trips_attendance_and_report_refs(app, client, make_user, auth_headers,
+                                                        backed_up_coach, fmt, mimetype):
+    exported = client.get(f"/api/backup/?format={fmt}", headers=auth_headers(backed_up_coach))
+    assert exported.status_code == 200
+
+    target_id = make_user()
+    response = client.post("/api/backup/restore", headers=auth_headers(target_id),
+                           data=exported.data, content_type=mimetype)
+    assert response.status_code == 201
+    assert response.json["by_type"]["attendance"] == 1
+
+    restored = _restored(app, target_id)
+    assert restored["attendance"] == (restored["session_id"], 7)
+    assert restored["input_refs"] == restored["expected_refs"]
+    assert restored["load"] == 7 * 90
+
+
+@pytest.mark.parametrize("bad_fields", [
+    {"first_name": None},
+    {"first_name": {"nested": "value"}},
+    {"birth_date": "not a date"},
+])
+def test_restore_rejects_a_bad_record_and_rolls_back(app, client, make_user, auth_headers, bad_fields):
+    coach_id = make_user()
+    document = {"teams": [{
+        "id": 1, "name": "Under 16", "sport": "football",
+        "athletes": [{"id": 1, "team_id": 1, "first_name": "Luca", "last_name": "Bianchi", **bad_fields}],
+    }]}
+
+    response = client.post("/api/backup/restore", headers=auth_headers(coach_id), json=document)
+
+    assert response.status_code == 400
+    assert response.json["error"].startswith("Invalid backup: Invalid athlete record")
+    with app.app_context():
+        assert Team.query.filter_by(coach_id=coach_id).count() == 0
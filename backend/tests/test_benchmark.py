@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import db
+from app.seed import benchmark, generator
+
+# Per-endpoint status and query count on the dataset below; lower a budget
+# when an endpoint gets cheaper, raise one only with a reason in the commit
+BUDGET = Path(__file__).with_name("query_budget.json")
+
+
+@pytest.fixture
+def seeded_coach(app):
+    """The first coach of a small generated dataset."""
+    with app.app_context():
+        stats = generator.generate(
+            coaches=1, seasons=1, teams_per_season=1, athletes_per_team=6, weeks=3, sessions_per_week=2,
+            community_users=6, posts_per_user=2, follows_per_user=3, chats_per_user=3,
+        )
+        db.session.commit()
+    return stats["coach_ids"][0]
+
+
+def _bench(app, coach_id):
+    return app.test_cli_runner().invoke(args=["seed", "bench", "--coach-id", str(coach_id), "--iterations", "1"])
+
+
+def test_bench_without_a_team_is_a_usage_error(app, make_user):
+    result = _bench(app, make_user())
+
+    assert result.exit_code == 2
+    assert "has no team to benchmark" in result.output
+
+
+def test_bench_without_a_completed_session_is_a_usage_error(app, make_user, make_team, add_sessions):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    add_sessions(team_id, 3, status="planned")
+
+    result = _bench(app, coach_id)
+
+    assert result.exit_code == 2
+    assert "has no completed training session" in result.output
+
+
+def test_endpoints_stay_within_their_query_budget(app, seeded_coach):
+    # One warmup request, so first-read side effects (e.g. marking messages read) are not counted
+    results = benchmark.run(app, seeded_coach, iterations=1, warmup=1)
+    budget = json.loads(BUDGET.read_text(encoding="utf-8"))
+
+    assert {t: r["status"] for t, r in results.items() if r["status"] >= 400} == {}
+    assert sorted(budget) == sorted(results), f"update {BUDGET.name} for new or removed endpoints"
+    assert benchmark.compare(results, budget) == []
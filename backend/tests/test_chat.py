@@ -0,0 +1,38 @@
+from app import db
+from app.models.community import ChatRequest, Conversation
+
+
+def _accepted_chat(client, auth_headers, sender, receiver):
+    request_id = client.post("/api/chat/requests", headers=auth_headers(sender),
+                             json={"to_user_id": receiver}).json["chat_request"]["id"]
+    assert client.post(f"/api/chat/requests/{request_id}/accept", headers=auth_headers(receiver)).status_code == 200
+    return request_id
+
+
+def test_first_message_creates_the_conversation(app, client, make_user, auth_headers):
+    sender, receiver = make_user(), make_user()
+    with app.app_context():
+        # An accepted chat from before the conversations table existed
+        db.session.add(ChatRequest(from_user_id=sender, to_user_id=receiver, status="accepted"))
+        db.session.commit()
+
+    response = client.post(f"/api/chat/messages/{receiver}", headers=auth_headers(sender), json={"text": "Ciao"})
+    assert response.status_code == 201
+    client.post(f"/api/chat/messages/{receiver}", headers=auth_headers(sender), json={"text": "Ci sei?"})
+
+    inbox = client.get("/api/chat/conversations", headers=auth_headers(receiver)).json["conversations"]
+    assert [(c["user_id"], c["unread_count"], c["last_message"]["text"]) for c in inbox] == [(sender, 2, "Ci sei?")]
+    with app.app_context():
+        conversation = Conversation.query.one()
+        assert conversation.unread_for(sender) == 0
+
+
+def test_an_accepted_request_cannot_be_rejected(client, make_user, auth_headers):
+    sender, receiver = make_user(), make_user()
+    request_id = _accepted_chat(client, auth_headers, sender, receiver)
+
+    response = client.post(f"/api/chat/requests/{request_id}/reject", headers=auth_headers(receiver))
+
+    assert response.status_code == 400
+    assert client.post(f"/api/chat/messages/{sender}", headers=auth_headers(receiver),
+                       json={"text": "Ciao"}).status_code == 201
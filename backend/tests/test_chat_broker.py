@@ -0,0 +1,112 @@
+import errno
+import os
+import shutil
+import socket
+import tempfile
+
+import pytest
+
+from app.services.chat_broker import MAX_DATAGRAM, LocalBroker, create_broker
+
+
+@pytest.fixture
+def broker_dir():
+    # Unix socket paths are limited to ~100 characters, so not tmp_path
+    directory = tempfile.mkdtemp(prefix="chat-")
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_local_broker_relays_events_between_processes(broker_dir):
+    # Two brokers on one directory stand for two worker processes
+    worker_a, worker_b = LocalBroker(broker_dir), LocalBroker(broker_dir)
+    try:
+        on_a, on_b = worker_a.subscribe(7), worker_b.subscribe(7)
+        other_user = worker_b.subscribe(8)
+
+        worker_a.publish(7, "message", {"text": "Ciao"})
+
+        assert on_a.get(timeout=2) == ("message", {"text": "Ciao"})
+        assert on_b.get(timeout=2) == ("message", {"text": "Ciao"})
+        assert other_user.get(timeout=0.1) is None
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_local_broker_removes_sockets_of_dead_processes(broker_dir):
+    dead = os.path.join(broker_dir, "12345-deadbeef.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale.bind(dead)
+    stale.close()
+
+    broker = LocalBroker(broker_dir)
+    try:
+        subscription = broker.subscribe(1)
+        broker.publish(1, "message", {})
+
+        assert subscription.get(timeout=2) == ("message", {})
+        assert not os.path.exists(dead)
+    finally:
+        broker.close()
+
+
+def test_create_broker_from_url(broker_dir):
+    broker = create_broker(f"local://{broker_dir}")
+    try:
+        assert isinstance(broker, LocalBroker)
+        assert [name for name in os.listdir(broker_dir) if name.endswith(".sock")]
+    finally:
+        broker.close()
+    assert os.listdir(broker_dir) == []
+
+
+def test_local_broker_survives_malformed_datagrams(broker_dir):
+    broker = LocalBroker(broker_dir)
+    try:
+        subscription = broker.subscribe(1)
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        for garbage in (b'{"user_id": 1, "ev', b'{"user_id": 1}', b"[1, 2]"):
+            sender.sendto(garbage, broker._path)
+        sender.close()
+
+        broker.publish(1, "message", {"text": "still here"})
+
+        assert subscription.get(timeout=2) == ("message", {"text": "still here"})
+    finally:
+        broker.close()
+
+
+class _FailingSender:
+    """Wraps a broker's sender socket, failing sends to one path with EMSGSIZE."""
+
+    def __init__(self, sender, failing_path):
+        self._sender = sender
+        self._failing_path = failing_path
+
+    def sendto(self, payload, path):
+        if path == self._failing_path:
+            raise OSError(errno.EMSGSIZE, "Message too long")
+        return self._sender.sendto(payload, path)
+
+    def close(self):
+        self._sender.close()
+
+
+def test_local_broker_drops_oversized_events_and_keeps_delivering(broker_dir):
+    worker_a, worker_b, worker_c = LocalBroker(broker_dir), LocalBroker(broker_dir), LocalBroker(broker_dir)
+    try:
+        on_b, on_c = worker_b.subscribe(1), worker_c.subscribe(1)
+        worker_a.publish(1, "message", {"text": "x" * MAX_DATAGRAM})
+        assert on_b.get(timeout=0.2) is None
+
+        # A send error on one socket must not stop delivery to the others
+        worker_a._sender = _FailingSender(worker_a._sender, worker_c._path)
+        worker_a.publish(1, "message", {"text": "Ciao"})
+
+        assert on_b.get(timeout=2) == ("message", {"text": "Ciao"})
+        assert on_c.get(timeout=0.2) is None
+        assert os.path.exists(worker_c._path)
+    finally:
+        for broker in (worker_a, worker_b, worker_c):
+            broker.close()
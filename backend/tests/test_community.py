@@ -0,0 +1,50 @@
+import pytest
+
+from app import db
+from app.models.community import Follow, Post, PostLike, SavedPost
+
+
+@pytest.fixture
+def community(app, make_user):
+    """A reader following an author; ``add_posts(n)`` adds n posts the reader liked and saved."""
+    reader_id = make_user(first_name="Anna")
+    author_id = make_user(first_name="Paolo")
+    with app.app_context():
+        db.session.add(Follow(follower_id=reader_id, following_id=author_id))
+        db.session.commit()
+
+    def add_posts(count):
+        with app.app_context():
+            posts = [Post(author_id=author_id, sport="football", content=f"Esercizio {i}") for i in range(count)]
+            db.session.add_all(posts)
+            db.session.flush()
+            db.session.add_all([PostLike(post_id=p.id, user_id=reader_id) for p in posts])
+            db.session.add_all([SavedPost(post_id=p.id, user_id=reader_id) for p in posts])
+            db.session.commit()
+
+    return reader_id, author_id, add_posts
+
+
+@pytest.mark.parametrize("path", [
+    "/api/community/feed?per_page=100",
+    "/api/community/discover?per_page=100",
+    "/api/community/saved",
+    "/api/community/profile/{author_id}",
+])
+def test_post_lists_run_a_constant_number_of_queries(client, community, auth_headers, count_queries, path):
+    reader_id, author_id, add_posts = community
+    headers = auth_headers(reader_id)
+    url = path.format(author_id=author_id)
+
+    add_posts(3)
+    with count_queries() as few:
+        assert client.get(url, headers=headers).status_code == 200
+
+    add_posts(17)
+    with count_queries() as many:
+        response = client.get(url, headers=headers)
+
+    posts = response.json["posts"]
+    assert len(posts) == 20
+    assert all(p["liked"] and p["saved"] for p in posts)
+    assert many.count == few.count
@@ -0,0 +1,35 @@
+from app import db
+from app.models.athlete import Athlete
+
+
+def test_advanced_stats_query_count_does_not_grow_with_sessions(app, client, make_user, make_team,
+                                                               add_sessions, auth_headers, count_queries):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    headers = auth_headers(coach_id)
+    with app.app_context():
+        db.session.add_all([Athlete(team_id=team_id, first_name="A", last_name=str(i)) for i in range(5)])
+        db.session.commit()
+
+    add_sessions(team_id, 5, duration_minutes=60, status="completed")
+    with count_queries() as few:
+        assert client.get(f"/api/dashboard/stats/{team_id}", headers=headers).status_code == 200
+
+    add_sessions(team_id, 200, duration_minutes=60, status="completed")
+    with count_queries() as many:
+        response = client.get(f"/api/dashboard/stats/{team_id}", headers=headers)
+
+    assert response.json["kpis"]["total_sessions"] == 205
+    assert many.count == few.count
+
+
+def test_weekly_trend_keeps_a_zero_average_rpe(app, client, make_user, make_team, add_sessions, auth_headers):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    add_sessions(team_id, 1, rpe_avg=0.0)
+
+    response = client.get(f"/api/dashboard/stats/{team_id}", headers=auth_headers(coach_id))
+
+    current_week = response.json["weekly_trend"][-1]
+    assert current_week["sessions"] == 1
+    assert current_week["avg_rpe"] == 0.0
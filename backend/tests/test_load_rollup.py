@@ -0,0 +1,57 @@
+from datetime import date
+
+from app import db
+from app.models.athlete import Athlete
+from app.models.training import TrainingSession
+from app.services import load_rollup
+
+
+def _session_with_attendance(app, client, headers, team_id, minutes_trained):
+    with app.app_context():
+        athlete = Athlete(team_id=team_id, first_name="Luca", last_name="Bianchi")
+        session = TrainingSession(team_id=team_id, date=date.today(), duration_minutes=90)
+        db.session.add_all([athlete, session])
+        db.session.commit()
+        athlete_id, session_id = athlete.id, session.id
+
+    response = client.post(f"/api/attendance/{session_id}", headers=headers, json={
+        "attendance": [{"athlete_id": athlete_id, "status": "present", "minutes_trained": minutes_trained}],
+    })
+    assert response.status_code == 200
+    return athlete_id
+
+
+def test_weekly_load_is_rpe_times_session_duration(app, client, make_user, make_team, auth_headers):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    headers = auth_headers(coach_id)
+    athlete_id = _session_with_attendance(app, client, headers, team_id, minutes_trained=30)
+
+    dashboard = client.get(f"/api/dashboard/athlete/{athlete_id}", headers=headers).json
+    loads = client.get(f"/api/dashboard/training-load/{team_id}", headers=headers).json
+
+    assert dashboard["weekly_load"] == 5 * 90
+    assert loads["athlete_loads"][0]["load"] == 5 * 30
+
+
+def test_rollup_follows_an_athlete_to_a_new_team(app, client, make_user, make_team, auth_headers):
+    coach_id = make_user()
+    old_team_id = make_team(coach_id, name="Under 16")
+    new_team_id = make_team(coach_id, name="Under 18")
+    headers = auth_headers(coach_id)
+    athlete_id = _session_with_attendance(app, client, headers, old_team_id, minutes_trained=30)
+
+    with app.app_context():
+        db.session.get(Athlete, athlete_id).team_id = new_team_id
+        db.session.commit()
+        assert load_rollup.find_drift(new_team_id) == []
+        assert load_rollup.find_drift(old_team_id) == []
+
+    loads = client.get(f"/api/dashboard/training-load/{new_team_id}", headers=headers).json
+    assert [(a["athlete_id"], a["load"]) for a in loads["athlete_loads"]] == [(athlete_id, 5 * 30)]
+
+    with app.app_context():
+        assert load_rollup.rebuild(new_team_id) == 1
+        assert load_rollup.rebuild(old_team_id) == 0
+        db.session.commit()
+        assert load_rollup.find_drift() == []
@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _token(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trips_its_values():
+    values = [datetime(2026, 10, 17, 9, 30), 42, 1.5, "abc", None]
+    assert decode_cursor(encode_cursor(values), len(values)) == values
+
+
+@pytest.mark.parametrize("payload", [
+    [[1], "x"],
+    [{"a": 1}, 2],
+    [True, 2],
+    {"v": [[1], "x"]},
+    "ab",
+])
+def test_cursor_values_of_the_wrong_type_are_invalid(payload):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_token(payload), 2)
+
+
+def test_crafted_cursor_is_a_bad_request(client, make_user, auth_headers):
+    response = client.get(f"/api/community/feed?cursor={_token([[1], 'x'])}", headers=auth_headers(make_user()))
+
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid cursor"}
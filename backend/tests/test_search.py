@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models.athlete import Athlete
+from app.services import search_index
+
+
+@pytest.fixture
+def search(app, client, auth_headers):
+    """``search(coach_id, q)``: the /api/search response, on the SQLite FTS5 backend."""
+    with app.app_context():
+        # db.create_all does not create the FTS table; a full reindex does
+        search_index.reindex()
+        db.session.commit()
+        assert search_index.get_backend().name == "sqlite-fts5"
+
+    def search(coach_id, q):
+        response = client.get("/api/search", query_string={"q": q}, headers=auth_headers(coach_id))
+        assert response.status_code == 200
+        return response.json
+    return search
+
+
+def _athlete_names(results):
+    return [f"{a['first_name']} {a['last_name']}" for a in results["athletes"]]
+
+
+def _add_athlete(app, team_id, first_name, last_name):
+    with app.app_context():
+        athlete = Athlete(team_id=team_id, first_name=first_name, last_name=last_name)
+        db.session.add(athlete)
+        db.session.commit()
+        return athlete.id
+
+
+def test_flushes_keep_the_index_in_sync(app, search, make_user, make_team):
+    coach_id = make_user()
+    athlete_id = _add_athlete(app, make_team(coach_id), "Luca", "Bianchi")
+    assert _athlete_names(search(coach_id, "bian")) == ["Luca Bianchi"]
+
+    with app.app_context():
+        db.session.get(Athlete, athlete_id).last_name = "Verdi"
+        db.session.commit()
+    assert search(coach_id, "bianchi")["athletes"] == []
+    assert _athlete_names(search(coach_id, "verdi")) == ["Luca Verdi"]
+
+    with app.app_context():
+        db.session.delete(db.session.get(Athlete, athlete_id))
+        db.session.commit()
+    assert search(coach_id, "verdi")["athletes"] == []
+
+
+def test_reindex_rebuilds_the_documents(app, search, make_user, make_team):
+    coach_id = make_user()
+    _add_athlete(app, make_team(coach_id), "Luca", "Bianchi")
+    with app.app_context():
+        db.session.execute(text("DELETE FROM search_documents"))
+        db.session.commit()
+    assert search(coach_id, "bianchi")["athletes"] == []
+
+    with app.app_context():
+        assert search_index.reindex() == 1
+        db.session.commit()
+    assert _athlete_names(search(coach_id, "bianchi")) == ["Luca Bianchi"]
+
+
+def test_results_are_limited_to_the_coach(app, search, make_user, make_team):
+    coach_id, other_coach_id = make_user(), make_user()
+    _add_athlete(app, make_team(coach_id), "Luca", "Bianchi")
+    _add_athlete(app, make_team(other_coach_id), "Marco", "Bianchi")
+
+    assert _athlete_names(search(coach_id, "bianchi")) == ["Luca Bianchi"]
+    assert _athlete_names(search(other_coach_id, "bianchi")) == ["Marco Bianchi"]
+
+
+# Operators are searched as plain words, and every word must match
+@pytest.mark.parametrize("q, found", [
+    ('"', False),
+    ("*", False),
+    ("OR", False),
+    ("bianchi OR", False),
+    ("NEAR(bianchi", False),
+    ('"bian*', True),
+    ("(bianchi)", True),
+    ("bianchi -luca", True),
+    ("^bianchi:", True),
+])
+def test_fts_metacharacters_are_searched_as_words(app, search, make_user, make_team, q, found):
+    coach_id = make_user()
+    _add_athlete(app, make_team(coach_id), "Luca", "Bianchi")
+
+    assert _athlete_names(search(coach_id, q)) == (["Luca Bianchi"] if found else [])
@@ -0,0 +1,36 @@
+import pytest
+
+from app.models.community import TimelineEntry
+
+
+@pytest.fixture
+def fanout_app(app):
+    app.config.update(FEED_FANOUT=True, FEED_FANOUT_MAX_FOLLOWERS=2)
+    return app
+
+
+def _feed_ids(client, headers):
+    return [post["id"] for post in client.get("/api/community/feed", headers=headers).json["posts"]]
+
+
+def test_posts_stay_in_feeds_when_an_author_drops_below_the_threshold(fanout_app, client, make_user, auth_headers):
+    author = make_user()
+    followers = [make_user() for _ in range(3)]
+    for follower in followers:
+        client.post(f"/api/community/follow/{author}", headers=auth_headers(follower))
+
+    # Three followers: over the threshold, so the post is pulled at read time
+    post_id = client.post("/api/community/posts", headers=auth_headers(author), json={"content": "x"}).json["post"]["id"]
+    assert _feed_ids(client, auth_headers(followers[0])) == [post_id]
+
+    client.post(f"/api/community/follow/{author}", headers=auth_headers(followers[2]))
+
+    assert _feed_ids(client, auth_headers(followers[0])) == [post_id]
+    assert _feed_ids(client, auth_headers(followers[1])) == [post_id]
+    assert _feed_ids(client, auth_headers(followers[2])) == []
+
+    # Crossing again does not duplicate entries
+    client.post(f"/api/community/follow/{author}", headers=auth_headers(followers[2]))
+    client.post(f"/api/community/follow/{author}", headers=auth_headers(followers[2]))
+    with fanout_app.app_context():
+        assert TimelineEntry.query.filter_by(post_id=post_id).count() == 2
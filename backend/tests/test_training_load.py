@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.services import training_load
+
+
+def _recursive_ewma(loads, span):
+    alpha = 2 / (span + 1)
+    out, current = [], np.zeros(loads.shape[1])
+    for day in loads:
+        current = alpha * day + (1 - alpha) * current
+        out.append(current)
+    return np.array(out)
+
+
+@pytest.mark.parametrize("span", [1, 2, 7, 28, 90])
+def test_ewma_matches_the_recursive_definition(span):
+    loads = np.random.default_rng(span).uniform(0, 600, size=(180, 4))
+    np.testing.assert_allclose(training_load.ewma(loads, span), _recursive_ewma(loads, span))
+
+
+@pytest.mark.parametrize("query", [
+    "acute=0", "acute=10&chronic=7", "chronic=91", "acute=7&chronic=1000000000",
+])
+def test_training_load_rejects_windows_out_of_range(client, make_user, make_team, auth_headers, query):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+
+    response = client.get(f"/api/dashboard/training-load/{team_id}?{query}", headers=auth_headers(coach_id))
+
+    assert response.status_code == 400
+
+
+def test_training_load_accepts_the_longest_window(client, make_user, make_team, add_sessions, auth_headers):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    add_sessions(team_id, 3, duration_minutes=60, rpe_avg=6)
+
+    response = client.get(f"/api/dashboard/training-load/{team_id}?acute=90&chronic=90", headers=auth_headers(coach_id))
+
+    assert response.status_code == 200
+    assert response.json["acwr"] == pytest.approx(1.0)
+    assert response.json["chronic_days"] == 90
@@ -0,0 +1,43 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import db
+from app.models.training import TrainingBlock, TrainingSession
+
+
+def _add_blocks(app, team_id, per_session=2):
+    with app.app_context():
+        sessions = TrainingSession.query.filter_by(team_id=team_id).all()
+        db.session.add_all([
+            TrainingBlock(session_id=s.id, order=i, block_type="technical", name=f"Esercizio {i}")
+            for s in sessions for i in range(per_session)
+        ])
+        db.session.commit()
+
+
+@pytest.mark.parametrize("path", [
+    "/api/trainings?team_id={team_id}",
+    "/api/periodization/calendar?team_id={team_id}&start={start}&end={end}",
+])
+def test_session_lists_run_a_constant_number_of_queries(app, client, make_user, make_team, add_sessions,
+                                                        auth_headers, count_queries, path):
+    coach_id = make_user()
+    team_id = make_team(coach_id)
+    headers = auth_headers(coach_id)
+    url = path.format(team_id=team_id, start=date.today() - timedelta(days=365), end=date.today())
+
+    add_sessions(team_id, 3)
+    _add_blocks(app, team_id)
+    with count_queries() as few:
+        assert client.get(url, headers=headers).status_code == 200
+
+    add_sessions(team_id, 120)
+    _add_blocks(app, team_id, per_session=0)
+    with count_queries() as many:
+        response = client.get(url, headers=headers)
+
+    sessions = response.json["sessions"]
+    assert len(sessions) == 123
+    assert sorted(s["blocks_count"] for s in sessions)[-3:] == [2, 2, 2]
+    assert many.count == few.count
@@ -0,0 +1,123 @@
+import api from './client'
+import type { AIJob, AIJobProgress, AIReport } from '@/types'
+
+// Cached reports finish almost immediately: poll fast first, then back off
+const FIRST_POLL_MS = 250
+const MAX_POLL_MS = 1500
+const POLL_TIMEOUT_MS = 120000
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+/**
+ * Start an AI generation job and wait for its report.
+ * Generate endpoints answer 202 with a job; the result endpoint keeps
+ * answering 202 until the job finishes. ``force`` bypasses the server's
+ * cache of identical generations.
+ */
+export async function generateReport(
+  path: string,
+  body: Record<string, unknown>,
+  force = false,
+): Promise<AIReport> {
+  const { data } = await api.post<{ job: AIJob }>(`/ai/generate/${path}`, { ...body, force })
+  const deadline = Date.now() + POLL_TIMEOUT_MS
+  let interval = FIRST_POLL_MS
+
+  while (Date.now() < deadline) {
+    await sleep(interval)
+    interval = Math.min(interval * 2, MAX_POLL_MS)
+    const result = await api.get<{ report?: AIReport; job: AIJob }>(`/ai/jobs/${data.job.id}/result`)
+    if (result.status === 200 && result.data.report) {
+      return result.data.report
+    }
+  }
+  throw new Error('AI job timed out')
+}
+
+/**
+ * Weekly summaries for a whole team in one batch job. ``onProgress`` gets
+ * the per-athlete progress on every poll; resolves with the saved reports.
+ */
+export async function generateTeamWeekly(
+  teamId: number,
+  onProgress: (progress: AIJobProgress) => void,
+  force = false,
+): Promise<AIReport[]> {
+  const { data } = await api.post<{ job: AIJob }>('/ai/generate/team-weekly', { team_id: teamId, force })
+  const deadline = Date.now() + POLL_TIMEOUT_MS
+  let interval = FIRST_POLL_MS
+
+  while (Date.now() < deadline) {
+    await sleep(interval)
+    interval = Math.min(interval * 2, MAX_POLL_MS)
+    const result = await api.get<{ reports?: AIReport[]; job: AIJob }>(`/ai/jobs/${data.job.id}/result`)
+    if (result.data.job.progress) {
+      onProgress(result.data.job.progress)
+    }
+    if (result.status === 200 && result.data.reports) {
+      return result.data.reports
+    }
+  }
+  throw new Error('AI job timed out')
+}
+
+/**
+ * Generate a report over Server-Sent Events, calling ``onToken`` with the
+ * text so far as the model writes it. Resolves with the saved report.
+ * Uses fetch (EventSource cannot POST); falls back to ``generateReport``
+ * when the stream cannot be opened.
+ */
+export async function streamReport(
+  path: string,
+  body: Record<string, unknown>,
+  onToken: (text: string) => void,
+  force = false,
+): Promise<AIReport> {
+  const token = localStorage.getItem('access_token')
+  const response = await fetch(`/api/ai/generate/${path}?stream=1`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({ ...body, force }),
+  })
+  if (!response.ok || !response.body) {
+    // e.g. an expired token: the polled path goes through the axios refresh
+    return generateReport(path, body, force)
+  }
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  let text = ''
+
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    let boundary = buffer.indexOf('\n\n')
+    while (boundary !== -1) {
+      const raw = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      boundary = buffer.indexOf('\n\n')
+
+      const event = raw.match(/^event: (.*)$/m)?.[1]
+      const data = raw.match(/^data: (.*)$/m)?.[1]
+      if (!event || !data) continue
+
+      const payload = JSON.parse(data)
+      if (event === 'token') {
+        text += payload.text
+        onToken(text)
+      } else if (event === 'done') {
+        return payload.report as AIReport
+      } else if (event === 'error') {
+        throw new Error(payload.error)
+      }
+    }
+  }
+  throw new Error('AI stream ended unexpectedly')
+}
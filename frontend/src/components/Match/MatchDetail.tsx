@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import api from '@/api/client'
+import { streamReport } from '@/api/aiJobs'
 import type { Match, Athlete, SportConfig } from '@/types'
 import { useAuthStore } from '@/store/auth'
 import FormationEditor from '@/components/Formation/FormationEditor'
@@ -137,8 +138,8 @@ export default function MatchDetail({ match, teamId, sportConfig, onBack, onUpda
   const generatePostMatchReport = async () => {
     setGenerating(true)
     try {
-      const { data } = await api.post('/ai/generate/post-match', { match_id: match.id })
-      setAiReport(data.report.content)
+      const report = await streamReport('post-match', { match_id: match.id }, setAiReport)
+      setAiReport(report.content)
     } catch {
       setAiReport('AI non configurata.')
     }
@@ -342,7 +343,7 @@ export default function MatchDetail({ match, teamId, sportConfig, onBack, onUpda
                 <button onClick={generatePostMatchReport} className="btn-secondary w-full flex items-center justify-center gap-2">
                   <Zap size={16} /> Genera Report AI Post-Gara
                 </button>
-              ) : generating ? (
+              ) : generating && !aiReport ? (
                 <div className="text-center py-4">
                   <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-brand-600 mx-auto" />
                 </div>
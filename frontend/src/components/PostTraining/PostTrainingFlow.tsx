@@ -1,5 +1,6 @@
 import { useState, useEffect } from 'react'
 import api from '@/api/client'
+import { streamReport } from '@/api/aiJobs'
 import type { TrainingSession, Athlete } from '@/types'
 import { Check, Star, Users, Zap, ChevronRight, X } from 'lucide-react'
 import clsx from 'clsx'
@@ -78,10 +79,10 @@ export default function PostTrainingFlow({ session, teamId, onClose, onComplete
   const generateReport = async () => {
     setGenerating(true)
     try {
-      const { data } = await api.post('/ai/generate/post-training', {
+      const report = await streamReport('post-training', {
         session_id: session.id,
-      })
-      setAiReport(data.report.content)
+      }, setAiReport)
+      setAiReport(report.content)
     } catch {
       setAiReport('AI non configurata. Aggiungi la chiave OpenAI per generare report automatici.')
     }
@@ -226,7 +227,7 @@ export default function PostTrainingFlow({ session, teamId, onClose, onComplete
                   </button>
                 </div>
               )}
-              {generating && (
+              {generating && !aiReport && (
                 <div className="text-center py-8">
                   <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-brand-600 mx-auto mb-4" />
                   <p className="text-gray-500">Generazione in corso...</p>
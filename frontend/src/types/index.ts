@@ -169,9 +169,38 @@ export interface AIReport {
   confidence: string | null
   feedback: string | null
   saved: boolean
+  prompt_tokens: number | null
+  completion_tokens: number | null
+  raw_prompt_tokens: number | null
   created_at: string
 }
 
+export interface AIJob {
+  id: number
+  job_type: 'post_training' | 'post_match' | 'athlete_weekly' | 'team_weekly'
+  params: Record<string, number>
+  status: 'queued' | 'running' | 'succeeded' | 'failed'
+  attempts: number
+  report_id: number | null
+  error: string | null
+  progress: AIJobProgress | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+}
+
+export interface AIJobProgress {
+  total: number
+  completed: number
+  failed: number
+  items: {
+    athlete_id: number
+    status: 'queued' | 'succeeded' | 'failed'
+    report_id: number | null
+    error: string | null
+  }[]
+}
+
 export interface SportConfig {
   label: string
   positions: { value: string; label: string }[]
@@ -240,6 +269,9 @@ export interface PeriodizationCycle {
 
 export interface TrainingLoadData {
   acwr: number
+  acwr_ewma: number
+  acute_days: number
+  chronic_days: number
   acute_load: number
   chronic_load: number
   monotony: number
@@ -248,7 +280,18 @@ export interface TrainingLoadData {
   risk_label: string
   risk_color: string
   weekly_trend: { week: string; load: number; sessions: number; avg_daily: number }[]
-  athlete_loads: { athlete_id: number; name: string; load: number; sessions: number }[]
+  athlete_loads: {
+    athlete_id: number
+    name: string
+    load: number
+    sessions: number
+    chronic_load: number
+    acwr: number
+    acwr_ewma: number
+    monotony: number
+    strain: number
+    risk: string
+  }[]
 }
 
 export interface CommunityPost {